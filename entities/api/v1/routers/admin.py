@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import logging.handlers
 import os
@@ -40,6 +41,8 @@ from services.lock import (
 )
 from services.vehicle import build_car_filter_query, scrape_and_save_sales_history
 from services.filter_kickoff_queue import enqueue_filter_kickoff
+from services.parse_inflight import get_inflight_stats
+from services.pricing_cache import bump_pricing_version
 
 # from tasks.task import parse_and_update_car
 
@@ -363,6 +366,16 @@ async def delete_filter(
         )
 
 
+@router.get("/parse-inflight/stats", summary="Parse task deduplication counters")
+async def parse_inflight_stats(current_user=Depends(get_current_user)) -> dict:
+    """
+    Per enqueue path (filter, bulk, scrape, upsert): VINs sent to parse_and_update_car and
+    duplicates suppressed because the VIN was already queued or in flight.
+    """
+    # counting in-flight VINs scans the keyspace with the sync Redis client: keep it off the event loop
+    return await asyncio.to_thread(get_inflight_stats)
+
+
 @router.get("/roi", response_model=ROIListResponseSchema)
 async def get_roi(db: AsyncSession = Depends(get_db)) -> ROIListResponseSchema:
     """
@@ -509,8 +522,10 @@ async def create_roi(roi: ROICreateSchema, db: AsyncSession = Depends(get_db)) -
         db_roi = ROIModel(**roi.dict(exclude_unset=True))
         db.add(db_roi)
         await db.commit()
+        bump_pricing_version()
         await db.refresh(db_roi)
         logger.info(f"ROI record created successfully with id={db_roi.id}", extra=extra)
+        celery_app.send_task("tasks.task.recompute_predicted_roi", kwargs={"roi_id": db_roi.id})
         return db_roi
     except HTTPException as e:
         logger.error(f"Failed to create ROI record: {str(e)}", extra=extra)
@@ -659,7 +674,9 @@ async def proxy_upload(
                 )
 
         await db.commit()
+        bump_pricing_version()
         logger.info("Committed new fees for auction 'iaai'")
+        celery_app.send_task("tasks.task.recompute_auction_fees", kwargs={"auctions": ["iaai"]})
 
         return JSONResponse(
             status_code=resp.status_code,
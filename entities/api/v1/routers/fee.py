@@ -9,6 +9,7 @@ from db.session import get_db
 from models.vehicle import FeeModel
 from models.user import UserModel
 from schemas.vehicle import FeeCreate, FeeUpdate, FeeRead
+from services.pricing_cache import bump_pricing_version
 
 router = APIRouter(prefix="/fees")
 
@@ -22,6 +23,7 @@ async def create_fee(
     fee = FeeModel(**payload.model_dump())
     db.add(fee)
     await db.commit()
+    bump_pricing_version()
     await db.refresh(fee)
     return fee
 
@@ -50,6 +52,7 @@ async def update_fee(
         setattr(fee, field, value)
 
     await db.commit()
+    bump_pricing_version()
     await db.refresh(fee)
     return fee
 
@@ -66,4 +69,5 @@ async def delete_fee(
 
     await db.delete(fee)
     await db.commit()
+    bump_pricing_version()
     return None
@@ -1,14 +1,15 @@
 import asyncio
+import json
 import logging
 import logging.handlers
 import os
-from collections import defaultdict
 from datetime import date
 from typing import Any, Dict, List, Optional
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import distinct, func, select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -18,10 +19,13 @@ from core.celery_config import app as celery_app
 from core.config import Settings
 from core.dependencies import get_current_user, get_settings, get_token
 from crud.vehicle import (
+    FACET_COLUMNS,
     add_part_to_vehicle,
     bulk_save_vehicles,
+    compute_car_filter_options,
     delete_part,
     get_filtered_vehicles,
+    get_filtered_vehicles_keyset,
     get_parts_by_vehicle_id,
     get_vehicle_by_id,
     get_vehicle_by_vin,
@@ -34,12 +38,11 @@ from crud.vehicle import (
 )
 from db.session import get_db
 from models.admin import ROIModel
-from models.user import UserModel
+from models.user import UserModel, user_likes
 from models.vehicle import AutoCheckModel, CarModel, ConditionAssessmentModel, FeeModel, HistoryModel, RelevanceStatus
 from schemas.vehicle import (
     CarUpsertSchema,
     CarBaseSchema,
-    CarBulkCreateSchema,
     CarCostsUpdateRequestSchema,
     CarCreateSchema,
     CarDetailResponseSchema,
@@ -50,9 +53,14 @@ from schemas.vehicle import (
     PartResponseScheme,
     UpdateCarStatusSchema,
 )
+from services.bid_events import bid_event_hub
+from services.bulk_codec import TRUSTED_PAYLOAD_HEADER, is_trusted_payload, parse_bulk_payload, read_bulk_body
+from services.filter_options_cache import get_cached_filter_options, store_filter_options
+from services.parse_inflight import claim_vins, release_vins, send_parse_tasks
 from services.vehicle import (
     car_to_dict,
     prepare_car_detail_response,
+    prepare_cursor_response,
     prepare_response,
     scrape_and_save_sales_history,
     scrape_and_save_vehicle,
@@ -154,104 +162,67 @@ async def get_autocheck(
 async def get_car_filter_options(db: AsyncSession = Depends(get_db)) -> CarFilterOptionsSchema:
     request_id = "N/A"
     extra = {"request_id": request_id, "user_id": "N/A"}
-    logger.info("Fetching filter options for cars", extra=extra)
-
-    active_filter = CarModel.relevance == RelevanceStatus.ACTIVE
-
-    auction_query = select(distinct(CarModel.auction)).where(CarModel.auction.isnot(None), active_filter)
-    auctions = [row[0] for row in (await db.execute(auction_query)).fetchall()]
 
-    condition_assesstments_query = select(
-        distinct(ConditionAssessmentModel.issue_description)
-    ).where(ConditionAssessmentModel.issue_description.isnot(None))
-    condition_assesstments = [row[0] for row in (await db.execute(condition_assesstments_query)).fetchall()]
+    version, cached = get_cached_filter_options()
+    if cached is not None:
+        logger.info(f"Filter options cache hit (v{version})", extra=extra)
+        return CarFilterOptionsSchema(**cached)
 
-    auction_name_query = select(distinct(CarModel.auction_name)).where(
-        CarModel.auction_name.isnot(None), active_filter
-    )
-    auction_names = [row[0] for row in (await db.execute(auction_name_query)).fetchall()]
-
-    query = select(CarModel.make, CarModel.model).where(
-        CarModel.make.isnot(None), CarModel.model.isnot(None), active_filter
-    ).distinct()
-    make_model_map = defaultdict(list)
-    for make, model in (await db.execute(query)).fetchall():
-        make_model_map[make].append(model)
-    make_model_map = dict(make_model_map)
-
-    transmission_query = select(distinct(CarModel.transmision)).where(
-        CarModel.transmision.isnot(None), active_filter
-    )
-    transmissions = [row[0] for row in (await db.execute(transmission_query)).fetchall()]
-
-    body_style_query = select(distinct(CarModel.body_style)).where(
-        CarModel.body_style.isnot(None), active_filter
-    )
-    body_styles = [row[0] for row in (await db.execute(body_style_query)).fetchall()]
-
-    vehicle_type_query = select(distinct(CarModel.vehicle_type)).where(
-        CarModel.vehicle_type.isnot(None), active_filter
-    )
-    vehicle_types = [row[0] for row in (await db.execute(vehicle_type_query)).fetchall()]
+    logger.info("Fetching filter options for cars", extra=extra)
+    options = await compute_car_filter_options(db)
+    store_filter_options(version, options)
 
-    fuel_type_query = select(distinct(CarModel.fuel_type)).where(
-        CarModel.fuel_type.isnot(None), active_filter
-    )
-    fuel_types = [row[0] for row in (await db.execute(fuel_type_query)).fetchall()]
+    return CarFilterOptionsSchema(**options)
 
-    drive_type_query = select(distinct(CarModel.drive_type)).where(
-        CarModel.drive_type.isnot(None), active_filter
-    )
-    drive_types = [row[0] for row in (await db.execute(drive_type_query)).fetchall()]
 
-    condition_query = select(distinct(CarModel.condition)).where(
-        CarModel.condition.isnot(None), active_filter
-    )
-    conditions = [row[0] for row in (await db.execute(condition_query)).fetchall()]
+BID_STREAM_KEEPALIVE_SECS = 15
 
-    engine_cylinder_query = select(distinct(CarModel.engine_cylinder)).where(
-        CarModel.engine_cylinder.isnot(None), active_filter
-    )
-    engine_cylinders = [row[0] for row in (await db.execute(engine_cylinder_query)).fetchall()]
 
-    location_query = select(distinct(CarModel.location)).where(
-        CarModel.location.isnot(None), active_filter
-    )
-    locations = [row[0] for row in (await db.execute(location_query)).fetchall()]
-
-    year_range_query = select(func.min(CarModel.year), func.max(CarModel.year)).where(active_filter)
-    year_min, year_max = (await db.execute(year_range_query)).fetchone()
-    year_range = {"min": year_min, "max": year_max} if year_min and year_max else None
-
-    mileage_range_query = select(func.min(CarModel.mileage), func.max(CarModel.mileage)).where(active_filter)
-    mileage_min, mileage_max = (await db.execute(mileage_range_query)).fetchone()
-    mileage_range = {"min": mileage_min, "max": mileage_max} if mileage_min and mileage_max else None
-
-    accident_range_query = select(func.min(CarModel.accident_count), func.max(CarModel.accident_count)).where(active_filter)
-    accident_count_min, accident_count_max = (await db.execute(accident_range_query)).fetchone()
-    accident_count_range = {"min": accident_count_min, "max": accident_count_max} if accident_count_min and accident_count_max else None
-
-    owners_range_query = select(func.min(CarModel.owners), func.max(CarModel.owners)).where(active_filter)
-    owners_min, owners_max = (await db.execute(owners_range_query)).fetchone()
-    owners_range = {"min": owners_min, "max": owners_max} if owners_min and owners_max else None
-
-    return CarFilterOptionsSchema(
-        auctions=auctions,
-        auction_names=auction_names,
-        makes_and_models=make_model_map,
-        locations=locations,
-        years=year_range,
-        mileage_range=mileage_range,
-        accident_count_range=accident_count_range,
-        owners_range=owners_range,
-        condition_assesstments=condition_assesstments,
-        body_styles=body_styles,
-        vehicle_types=vehicle_types,
-        transmissions=transmissions,
-        drive_types=drive_types,
-        engine_cylinders=engine_cylinders,
-        fuel_types=fuel_types,
-        conditions=conditions,
+@router.get(
+    "/bids/stream/",
+    summary="Stream bid changes (SSE)",
+    description=(
+        "Server-sent events with current_bid / recommendation changes produced by the bid refresh. "
+        "Filter with repeated `car_ids` and/or `liked=true` (the user's liked cars at connect time); "
+        "without filters every change is sent."
+    ),
+)
+async def stream_bid_changes(
+    request: Request,
+    car_ids: Optional[List[int]] = Query(None),
+    liked: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    watched = None
+    if car_ids or liked:
+        watched = set(car_ids or [])
+        if liked:
+            liked_ids = await db.execute(select(user_likes.c.car_id).where(user_likes.c.user_id == current_user.id))
+            watched.update(liked_ids.scalars())
+    # the stream can stay open for hours; don't pin a pooled connection to it
+    await db.close()
+
+    subscriber = bid_event_hub.subscribe(watched)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    events = await asyncio.wait_for(subscriber.queue.get(), timeout=BID_STREAM_KEEPALIVE_SECS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                for event in events:
+                    yield f"event: bid\ndata: {json.dumps(event)}\n\n"
+        finally:
+            bid_event_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -301,6 +272,10 @@ async def get_cars(
     ),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    pagination: str = Query("page", pattern="^(page|cursor)$", description="'page' (offset) or 'cursor' (keyset)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous response's next_cursor"),
+    include_total: bool = Query(False, description="Cursor mode: also compute the exact total on later pages"),
+    facets: Optional[str] = Query(None, description="Per-value counts, e.g. make,model,auction,body_style,fuel_type,location"),
     db: AsyncSession = Depends(get_db),
     settings: Settings = Depends(get_settings),
     current_user: UserModel = Depends(get_current_user),
@@ -324,15 +299,24 @@ async def get_cars(
         ordering (str): Field to sort vehicles by (default: created_at_desc).
         page (int): Page number for pagination (default: 1).
         page_size (int): Number of items per page (default: 10, max: 100).
+        pagination (str): "page" for OFFSET pages, "cursor" for keyset pagination (implied by `cursor`).
+        cursor (Optional[str]): Cursor returned as `next_cursor` by the previous cursor-mode call.
+        include_total (bool): In cursor mode, compute the exact total count on pages after the first.
+        facets (Optional[str]): Comma-separated fields to return per-value counts for under the current filters.
         db (AsyncSession): The database session dependency.
         settings (Settings): Application settings dependency.
 
     Returns:
-        CarListResponseSchema: Paginated list of cars with pagination links.
+        CarListResponseSchema: Paginated list of cars with pagination links (or `next_cursor` in cursor mode).
 
     Raises:
         HTTPException: 404 if no vehicles are found.
     """
+    facet_fields = [f.strip() for f in facets.split(",") if f.strip()] if facets else None
+    if facet_fields:
+        unknown = sorted(set(facet_fields) - set(FACET_COLUMNS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported facets: {', '.join(unknown)}")
     if zip_search:
         zip_search = zip_search.split(";")
         if len(zip_search) != 2:
@@ -399,14 +383,34 @@ async def get_cars(
         logger.info(f"Scraped and saved data for VIN {vin}, returning response", extra=extra)
         return CarListResponseSchema(cars=[validated_vehicle], page_links={}, last=True)
 
+    if cursor or pagination == "cursor":
+        vehicles, next_cursor, total_count, additional = await get_filtered_vehicles_keyset(
+            db=db,
+            filters=filters,
+            ordering=ordering,
+            cursor=cursor,
+            page_size=page_size,
+            include_total=include_total,
+            facets=facet_fields,
+        )
+        facet_counts = additional.pop("facets", None)
+        if include_total and total_count is not None:
+            additional = {**additional, "total_count": total_count}
+        response = await prepare_cursor_response(vehicles, next_cursor, additional)
+        response.facets = facet_counts
+        logger.info(f"Returning {len(response.cars)} cars (cursor mode), has next: {bool(next_cursor)}", extra=extra)
+        return response
+
     vehicles, total_count, total_pages, additional = await get_filtered_vehicles(
-        db=db, filters=filters, ordering=ordering, page=page, page_size=page_size
+        db=db, filters=filters, ordering=ordering, page=page, page_size=page_size, facets=facet_fields
     )
+    facet_counts = additional.pop("facets", None)
     if not vehicles:
         logger.info("No vehicles found with the given filters", extra=extra)
-        return CarListResponseSchema(cars=[], page_links={}, last=True)
+        return CarListResponseSchema(cars=[], page_links={}, last=True, facets=facet_counts)
     base_url = str(request.url.remove_query_params("page"))
     response = await prepare_response(vehicles, total_pages, page, base_url, additional)
+    response.facets = facet_counts
     logger.info(f"Returning {len(response.cars)} cars, total pages: {total_pages}", extra=extra)
     return response
 
@@ -555,9 +559,9 @@ async def scrape_wehicle_by_id(
     car = await session.get(CarModel, car_id)
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
-    celery_app.send_task(
-        "tasks.task.parse_and_update_car",
-        kwargs={
+    sent = send_parse_tasks(
+        celery_app,
+        [{
             "vin": car.vin,
             "car_name": car.vehicle,
             "car_engine": car.engine_title,
@@ -566,9 +570,10 @@ async def scrape_wehicle_by_id(
             "car_model": car.model,
             "car_year": car.year,
             "car_transmison": car.transmision,
-        },
-        queue="car_parsing_queue",)
-    return
+        }],
+        source="scrape",
+    )
+    return {"queued": bool(sent)}
 
 @router.patch("/cars/{car_id}/check")
 async def update_car_is_checked(
@@ -854,9 +859,18 @@ async def delete_part_endpoint(
     }
 
 
-@router.post("/bulk", status_code=201)
+# The body is read by hand (gzip, trusted fast path), so OpenAPI no longer documents it as
+# CarBulkCreateSchema; the description below is all the generated docs show.
+@router.post(
+    "/bulk",
+    status_code=201,
+    description=(
+        "Body is CarBulkCreateSchema as JSON, optionally with `Content-Encoding: gzip`. "
+        f"Internal callers may set `{TRUSTED_PAYLOAD_HEADER}: 1` to skip per-field validation."
+    ),
+)
 async def bulk_create_cars(
-    data: CarBulkCreateSchema,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     token: str = Depends(get_token),
     settings: Settings = Depends(get_settings),
@@ -864,6 +878,8 @@ async def bulk_create_cars(
     request_id = "N/A"
     extra = {"request_id": request_id, "user_id": "N/A"}
 
+    data = parse_bulk_payload(await read_bulk_body(request), trusted=is_trusted_payload(request))
+
     logger.info(f"Starting bulk creation of {len(data.vehicles)} vehicles", extra=extra)
 
     try:
@@ -872,17 +888,13 @@ async def bulk_create_cars(
         await db.commit()
 
         # celery після commit
-        for task_payload in result["celery_tasks"]:
-            celery_app.send_task(
-                "tasks.task.parse_and_update_car",
-                kwargs=task_payload,
-                queue="car_parsing_queue",
-            )
+        send_parse_tasks(celery_app, result["celery_tasks"], source="bulk")
 
         return {
             "message": "Cars processed",
             "new": result["new_count"],
             "updated": result["updated_count"],
+            "unchanged": result["unchanged_count"],
         }
 
     except Exception as e:
@@ -893,11 +905,14 @@ async def bulk_create_cars(
 
 @router.post("/bulk/delete", status_code=status.HTTP_204_NO_CONTENT, summary="Bulk delete vehicles", description="Create multiple vehicles in bulk.")
 async def bulk_delete_cars(
-    payload: dict,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     token: str = Depends(get_token),
     settings: Settings = Depends(get_settings),
 ):
+    payload = await read_bulk_body(request)
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Body must be a JSON object")
     try:
         await update_cars_relevance(payload=payload, db=db)
     except SQLAlchemyError as e:
@@ -1045,6 +1060,13 @@ async def upsert(
 
     task_id = None
 
+    if not claim_vins([vehicle_data.vin], source="upsert"):
+        logger.info("parse_and_update_car already queued or running | vin=%s", vehicle_data.vin)
+        return {
+            "message": "vehicle saved",
+            "task_id": task_id,
+        }
+
     try:
         logger.info(
             "Trying to send Celery task parse_and_update_car | vin=%s",
@@ -1075,6 +1097,7 @@ async def upsert(
         )
 
     except Exception:
+        release_vins([vehicle_data.vin])
         logger.exception(
             "Celery send failed but vehicle saved | vin=%s",
             vehicle_data.vin
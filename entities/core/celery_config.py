@@ -5,6 +5,8 @@ def _gevent_patch_in_child(**_):
     from gevent import monkey
     monkey.patch_all()
 
+import os
+
 from celery import Celery
 from celery.schedules import crontab
 
@@ -35,11 +37,36 @@ app.conf.worker_prefetch_multiplier = 1
 app.conf.broker_connection_retry_on_startup = True
 app.conf.broker_connection_retry = True
 
+# Bid refresh cadence per time-to-auction tier (tasks.task.BID_REFRESH_TIERS): (crontab minute/hour, expires s).
+# BID_REFRESH_MODE=all restores a single every-minute refresh of all active lots.
+BID_REFRESH_SCHEDULES = {
+    "hot": ({"minute": "*/2", "hour": "0-2,4-23"}, 110),
+    "warm": ({"minute": "*/15", "hour": "0-2,4-23"}, 14 * 60),
+    "cold": ({"minute": "45", "hour": "0,4,8,12,16,20"}, 60 * 60),
+}
+
+if os.getenv("BID_REFRESH_MODE", "tiered") == "all":
+    bid_refresh_schedule = {
+        "update-car-bids-every-minute": {
+            "task": "tasks.task.update_car_bids",
+            "schedule": crontab(minute="*", hour="0-2,4-23"),
+            # a refresh older than the next tick is useless; don't let them pile up
+            "options": {"expires": 55},
+        },
+    }
+else:
+    bid_refresh_schedule = {
+        f"update-car-bids-{tier}": {
+            "task": "tasks.task.update_car_bids",
+            "schedule": crontab(**when),
+            "kwargs": {"tier": tier},
+            "options": {"expires": expires},
+        }
+        for tier, (when, expires) in BID_REFRESH_SCHEDULES.items()
+    }
+
 app.conf.beat_schedule = {
-    "update-car-bids-every-15-minutes": {
-        "task": "tasks.task.update_car_bids",
-        "schedule": crontab(minute="30", hour="0-2,4-23"),
-    },
+    **bid_refresh_schedule,
     # "update-fees-every-1-month": {
     #     "task": "tasks.task.update_fees",
     #     "schedule": crontab(day_of_month="1", hour=0, minute=0),
@@ -66,6 +66,9 @@ class Settings(BaseAppSettings):
 
     PARSERS_AUTH_TOKEN: str = os.getenv("PARSERS_AUTH_TOKEN")
 
+    USE_CAR_SEARCH_PROJECTION: bool = os.getenv("USE_CAR_SEARCH_PROJECTION", "false").lower() == "true"
+    USE_COPY_BULK_INGEST: bool = os.getenv("USE_COPY_BULK_INGEST", "false").lower() == "true"
+
     @property
     def S3_STORAGE_ENDPOINT(self) -> str:
         if os.getenv("ENVIRON") == "prod":
@@ -1,22 +1,25 @@
+import asyncio
 import csv
 import http.client
 import json
 import os
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from difflib import SequenceMatcher
 from math import atan2, cos, radians, sin, sqrt
 from typing import Dict
 
+import numpy as np
 from passlib.context import CryptContext
-from sqlalchemy import and_, distinct, select
+from sqlalchemy import and_, distinct, func, literal, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from db.session import SessionLocal
-from models import CarModel, UserModel, UserRoleEnum, UserRoleModel, USZipModel
+from models import CarModel, GeocodeCacheModel, UserModel, UserRoleEnum, UserRoleModel, USZipModel
 from models.user import UserRoleEnum, UserRoleModel
 from models.vehicle import CarModel, PartModel
+from services.zip_index import invalidate_zip_index
 
 EARTH_RADIUS_MI = 3958.8
 
@@ -159,6 +162,9 @@ async def import_us_zips_from_csv(
         await session.commit()
         print(f"✅ JSON: iaai_updates={iaai_updates}, copart_updates={copart_updates}")
 
+    # yard names / coordinates changed: rebuild the in-process zip_search index on next use
+    invalidate_zip_index()
+
 
 async def create_roles():
     async with SessionLocal() as session:
@@ -235,6 +241,9 @@ def get_location_coordinates(query):
     conn.request("POST", "/places", payload, headers)
     res = conn.getresponse()
     data = res.read()
+    if res.status != 200:
+        # rate limits and outages are failures, not "no such place"
+        raise RuntimeError(f"geocoder returned HTTP {res.status}")
     data_dict = json.loads(data.decode("utf-8"))
     places = data_dict.get("places", [])
     if places:
@@ -249,29 +258,120 @@ def similar(a, b):
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+ZIP_MATCH_RADIUS_MI = 20
+CITY_SIMILARITY_MIN = 0.8
+# A cached "no result" answer is asked again after this long; found coordinates never expire.
+GEOCODE_MISS_TTL = timedelta(days=int(os.getenv("GEOCODE_MISS_TTL_DAYS", "30")))
+
+
+class _ZipArrays:
+    """us_zips rows as NumPy arrays so one geocoded point is checked against all ZIPs at once."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.lat = np.radians(np.array([float(r.lat) for r in self.rows], dtype=float))
+        self.lng = np.radians(np.array([float(r.lng) for r in self.rows], dtype=float))
+        self.state = np.array([(r.state_id or "").lower() for r in self.rows])
+        self.states = set(self.state.tolist()) - {""}
+
+    def candidates(self, lat: float, lon: float, location: str) -> list:
+        """ZIP rows in a state mentioned in `location` and within ZIP_MATCH_RADIUS_MI of the point."""
+        loc = location.lower()
+        states = [st for st in self.states if st in loc]
+        if not states:
+            return []
+        idx = np.flatnonzero(np.isin(self.state, states))
+        if idx.size == 0:
+            return []
+
+        lat1, lon1 = radians(lat), radians(lon)
+        zlat = self.lat[idx]
+        a = np.sin((zlat - lat1) / 2) ** 2 + cos(lat1) * np.cos(zlat) * np.sin((self.lng[idx] - lon1) / 2) ** 2
+        dist = 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        return [self.rows[i] for i in idx[dist <= ZIP_MATCH_RADIUS_MI]]
+
+
+def _city_matches(city: str, location: str) -> bool:
+    """similar(city, location) > CITY_SIMILARITY_MIN, rejecting early on the cheap upper bounds."""
+    matcher = SequenceMatcher(None, city.lower(), location.lower())
+    if matcher.real_quick_ratio() <= CITY_SIMILARITY_MIN or matcher.quick_ratio() <= CITY_SIMILARITY_MIN:
+        return False
+    return matcher.ratio() > CITY_SIMILARITY_MIN
+
+
+def _apply_yard_name(candidates: list, location: str, auction: str) -> int:
+    updated = 0
+    for zip_entry in candidates:
+        if not _city_matches(zip_entry.city, location):
+            continue
+        if auction.lower() == "copart" and not zip_entry.copart_name:
+            zip_entry.copart_name = location
+            updated += 1
+        elif auction.lower() == "iaai" and not zip_entry.iaai_name:
+            zip_entry.iaai_name = location
+            updated += 1
+    return updated
+
+
+def _is_usable(entry: GeocodeCacheModel) -> bool:
+    return entry.lat is not None or entry.created_at >= datetime.utcnow() - GEOCODE_MISS_TTL
+
+
+async def _geocode_cached(db: AsyncSession, query: str, known: Dict[str, tuple]) -> tuple:
+    """
+    Geocode `query` through the geocode_cache table; the external geocoder is hit only on a miss.
+
+    A confirmed "no result" is stored with NULL coordinates and asked again after GEOCODE_MISS_TTL.
+    Failed calls (network errors, rate limits) are not stored, so the next run retries them.
+    """
+    if query in known:
+        return known[query]
+    cached = await db.get(GeocodeCacheModel, query)
+    if cached is not None and _is_usable(cached):
+        known[query] = (cached.lat, cached.lng)
+        return known[query]
+
+    try:
+        lat, lng = await asyncio.to_thread(get_location_coordinates, query)
+    except Exception as e:
+        print(f"⚠️  Geocoding failed for {query!r}: {e}")
+        known[query] = (None, None)  # not persisted; only spares the geocoder for the rest of this run
+        return known[query]
+
+    if cached is None:
+        db.add(GeocodeCacheModel(query=query, lat=lat, lng=lng, created_at=datetime.utcnow()))
+    else:
+        cached.lat, cached.lng, cached.created_at = lat, lng, datetime.utcnow()
+    known[query] = (lat, lng)
+    return known[query]
+
+
 async def match_and_update_location(location: str, auction: str):
     async with SessionLocal() as db:
-        lat, lon = get_location_coordinates(location)
+        lat, lon = await _geocode_cached(db, location, {})
         if not lat or not lon:
+            await db.commit()
             return
 
-        zip_stmt = await db.execute(select(USZipModel))
-        all_zips = zip_stmt.scalars().all()
-
-        if all_zips:
-            for zip_entry in all_zips:
-                dist = haversine(lat, lon, float(zip_entry.lat), float(zip_entry.lng))
-                if dist <= 20:
-                    if similar(zip_entry.city, location) > 0.8 and zip_entry.state_id.lower() in location.lower():
-                        if auction.lower() == "copart" and not zip_entry.copart_name:
-                            zip_entry.copart_name = location
-                        elif auction.lower() == "iaai" and not zip_entry.iaai_name:
-                            zip_entry.iaai_name = location
+        # state prefilter in SQL: only ZIPs whose state code appears in the location string
+        zip_stmt = await db.execute(
+            select(USZipModel).where(func.lower(literal(location)).contains(func.lower(USZipModel.state_id)))
+        )
+        zips = _ZipArrays(zip_stmt.scalars().all())
+        _apply_yard_name(zips.candidates(lat, lon, location), location, auction)
 
-            await db.commit()
+        await db.commit()
+    invalidate_zip_index()
 
 
 async def match_and_update_locations():
+    """
+    Batch job: map every distinct (location, auction) pair of cars onto us_zips yard names.
+
+    ZIPs are loaded once into NumPy arrays; each pair is geocoded through the persistent cache,
+    narrowed by state, distance-checked in one vectorized pass and fuzzy-matched on the few
+    remaining candidates. Everything is committed at the end.
+    """
     async with SessionLocal() as db:
         stmt = (
             select(CarModel.location, CarModel.auction)
@@ -280,23 +380,26 @@ async def match_and_update_locations():
         )
         result = await db.execute(stmt)
         rows = result.all()
+        if not rows:
+            return
+
+        zip_stmt = await db.execute(select(USZipModel))
+        zips = _ZipArrays(zip_stmt.scalars().all())
+        if not zips.rows:
+            return
 
+        known = {
+            c.query: (c.lat, c.lng) for c in (await db.execute(select(GeocodeCacheModel))).scalars() if _is_usable(c)
+        }
+
+        updated = 0
         for location, auction in rows:
-            lat, lon = get_location_coordinates(location)
+            lat, lon = await _geocode_cached(db, location, known)
             if not lat or not lon:
                 continue
+            updated += _apply_yard_name(zips.candidates(lat, lon, location), location, auction)
 
-            zip_stmt = await db.execute(select(USZipModel))
-            all_zips = zip_stmt.scalars().all()
-
-            if all_zips:
-                for zip_entry in all_zips:
-                    dist = haversine(lat, lon, float(zip_entry.lat), float(zip_entry.lng))
-                    if dist <= 20:
-                        if similar(zip_entry.city, location) > 0.8 and zip_entry.state_id.lower() in location.lower():
-                            if auction.lower() == "copart" and not zip_entry.copart_name:
-                                zip_entry.copart_name = location
-                            elif auction.lower() == "iaai" and not zip_entry.iaai_name:
-                                zip_entry.iaai_name = location
+        await db.commit()
+        print(f"✅ Locations: pairs={len(rows)}, yard names set={updated}")
 
-                await db.commit()
+    invalidate_zip_index()
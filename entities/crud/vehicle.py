@@ -1,19 +1,46 @@
+import base64
+import enum
+import json
 import logging
 from datetime import datetime, time, timezone
 from math import asin, cos, radians, sin, sqrt
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import and_, asc, bindparam, case, delete, desc, exists, func, literal_column, or_, select, update, text
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    String,
+    and_,
+    asc,
+    case,
+    cast,
+    delete,
+    desc,
+    exists,
+    func,
+    literal,
+    literal_column,
+    nulls_last,
+    or_,
+    select,
+    text,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, noload, selectinload, with_loader_criteria
 from sqlalchemy.sql import over
 
+from core.config import settings
 from core.dependencies import get_s3_storage_client
 from core.setup import match_and_update_location
 from models.admin import FilterModel
+from models.car_search import CarSearchModel
 from models.user import UserModel, UserRoleEnum, user_likes
 from models.vehicle import (
     AutoCheckModel,
@@ -30,10 +57,12 @@ from models.vehicle import (
     PhotoModel,
     RecommendationStatus,
     RelevanceStatus,
-    USZipModel,
 )
-from ordering_constr import ORDERING_MAP
+from ordering_constr import ORDERING_KEYS
 from services.car_audit import log_car_update
+from services.car_search import SEARCH_STRING_COLUMNS, refresh_car_search
+from services.filter_options_cache import bump_filter_options_version
+from services.zip_index import get_zip_index
 from services.makes_and_models import MAKES_AND_MODELS
 from schemas.vehicle import CarBulkCreateSchema, CarCreateSchema, CarUpsertSchema
 
@@ -171,6 +200,12 @@ async def update_cars_relevance(payload: Dict, db: AsyncSession) -> None:
             )
         )
 
+        await db.execute(
+            delete(CarSearchModel).where(
+                CarSearchModel.car_id.in_(irrelevant_car_ids)
+            )
+        )
+
         # delete cars last
         await db.execute(
             delete(CarModel).where(
@@ -217,8 +252,14 @@ async def update_cars_relevance(payload: Dict, db: AsyncSession) -> None:
             .values(relevance=RelevanceStatus.ARCHIVAL)
         )
 
+        # archived cars drop out of the list projection
+        await refresh_car_search(db, to_archive_ids)
+
     await db.commit()
 
+    if irrelevant_car_ids or to_archive_ids:
+        bump_filter_options_version()
+
     # -------------------------------------------------------
     # 3. Delete S3 files AFTER successful commit
     # -------------------------------------------------------
@@ -573,33 +614,29 @@ async def save_vehicle(db: AsyncSession, vehicle_data: CarCreateSchema) -> Optio
     return db_vehicle
 
 
-async def get_filtered_vehicles(
-    db: "AsyncSession",
-    filters: Dict[str, Any],
-    ordering,
-    page: int,
-    page_size: int
-) -> Tuple[List["CarModel"], int, int, Dict[str, Any]]:
+async def _build_filtered_ids_query(db: "AsyncSession", filters: Dict[str, Any]):
     """
-    Return vehicles with full filtering, deterministic ordering, and de-duplicated pagination.
+    Build the filtered SELECT over CarModel.id shared by offset and keyset pagination.
 
-    Strategy to avoid duplicates:
-      1) Build a filtered SELECT over CarModel.id only (no eager loads) -> DISTINCT ids subquery.
-      2) ORDER and paginate those ids.
-      3) Fetch full CarModel rows for the paginated ids (with eager loads) + computed "liked" flag.
-
-    This guarantees: count == size of the DISTINCT id set, and page results have unique cars.
+    Returns:
+        (base_ids, liked_exists, loader_options): the id query, the per-user "liked" EXISTS
+        clause (reused for projection) and the eager-load options for the final fetch.
     """
 
     def _norm_strs(values: Iterable[Any]) -> List[str]:
         """Lowercase only string values."""
         return [v.lower() for v in values if isinstance(v, str)]
 
+    use_projection = filters.get("use_search_projection", settings.USE_CAR_SEARCH_PROJECTION)
+
     def _str_in(field, values: Iterable[Any]):
         """Case-insensitive IN against a list of strings; returns SQLA clause or False if empty."""
         vals = _norm_strs(values)
         if not vals:
             return False
+        if use_projection:
+            # car_search already stores these columns lower-cased
+            return getattr(CarSearchModel, SEARCH_STRING_COLUMNS[field.key]).in_(vals)
         return func.lower(field).in_(vals)
 
     def _int_in(field, values: Iterable[Any]):
@@ -620,29 +657,40 @@ async def get_filtered_vehicles(
     )
 
     # Base: filter for valid/active sellable cars
-    base_ids = (
-        select(CarModel.id)
-        .filter(
-            CarModel.relevance == RelevanceStatus.ACTIVE,
-            CarModel.predicted_total_investments.isnot(None),
-            CarModel.predicted_total_investments > 0,
-            CarModel.suggested_bid.isnot(None),
-            CarModel.suggested_bid > 0,
-            or_(
-                CarModel.date.isnot(None),
-                CarModel.auction_name == "Buynow"
-            ),
+    if use_projection:
+        # car_search only holds cars that already pass the base predicate
+        base_ids = select(CarModel.id).join(CarSearchModel, CarSearchModel.car_id == CarModel.id)
+    else:
+        base_ids = (
+            select(CarModel.id)
+            .filter(
+                CarModel.relevance == RelevanceStatus.ACTIVE,
+                CarModel.predicted_total_investments.isnot(None),
+                CarModel.predicted_total_investments > 0,
+                CarModel.suggested_bid.isnot(None),
+                CarModel.suggested_bid > 0,
+                or_(
+                    CarModel.date.isnot(None),
+                    CarModel.auction_name == "Buynow"
+                ),
+            )
         )
-    )
 
     # ---- ConditionAssessments via EXISTS (no JOIN → no duplication) ----
     # Also prepare optional loader criteria to restrict loaded related rows.
     cond_values = filters.get("condition_assessments")
+    default_excluded = ["Biohazard/Chemical", "Water/Flood", "Rejected Repair"]
     loader_options = [
         selectinload(CarModel.photos),
         selectinload(CarModel.condition_assessments),
     ]
-    if cond_values:
+    if use_projection:
+        # array overlap on the projected issue list instead of a correlated subquery
+        if cond_values:
+            base_ids = base_ids.filter(CarSearchModel.issue_descriptions.overlap(cond_values))
+        else:
+            base_ids = base_ids.filter(~CarSearchModel.issue_descriptions.overlap(default_excluded))
+    elif cond_values:
         base_ids = base_ids.filter(
             exists(
                 select(1)
@@ -653,15 +701,7 @@ async def get_filtered_vehicles(
                 )
             )
         )
-        loader_options.append(
-            with_loader_criteria(
-                ConditionAssessmentModel,
-                ConditionAssessmentModel.issue_description.in_(cond_values),
-                include_aliases=True,
-            )
-        )
     else:
-        default_excluded = ["Biohazard/Chemical", "Water/Flood", "Rejected Repair"]
         base_ids = base_ids.filter(
             ~exists(
                 select(1)
@@ -673,37 +713,24 @@ async def get_filtered_vehicles(
             )
         )
 
+    if cond_values:
+        loader_options.append(
+            with_loader_criteria(
+                ConditionAssessmentModel,
+                ConditionAssessmentModel.issue_description.in_(cond_values),
+                include_aliases=True,
+            )
+        )
+
     # ---- ZIP proximity search (Copart/IAAI yard names) ----
     if filters.get("zip_search"):
         zip_code, radius = filters["zip_search"]
-        zip_row = await db.execute(select(USZipModel).where(USZipModel.zip == zip_code))
-        zip_data = zip_row.scalar_one_or_none()
-        if not zip_data:
+        zip_index = await get_zip_index(db)
+        center = zip_index.lookup(zip_code)
+        if center is None:
             raise HTTPException(status_code=404, detail=f"ZIP {zip_code} not found")
 
-        lat1, lon1 = float(zip_data.lat), float(zip_data.lng)
-        dot = (
-            func.sin(func.radians(bindparam("lat1"))) * func.sin(func.radians(USZipModel.lat)) +
-            func.cos(func.radians(bindparam("lat1"))) * func.cos(func.radians(USZipModel.lat)) *
-            func.cos(func.radians(USZipModel.lng) - func.radians(bindparam("lon1")))
-        )
-
-        clamped = func.least(1.0, func.greatest(-1.0, dot))
-
-        distance_expr = (3958.8 * func.acos(clamped)).label("distance")
-
-        zip_subq = (
-            select(USZipModel.copart_name, USZipModel.iaai_name)
-            .where(distance_expr <= bindparam("radius"))
-        ).params(lat1=lat1, lon1=lon1, radius=radius)
-
-        zip_result = await db.execute(zip_subq)
-        zip_names: set[str] = set()
-        for copart, iaai in zip_result.all():
-            if copart:
-                zip_names.add(copart.lower())
-            if iaai:
-                zip_names.add(iaai.lower())
+        zip_names: set[str] = zip_index.names_within(center[0], center[1], float(radius))
 
         if zip_names:
             base_ids = base_ids.filter(_str_in(CarModel.location, zip_names))
@@ -731,7 +758,10 @@ async def get_filtered_vehicles(
             base_ids = base_ids.filter(_str_in(column, values))
         elif field_name == "fuel_type":
             # Default rule from your original code: exclude Hybrids when no explicit fuel_type given
-            base_ids = base_ids.filter(CarModel.fuel_type != "Hybrid")
+            if use_projection:
+                base_ids = base_ids.filter(CarSearchModel.fuel_type != "hybrid")
+            else:
+                base_ids = base_ids.filter(CarModel.fuel_type != "Hybrid")
 
     # ---- Integer IN filters ----
     if filters.get("engine_cylinder"):
@@ -791,24 +821,121 @@ async def get_filtered_vehicles(
             base_ids = base_ids.filter(CarModel.is_salvage == True)
         elif is_salvage and len(is_salvage) == 1 and "Clean" in is_salvage:
             base_ids = base_ids.filter(CarModel.is_salvage == False)
+
+    return base_ids, liked_exists, loader_options
+
+
+# Columns that can be requested as facets on the car list (`facets=` on GET /vehicles/).
+FACET_COLUMNS = {
+    "make": CarModel.make,
+    "model": CarModel.model,
+    "auction": CarModel.auction,
+    "body_style": CarModel.body_style,
+    "fuel_type": CarModel.fuel_type,
+    "location": CarModel.location,
+}
+_FACET_TOTAL = "__total__"
+
+
+async def _count_with_facets(
+    db: "AsyncSession", distinct_ids_sq, facets: Iterable[str]
+) -> Tuple[int, Dict[str, Dict[str, int]]]:
+    """
+    Total count + per-value counts for the requested facets over the already-filtered id set.
+
+    Everything is one UNION ALL statement over `distinct_ids_sq`, so the counts and the total
+    come from the same snapshot and the filters are not re-applied per facet.
+    """
+    facet_names = [name for name in dict.fromkeys(facets) if name in FACET_COLUMNS]
+    matched = (
+        select(CarModel.id, *[FACET_COLUMNS[name] for name in facet_names])
+        .where(CarModel.id.in_(select(distinct_ids_sq.c.id)))
+        .subquery()
+    )
+
+    parts = [
+        select(
+            literal(_FACET_TOTAL).label("facet"),
+            cast(literal(None), String).label("value"),
+            func.count().label("cnt"),
+        ).select_from(matched)
+    ]
+    for name in facet_names:
+        col = matched.c[FACET_COLUMNS[name].key]
+        parts.append(
+            select(literal(name).label("facet"), cast(col, String).label("value"), func.count().label("cnt"))
+            .where(col.isnot(None))
+            .group_by(col)
+        )
+
+    total_count = 0
+    facet_counts: Dict[str, Dict[str, int]] = {name: {} for name in facet_names}
+    for facet, value, cnt in (await db.execute(union_all(*parts))).all():
+        if facet == _FACET_TOTAL:
+            total_count = cnt
+        else:
+            facet_counts[facet][value] = cnt
+    return total_count, facet_counts
+
+
+def _list_order_by(ordering: str) -> Tuple[Any, Any]:
+    """
+    ORDER BY for a list ordering: the sort column NULLS LAST, then id in the same direction.
+    This is exactly the key of the matching ix_cars_active_<ordering> partial index, so a page
+    is read off the index instead of sorting every active car. Unknown orderings fall back to
+    created_at_desc.
+    """
+    column, direction = ORDERING_KEYS.get(ordering, ORDERING_KEYS["created_at_desc"])
+    if direction == "desc":
+        return nulls_last(desc(column)), desc(CarModel.id)
+    return nulls_last(asc(column)), asc(CarModel.id)
+
+
+async def get_filtered_vehicles(
+    db: "AsyncSession",
+    filters: Dict[str, Any],
+    ordering,
+    page: int,
+    page_size: int,
+    facets: Optional[List[str]] = None,
+) -> Tuple[List["CarModel"], int, int, Dict[str, Any]]:
+    """
+    Return vehicles with full filtering, deterministic ordering, and de-duplicated pagination.
+
+    Strategy to avoid duplicates:
+      1) Build a filtered SELECT over CarModel.id only (no eager loads); it yields each car once
+         (filters are EXISTS, the car_search join is 1:1). Counts run over its DISTINCT ids.
+      2) ORDER and paginate that SELECT directly, so the partial list index serves ORDER BY + LIMIT.
+      3) Fetch full CarModel rows for the paginated ids (with eager loads) + computed "liked" flag.
+
+    This guarantees: count == size of the DISTINCT id set, and page results have unique cars.
+
+    When `facets` is given (names from FACET_COLUMNS), per-value counts are computed in the
+    same statement as the total and returned under the "facets" key of the last element.
+    """
+
+    base_ids, liked_exists, loader_options = await _build_filtered_ids_query(db, filters)
+
     # ----------------------------
     # COUNT over DISTINCT ids
     # ----------------------------
     distinct_ids_sq = base_ids.distinct().subquery()
-    total_count = await db.scalar(select(func.count()).select_from(distinct_ids_sq))
+    facet_counts = None
+    if facets:
+        total_count, facet_counts = await _count_with_facets(db, distinct_ids_sq, facets)
+    else:
+        total_count = await db.scalar(select(func.count()).select_from(distinct_ids_sq))
     total_pages = (total_count + page_size - 1) // page_size if page_size > 0 else 1
 
-    # Determine the ordering
-    ORDERING = globals().get("ORDERING_MAP", {})
-    order_clause = ORDERING.get(ordering, desc(CarModel.created_at))
+    # Determine the ordering; id follows the sort direction as a stable tie-breaker
+    order_by = _list_order_by(ordering)
 
     # ----------------------------
     # Page of ids: ORDER + OFFSET/LIMIT (stable ordering)
     # ----------------------------
     paged_ids_sq = (
-        select(distinct_ids_sq.c.id)
-        .join(CarModel, CarModel.id == distinct_ids_sq.c.id)
-        .order_by(order_clause, CarModel.id)  # stable tie-breaker
+        base_ids
+        .order_by(*order_by)
         .offset(max(page - 1, 0) * page_size)
         .limit(page_size)
     ).subquery()
@@ -819,7 +946,7 @@ async def get_filtered_vehicles(
     page_query = (
         select(CarModel, liked_exists.label("liked"))
         .where(CarModel.id.in_(select(paged_ids_sq.c.id)))
-        .order_by(order_clause, CarModel.id)
+        .order_by(*order_by)
         .options(*loader_options)
     )
 
@@ -858,9 +985,200 @@ async def get_filtered_vehicles(
             "total_count": total_count,
         }
 
+    if facet_counts is not None:
+        bids_info["facets"] = facet_counts
+
     return vehicles, total_count, total_pages, bids_info
 
 
+def _encode_cursor(ordering: str, column, value: Any, car_id: int) -> str:
+    """Pack the last row's sort key + id into an opaque, URL-safe cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(column.type, Enum) and value is not None:
+        value = value.name
+    raw = json.dumps({"o": ordering, "v": value, "id": car_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, ordering: str, column) -> Tuple[Any, int]:
+    """Unpack a cursor produced by `_encode_cursor`; raises 400 if it is malformed or for another ordering."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if payload["o"] != ordering:
+            raise ValueError("cursor was issued for a different ordering")
+        value = payload["v"]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column.type, Enum):
+            value = column.type.enum_class[value]
+        return value, int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+
+async def get_filtered_vehicles_keyset(
+    db: "AsyncSession",
+    filters: Dict[str, Any],
+    ordering,
+    cursor: Optional[str],
+    page_size: int,
+    include_total: bool = False,
+    facets: Optional[List[str]] = None,
+) -> Tuple[List["CarModel"], Optional[str], Optional[int], Dict[str, Any]]:
+    """
+    Keyset (cursor) variant of `get_filtered_vehicles`.
+
+    Instead of OFFSET it seeks past the last returned row with a row-value comparison on
+    (sort column, id), so page 500 costs the same as page 1. NULL sort values go last,
+    matching ORDERING_MAP.
+
+    The exact total count is only computed on the first page (together with bid aggregates)
+    or when `include_total` / `facets` is set; facets behave as in `get_filtered_vehicles`.
+
+    Returns:
+        (vehicles, next_cursor, total_count, bids_info); next_cursor is None on the last page,
+        total_count is None when it was not computed.
+    """
+    base_ids, liked_exists, loader_options = await _build_filtered_ids_query(db, filters)
+
+    if ordering not in ORDERING_KEYS:
+        ordering = "created_at_desc"
+    column, direction = ORDERING_KEYS[ordering]
+    is_desc = direction == "desc"
+    order_by = _list_order_by(ordering)
+
+    distinct_ids_sq = base_ids.distinct().subquery()
+
+    # base_ids yields each car once; seeking on it directly lets the partial list index serve the page
+    seek = base_ids
+    if cursor:
+        last_value, last_id = _decode_cursor(cursor, ordering, column)
+        if last_value is None:
+            # Already inside the trailing NULL block: only the id keeps moving.
+            seek = seek.where(column.is_(None), CarModel.id < last_id if is_desc else CarModel.id > last_id)
+        else:
+            row, bound = tuple_(column, CarModel.id), tuple_(last_value, last_id)
+            seek = seek.where(or_(row < bound if is_desc else row > bound, column.is_(None)))
+
+    # Fetch one extra id to know whether there is a next page without counting.
+    paged_ids_sq = seek.order_by(*order_by).limit(page_size + 1).subquery()
+
+    page_query = (
+        select(CarModel, liked_exists.label("liked"))
+        .where(CarModel.id.in_(select(paged_ids_sq.c.id)))
+        .order_by(*order_by)
+        .options(*loader_options)
+    )
+    rows = (await db.execute(page_query)).all()
+
+    has_more = len(rows) > page_size
+    vehicles: List[CarModel] = []
+    for car, liked in rows[:page_size]:
+        setattr(car, "liked", bool(liked))
+        vehicles.append(car)
+
+    next_cursor = None
+    if has_more and vehicles:
+        last = vehicles[-1]
+        next_cursor = _encode_cursor(ordering, column, getattr(last, column.key), last.id)
+
+    total_count: Optional[int] = None
+    bids_info: Dict[str, Any] = {}
+    if not cursor:
+        agg_row = (await db.execute(
+            select(
+                func.min(CarModel.current_bid),
+                func.max(CarModel.current_bid),
+                func.avg(CarModel.current_bid),
+                func.count(CarModel.id),
+            ).where(CarModel.id.in_(select(distinct_ids_sq.c.id)))
+        )).one()
+        min_bid, max_bid, avg_bid, total_count = agg_row
+        bids_info = {
+            "min_bid": min_bid,
+            "max_bid": max_bid,
+            "avg_bid": round(avg_bid or 0.0, 2),
+            "total_count": total_count,
+        }
+    elif include_total and not facets:
+        total_count = await db.scalar(select(func.count()).select_from(distinct_ids_sq))
+
+    if facets:
+        total_count, bids_info["facets"] = await _count_with_facets(db, distinct_ids_sq, facets)
+
+    return vehicles, next_cursor, total_count, bids_info
+
+
+async def compute_car_filter_options(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Compute all filter facets over ACTIVE cars in a single scan.
+
+    Each facet is an array_agg(DISTINCT ...) (NULLs stripped below) and the ranges are plain
+    min/max in the same SELECT; condition issues come from a scalar subquery, so the whole
+    thing is one round-trip instead of one query per facet.
+
+    Returns:
+        Dict[str, Any]: kwargs for CarFilterOptionsSchema.
+    """
+    distinct_columns = {
+        "auctions": CarModel.auction,
+        "auction_names": CarModel.auction_name,
+        "transmissions": CarModel.transmision,
+        "body_styles": CarModel.body_style,
+        "vehicle_types": CarModel.vehicle_type,
+        "fuel_types": CarModel.fuel_type,
+        "drive_types": CarModel.drive_type,
+        "conditions": CarModel.condition,
+        "engine_cylinders": CarModel.engine_cylinder,
+        "locations": CarModel.location,
+    }
+    range_columns = {
+        "years": CarModel.year,
+        "mileage_range": CarModel.mileage,
+        "accident_count_range": CarModel.accident_count,
+        "owners_range": CarModel.owners,
+    }
+    make_model_sep = "\x1f"
+
+    issues_sq = (
+        select(func.array_agg(ConditionAssessmentModel.issue_description.distinct()))
+        .where(ConditionAssessmentModel.issue_description.isnot(None))
+        .scalar_subquery()
+    )
+
+    stmt = select(
+        *[func.array_agg(col.distinct()).label(name) for name, col in distinct_columns.items()],
+        # NULL when either side is NULL, so incomplete pairs drop out with the other NULLs
+        func.array_agg((CarModel.make + make_model_sep + CarModel.model).distinct()).label("make_model"),
+        *[func.min(col).label(f"{name}_min") for name, col in range_columns.items()],
+        *[func.max(col).label(f"{name}_max") for name, col in range_columns.items()],
+        issues_sq.label("condition_assesstments"),
+    ).where(CarModel.relevance == RelevanceStatus.ACTIVE)
+
+    row = (await db.execute(stmt)).one()._mapping
+
+    options: Dict[str, Any] = {
+        name: [v for v in (row[name] or []) if v is not None] for name in distinct_columns
+    }
+    options["condition_assesstments"] = [v for v in (row["condition_assesstments"] or []) if v is not None]
+
+    make_model_map: Dict[str, List[str]] = {}
+    for pair in row["make_model"] or []:
+        if pair is None:
+            continue
+        make, model = pair.split(make_model_sep, 1)
+        make_model_map.setdefault(make, []).append(model)
+    options["makes_and_models"] = make_model_map
+
+    for name in range_columns:
+        low, high = row[f"{name}_min"], row[f"{name}_max"]
+        options[name] = {"min": low, "max": high} if low and high else None
+
+    return options
+
+
 async def get_bidding_hub_vehicles(
     db: AsyncSession,
     page: int,
@@ -1132,6 +1450,90 @@ async def delete_part(db: AsyncSession, car_id: int, part_id: int) -> tuple[bool
     return True, car
 
 
+CARS_BULK_STAGE_TABLE = "cars_bulk_stage"
+
+
+def _same_value(stored: Any, incoming: Any) -> bool:
+    # timestamptz columns load tz-aware; naive feed datetimes are stored as UTC
+    if isinstance(stored, datetime) and isinstance(incoming, datetime):
+        if (stored.tzinfo is None) != (incoming.tzinfo is None):
+            stored, incoming = (d if d.tzinfo else d.replace(tzinfo=timezone.utc) for d in (stored, incoming))
+    return stored == incoming
+
+
+def _conditions_key(assessments: Iterable[Any]) -> List[tuple]:
+    return sorted((a.type_of_damage or "", a.issue_description or "") for a in assessments or [])
+
+
+def _copy_value(value: Any) -> Any:
+    # SQLAlchemy's Enum columns store member names; COPY bypasses the type adapter.
+    return value.name if isinstance(value, enum.Enum) else value
+
+
+async def _copy_records(db: AsyncSession, table_name: str, columns: List[str], rows: List[Dict[str, Any]]) -> None:
+    """Stream dict rows into `table_name` with asyncpg COPY on the session's current connection."""
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table_name,
+        records=[tuple(_copy_value(row.get(col)) for col in columns) for row in rows],
+        columns=columns,
+    )
+
+
+async def _copy_merge_cars(
+    db: AsyncSession,
+    car_rows: List[Dict[str, Any]],
+    columns: List[str],
+    keep_columns: Iterable[str],
+) -> Dict[str, int]:
+    """
+    Upsert `car_rows` through a temp staging table (Postgres only).
+
+    Rows are COPY'd into a session-private ``cars_bulk_stage`` table and merged with one
+    ``INSERT ... SELECT ... ON CONFLICT (vin)``. A NULL in the feed keeps the stored value, except
+    ``date`` which is always taken from the feed; `keep_columns` are never updated. Must run inside
+    the caller's transaction; the stage is dropped on commit.
+
+    Returns:
+        VIN -> car id for every merged row.
+    """
+    pg = postgresql.dialect()
+    col_types = {c.name: c.type for c in CarModel.__table__.columns}
+    q = {col: pg.identifier_preparer.quote(col) for col in columns}
+
+    await db.execute(
+        text(
+            f"CREATE TEMP TABLE {CARS_BULK_STAGE_TABLE} ("
+            + ", ".join(f"{q[col]} {col_types[col].compile(dialect=pg)}" for col in columns)
+            + ") ON COMMIT DROP"
+        )
+    )
+    await _copy_records(db, CARS_BULK_STAGE_TABLE, columns, car_rows)
+
+    # Keep-if-NULL is resolved in the SELECT against the stored row: Postgres checks NOT NULL on
+    # the proposed row before ON CONFLICT, so an existing car's row must already be complete.
+    def select_col(col: str) -> str:
+        if col in ("vin", "date"):
+            return f"s.{q[col]}"
+        if col == "created_at":
+            return f"COALESCE(s.{q[col]}, c.{q[col]}, now())"
+        return f"COALESCE(s.{q[col]}, c.{q[col]})"
+
+    skip = {"id", "vin", "created_at", *keep_columns}
+    assignments = ", ".join(f"{q[col]} = EXCLUDED.{q[col]}" for col in columns if col not in skip)
+    result = await db.execute(
+        text(
+            f"INSERT INTO cars ({', '.join(q.values())}) "
+            f"SELECT {', '.join(select_col(col) for col in columns)} "
+            f"FROM {CARS_BULK_STAGE_TABLE} AS s LEFT JOIN cars AS c ON c.vin = s.vin "
+            f"ON CONFLICT (vin) DO UPDATE SET {assignments} "
+            "RETURNING id, vin"
+        )
+    )
+    return {r.vin: r.id for r in result}
+
+
 async def bulk_save_vehicles(
     db: AsyncSession,
     payload: CarBulkCreateSchema,
@@ -1144,7 +1546,16 @@ async def bulk_save_vehicles(
     2. Transaction #1: upsert only cars.
     3. Transaction #2: replace condition assessments.
     4. Transaction #3: insert photos.
-    5. Return celery payload for follow-up parsing.
+    5. Transaction #4: re-project touched cars into car_search.
+    6. Return celery payload for follow-up parsing.
+
+    Existing cars for which the import would change nothing (car columns, photo URLs and
+    condition assessments compared with the stored row) are not written at all; assessments
+    and photos are only touched for cars whose respective set changed.
+
+    With settings.USE_COPY_BULK_INGEST (Postgres only) cars, condition assessments and photos are
+    streamed in with COPY, and the keep-if-NULL merge for existing cars happens in SQL
+    (see `_copy_merge_cars`) instead of copying stored values into each row in Python.
 
     Important:
     - Bulk updater must not overwrite parse-derived fields.
@@ -1156,9 +1567,11 @@ async def bulk_save_vehicles(
     # ============================================================
     vehicles_in = payload.vehicles or []
     ivent = payload.ivent
+    use_copy = settings.USE_COPY_BULK_INGEST
 
     new_count = 0
     updated_count = 0
+    unchanged_count = 0
 
     # ============================================================
     # DEDUP VINs
@@ -1179,6 +1592,7 @@ async def bulk_save_vehicles(
             "total": 0,
             "new_count": 0,
             "updated_count": 0,
+            "unchanged_count": 0,
         }
 
     # ============================================================
@@ -1210,6 +1624,29 @@ async def bulk_save_vehicles(
             "recommendation_status_reasons": None,
         }
 
+    def is_unchanged(existing: Optional[CarModel], data: Dict[str, Any]) -> bool:
+        """
+        True when upserting `data` would leave the stored row as it is: NULL keeps the stored
+        value (except `date`) and EXCLUDED_FROM_BULK_UPDATE is never written. Compared with the
+        row loaded above, so changes made by other writers (parse, bid refresh, expiry, upsert)
+        are never mistaken for "already imported".
+
+        The recommendation fields are left out: here they are rebuilt from feed columns that are
+        compared anyway, while the stored ones also carry reasons added by parse_and_update_car.
+        """
+        if existing is None:
+            return False
+        for col, value in data.items():
+            if col in ("vin", "created_at") or col in EXCLUDED_FROM_BULK_UPDATE:
+                continue
+            if col in ("recommendation_status", "recommendation_status_reasons"):
+                continue
+            if value is None and col != "date":
+                continue
+            if not _same_value(getattr(existing, col), value):
+                return False
+        return True
+
     async def apply_tx_timeouts(session: AsyncSession) -> None:
         """
         Keep lock waits short so the app does not hang under contention.
@@ -1227,6 +1664,7 @@ async def bulk_save_vehicles(
         .options(
             selectinload(CarModel.photos),
             selectinload(CarModel.sales_history),
+            selectinload(CarModel.condition_assessments),
         )
     )
     existing_map: dict[str, CarModel] = {
@@ -1276,6 +1714,9 @@ async def bulk_save_vehicles(
         row.update(data)
 
         if existing is not None:
+            # the COPY merge fills NULLs from the stored row in SQL
+            if use_copy:
+                return row
             for col in car_columns:
                 if col == "date":
                     continue
@@ -1322,6 +1763,7 @@ async def bulk_save_vehicles(
     # ============================================================
     car_rows: List[Dict[str, Any]] = []
     cond_insert: List[Dict[str, Any]] = []   # temp rows with VIN
+    cond_replace_vins: set[str] = set()      # cars whose assessments are replaced
     photos_insert: List[Dict[str, Any]] = [] # temp rows with VIN
     celery_payload: List[Dict[str, Any]] = []
 
@@ -1362,12 +1804,13 @@ async def bulk_save_vehicles(
             if value is not None or field == "date":
                 data[field] = value
 
+        conditions_changed = False
+        photos_changed = False
+
         # ========================================================
         # UPDATE
         # ========================================================
         if existing:
-            updated_count += 1
-
             # manually upserted cars: only update safe minimal fields
             if existing.is_manually_upserted:
                 minimal_data = {"vin": v.vin}
@@ -1382,9 +1825,17 @@ async def bulk_save_vehicles(
                         add_reason_once(reasons, "BID_GT_SUGGESTED")
 
                 minimal_data.update(build_recommendation_fields(reasons))
-                car_rows.append(build_row(minimal_data, existing))
+                if is_unchanged(existing, minimal_data):
+                    unchanged_count += 1
+                else:
+                    updated_count += 1
+                    car_rows.append(build_row(minimal_data, existing))
                 continue
 
+            conditions_changed = _conditions_key(v.condition_assessments) != _conditions_key(
+                existing.condition_assessments
+            )
+
             if existing.relevance == RelevanceStatus.ACTIVE:
                 if not existing.is_checked and existing.attempts < 3:
                     to_parse = True
@@ -1406,15 +1857,19 @@ async def bulk_save_vehicles(
             if trans and trans != "Automatic":
                 add_reason_once(reasons, trans)
 
+            if conditions_changed:
+                cond_replace_vins.add(v.vin)
+
             if v.condition_assessments:
                 for a in v.condition_assessments:
-                    cond_insert.append(
-                        {
-                            "vin": v.vin,
-                            "type_of_damage": a.type_of_damage,
-                            "issue_description": a.issue_description,
-                        }
-                    )
+                    if conditions_changed:
+                        cond_insert.append(
+                            {
+                                "vin": v.vin,
+                                "type_of_damage": a.type_of_damage,
+                                "issue_description": a.issue_description,
+                            }
+                        )
                     if a.issue_description in bad_condition_values:
                         add_reason_once(reasons, a.issue_description)
 
@@ -1426,6 +1881,7 @@ async def bulk_save_vehicles(
                 add_reason_once(reasons, "BID_GT_SUGGESTED")
 
             existing_urls = {p.url for p in existing.photos}
+            photos_before = len(photos_insert)
 
             if v.photos:
                 for p in v.photos:
@@ -1441,6 +1897,8 @@ async def bulk_save_vehicles(
                             {"vin": v.vin, "url": p.url, "is_hd": True}
                         )
 
+            photos_changed = len(photos_insert) > photos_before
+
         # ========================================================
         # CREATE
         # ========================================================
@@ -1470,6 +1928,8 @@ async def bulk_save_vehicles(
             data["has_correct_accidents"] = True
             data["has_correct_mileage"] = True
 
+            cond_replace_vins.add(v.vin)
+
             if v.condition_assessments:
                 for a in v.condition_assessments:
                     cond_insert.append(
@@ -1496,7 +1956,14 @@ async def bulk_save_vehicles(
 
         data.update(build_recommendation_fields(reasons))
         data["vin"] = v.vin
-        car_rows.append(build_row(data, existing))
+
+        # photo/assessment rows are keyed by the car id returned from the car upsert
+        if not conditions_changed and not photos_changed and is_unchanged(existing, data):
+            unchanged_count += 1
+        else:
+            if existing:
+                updated_count += 1
+            car_rows.append(build_row(data, existing))
 
         if to_parse:
             celery_payload.append(
@@ -1526,6 +1993,7 @@ async def bulk_save_vehicles(
             "total": 0,
             "new_count": new_count,
             "updated_count": updated_count,
+            "unchanged_count": unchanged_count,
         }
 
     # ============================================================
@@ -1534,30 +2002,33 @@ async def bulk_save_vehicles(
     # ============================================================
     await apply_tx_timeouts(db)
 
-    stmt = insert(CarModel).values(car_rows)
-
-    update_dict = {
-        c.name: getattr(stmt.excluded, c.name)
-        for c in CarModel.__table__.columns
-        if c.name not in (
-            "id",
-            "vin",
-            "created_at",
-            *EXCLUDED_FROM_BULK_UPDATE,
-        )
-    }
+    if use_copy:
+        vin_to_id = await _copy_merge_cars(db, car_rows, car_columns, EXCLUDED_FROM_BULK_UPDATE)
+    else:
+        stmt = insert(CarModel).values(car_rows)
+
+        update_dict = {
+            c.name: getattr(stmt.excluded, c.name)
+            for c in CarModel.__table__.columns
+            if c.name not in (
+                "id",
+                "vin",
+                "created_at",
+                *EXCLUDED_FROM_BULK_UPDATE,
+            )
+        }
 
-    stmt = (
-        stmt.on_conflict_do_update(
-            index_elements=[CarModel.vin],
-            set_=update_dict,
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=[CarModel.vin],
+                set_=update_dict,
+            )
+            .returning(CarModel.id, CarModel.vin)
         )
-        .returning(CarModel.id, CarModel.vin)
-    )
 
-    result = await db.execute(stmt)
-    rows = result.fetchall()
-    vin_to_id: Dict[str, int] = {r.vin: r.id for r in rows}
+        result = await db.execute(stmt)
+        rows = result.fetchall()
+        vin_to_id: Dict[str, int] = {r.vin: r.id for r in rows}
 
     await db.commit()
 
@@ -1566,13 +2037,14 @@ async def bulk_save_vehicles(
     # Separate transaction to avoid long row locks on cars.
     # ============================================================
     car_ids = list(vin_to_id.values())
+    cond_car_ids = [vin_to_id[vin] for vin in cond_replace_vins if vin in vin_to_id]
 
-    if car_ids:
+    if cond_car_ids:
         await apply_tx_timeouts(db)
 
         await db.execute(
             delete(ConditionAssessmentModel).where(
-                ConditionAssessmentModel.car_id.in_(car_ids)
+                ConditionAssessmentModel.car_id.in_(cond_car_ids)
             )
         )
 
@@ -1590,7 +2062,11 @@ async def bulk_save_vehicles(
                     }
                 )
 
-            if cond_rows:
+            if cond_rows and use_copy:
+                await _copy_records(
+                    db, "condition_assessments", ["car_id", "type_of_damage", "issue_description"], cond_rows
+                )
+            elif cond_rows:
                 await db.execute(insert(ConditionAssessmentModel), cond_rows)
 
         await db.commit()
@@ -1623,16 +2099,30 @@ async def bulk_save_vehicles(
                 }
             )
 
-        if photo_rows:
+        if photo_rows and use_copy:
+            await _copy_records(db, "photos", ["car_id", "url", "is_hd"], photo_rows)
+        elif photo_rows:
             await db.execute(insert(PhotoModel), photo_rows)
 
         await db.commit()
 
+    # ============================================================
+    # TRANSACTION #4 — SYNC LIST PROJECTION (car_search)
+    # Runs after conditions are replaced so issue lists are current.
+    # ============================================================
+    if car_ids:
+        await apply_tx_timeouts(db)
+        await refresh_car_search(db, car_ids)
+        await db.commit()
+
+        bump_filter_options_version()
+
     return {
         "celery_tasks": celery_payload,
         "total": len(car_rows),
         "new_count": new_count,
         "updated_count": updated_count,
+        "unchanged_count": unchanged_count,
     }
 
 
@@ -1860,7 +2350,9 @@ async def upsert_vehicle(
 
             await log_car_update(before_snapshot, existing_vehicle)
 
+            await refresh_car_search(db, [existing_vehicle.id])
             await db.commit()
+            bump_filter_options_version()
 
             return True, "success"
 
@@ -1905,7 +2397,10 @@ async def upsert_vehicle(
                 for p in vehicle_data.photos_hd
             ])
 
+        await db.flush()
+        await refresh_car_search(db, [vehicle.id])
         await db.commit()
+        bump_filter_options_version()
 
         return True, "success"
 
@@ -0,0 +1,83 @@
+"""car_search projection
+
+Revision ID: 00ca0a7b36c4
+Revises: 3103b8be0e0d
+Create Date: 2026-10-16 20:55:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00ca0a7b36c4'
+down_revision: Union[str, None] = '3103b8be0e0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('car_search',
+    sa.Column('car_id', sa.Integer(), nullable=False),
+    sa.Column('make', sa.String(), nullable=True),
+    sa.Column('model', sa.String(), nullable=True),
+    sa.Column('body_style', sa.String(), nullable=True),
+    sa.Column('vehicle_type', sa.String(), nullable=True),
+    sa.Column('transmission', sa.String(), nullable=True),
+    sa.Column('drive_type', sa.String(), nullable=True),
+    sa.Column('fuel_type', sa.String(), nullable=True),
+    sa.Column('condition', sa.String(), nullable=True),
+    sa.Column('auction', sa.String(), nullable=True),
+    sa.Column('auction_name', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('issue_descriptions', postgresql.ARRAY(sa.Text()), server_default='{}', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['car_id'], ['cars.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('car_id')
+    )
+    op.create_index(op.f('ix_car_search_make'), 'car_search', ['make'], unique=False)
+    op.create_index(op.f('ix_car_search_model'), 'car_search', ['model'], unique=False)
+    op.create_index(op.f('ix_car_search_location'), 'car_search', ['location'], unique=False)
+    op.create_index(
+        'ix_car_search_issue_descriptions', 'car_search', ['issue_descriptions'],
+        unique=False, postgresql_using='gin',
+    )
+
+    # Backfill from the current sellable set (same predicate as services.car_search._is_listable).
+    op.execute("""
+        INSERT INTO car_search (
+            car_id, make, model, body_style, vehicle_type, transmission, drive_type,
+            fuel_type, condition, auction, auction_name, location, issue_descriptions
+        )
+        SELECT
+            c.id, lower(c.make), lower(c.model), lower(c.body_style), lower(c.vehicle_type),
+            lower(c.transmision), lower(c.drive_type), lower(c.fuel_type), lower(c.condition),
+            lower(c.auction), lower(c.auction_name), lower(c.location),
+            COALESCE(
+                ARRAY(
+                    SELECT DISTINCT ca.issue_description
+                    FROM condition_assessments ca
+                    WHERE ca.car_id = c.id AND ca.issue_description IS NOT NULL
+                    ORDER BY ca.issue_description
+                ),
+                '{}'
+            )
+        FROM cars c
+        WHERE c.relevance = 'ACTIVE'
+          AND c.predicted_total_investments > 0
+          AND c.suggested_bid > 0
+          AND (c.date IS NOT NULL OR c.auction_name = 'Buynow')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_car_search_issue_descriptions', table_name='car_search')
+    op.drop_index(op.f('ix_car_search_location'), table_name='car_search')
+    op.drop_index(op.f('ix_car_search_model'), table_name='car_search')
+    op.drop_index(op.f('ix_car_search_make'), table_name='car_search')
+    op.drop_table('car_search')
@@ -0,0 +1,69 @@
+"""car list indexes
+
+Revision ID: 47e791b33b08
+Revises: 00ca0a7b36c4
+Create Date: 2026-10-16 21:04:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '47e791b33b08'
+down_revision: Union[str, None] = '00ca0a7b36c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every list query filters on relevance = 'ACTIVE', so all indexes are partial on it.
+ACTIVE_ONLY = sa.text("relevance = 'ACTIVE'")
+
+# lower() expression indexes matching func.lower(col).in_(...) in crud.vehicle.get_filtered_vehicles
+LOWER_INDEXES = {
+    'ix_cars_active_lower_make_model': ['lower(make)', 'lower(model)'],
+    'ix_cars_active_lower_model': ['lower(model)'],
+    'ix_cars_active_lower_location': ['lower(location)'],
+    'ix_cars_active_lower_auction': ['lower(auction)'],
+    'ix_cars_active_lower_auction_name': ['lower(auction_name)'],
+    'ix_cars_active_lower_body_style': ['lower(body_style)'],
+}
+
+# One index per ordering_constr.ORDERING_MAP key; the id tie-breaker follows the sort
+# direction as in get_filtered_vehicles_keyset, so both seek and ORDER BY ... LIMIT use them.
+ORDERING_INDEXES = {
+    'ix_cars_active_created_at_asc': ['created_at ASC NULLS LAST', 'id ASC'],
+    'ix_cars_active_created_at_desc': ['created_at DESC NULLS LAST', 'id DESC'],
+    'ix_cars_active_current_bid_asc': ['current_bid ASC NULLS LAST', 'id ASC'],
+    'ix_cars_active_current_bid_desc': ['current_bid DESC NULLS LAST', 'id DESC'],
+    'ix_cars_active_recommendation_status_asc': ['recommendation_status ASC NULLS LAST', 'id ASC'],
+    'ix_cars_active_recommendation_status_desc': ['recommendation_status DESC NULLS LAST', 'id DESC'],
+    'ix_cars_active_auction_date_asc': ['date ASC NULLS LAST', 'id ASC'],
+    'ix_cars_active_auction_date_desc': ['date DESC NULLS LAST', 'id DESC'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; keeps `cars` writable during the build.
+    with op.get_context().autocommit_block():
+        for name, columns in {**LOWER_INDEXES, **ORDERING_INDEXES}.items():
+            op.create_index(
+                name,
+                'cars',
+                [sa.text(c) for c in columns],
+                unique=False,
+                postgresql_where=ACTIVE_ONLY,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    op.execute('ANALYZE cars')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in [*ORDERING_INDEXES, *LOWER_INDEXES]:
+            op.drop_index(name, table_name='cars', postgresql_concurrently=True, if_exists=True)
@@ -15,6 +15,9 @@ from api.v1.routers.vehicle import router as vehicle_router
 from api.v1.routers.fee import router as fee_router
 from core.celery_config import app as celery_app
 from core.setup import create_roles, import_us_zips_from_csv, match_and_update_locations
+from db.session import SessionLocal
+from services.bid_events import bid_event_hub
+from services.zip_index import get_zip_index
 import logging
 
 # from tasks.task import update_car_fees
@@ -57,6 +60,21 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
 #     await match_and_update_locations()
 
 
+@app.on_event("startup")
+async def warm_zip_index():
+    # zip_search radius lookups run against an in-process index; build it before the first request
+    try:
+        async with SessionLocal() as session:
+            await get_zip_index(session)
+    except Exception:
+        logging.getLogger("app").warning("ZIP index warm-up failed; it will load on first zip_search", exc_info=True)
+
+
+@app.on_event("shutdown")
+async def stop_bid_event_hub():
+    await bid_event_hub.close()
+
+
 app.add_middleware(
     CORSMiddleware,
     # allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
@@ -16,6 +16,7 @@ from .vehicle import CarSaleHistoryModel as CarSaleHistoryModel
 from .vehicle import CarStatus as CarStatus
 from .vehicle import ConditionAssessmentModel as ConditionAssessmentModel
 from .vehicle import FeeModel as FeeModel
+from .vehicle import GeocodeCacheModel as GeocodeCacheModel
 from .vehicle import HistoryModel as HistoryModel
 from .vehicle import PartInventoryModel as PartInventoryModel
 from .vehicle import PartModel as PartModel
@@ -24,3 +25,4 @@ from .vehicle import RelevanceStatus as RelevanceStatus
 from .vehicle import USZipModel as USZipModel
 from .filter_kickoff_queue import FilterKickoffQueueModel as FilterKickoffQueueModel
 from .filter_kickoff_queue import FilterKickoffQueueStatus as FilterKickoffQueueStatus
+from .car_search import CarSearchModel as CarSearchModel
@@ -0,0 +1,55 @@
+# app/models/car_search.py
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models import Base
+
+# Postgres stores issues as text[] (GIN-indexable, `&&` overlap); other dialects fall back to JSON.
+IssueList = ARRAY(Text).with_variant(JSON(), "sqlite")
+
+
+class CarSearchModel(Base):
+    """
+    Denormalized projection of sellable cars used by the car list.
+
+    A row exists only while the car passes the base list predicate (ACTIVE relevance,
+    positive predicted_total_investments and suggested_bid, auction date or Buynow).
+    String filter columns are stored lower-cased so they can be matched with plain
+    btree indexes, and condition assessments are folded into `issue_descriptions`.
+
+    Kept in sync by services.car_search.refresh_car_search(_sync).
+    """
+
+    __tablename__ = "car_search"
+    __table_args__ = (
+        Index("ix_car_search_issue_descriptions", "issue_descriptions", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
+    car_id: Mapped[int] = mapped_column(ForeignKey("cars.id", ondelete="CASCADE"), primary_key=True)
+
+    make: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    model: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    body_style: Mapped[str | None] = mapped_column(String, nullable=True)
+    vehicle_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    transmission: Mapped[str | None] = mapped_column(String, nullable=True)
+    drive_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    fuel_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    condition: Mapped[str | None] = mapped_column(String, nullable=True)
+    auction: Mapped[str | None] = mapped_column(String, nullable=True)
+    auction_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    location: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+
+    issue_descriptions: Mapped[list[str]] = mapped_column(IssueList, nullable=False, default=list)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
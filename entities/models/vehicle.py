@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, Float, ForeignKey, Index, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, Float, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
@@ -110,6 +110,27 @@ class CarModel(Base):
     created_at = Column(DateTime, nullable=True, default=func.now())
     condition = Column(String, nullable=True)
 
+    # Partial indexes backing the car list (see migration 47e791b33b08); Postgres only.
+    __table_args__ = tuple(
+        Index(name, *cols, postgresql_where=text("relevance = 'ACTIVE'")).ddl_if(dialect="postgresql")
+        for name, cols in {
+            "ix_cars_active_lower_make_model": (func.lower(make), func.lower(model)),
+            "ix_cars_active_lower_model": (func.lower(model),),
+            "ix_cars_active_lower_location": (func.lower(location),),
+            "ix_cars_active_lower_auction": (func.lower(auction),),
+            "ix_cars_active_lower_auction_name": (func.lower(auction_name),),
+            "ix_cars_active_lower_body_style": (func.lower(body_style),),
+            "ix_cars_active_created_at_asc": (created_at.asc().nulls_last(), id.asc()),
+            "ix_cars_active_created_at_desc": (created_at.desc().nulls_last(), id.desc()),
+            "ix_cars_active_current_bid_asc": (current_bid.asc().nulls_last(), id.asc()),
+            "ix_cars_active_current_bid_desc": (current_bid.desc().nulls_last(), id.desc()),
+            "ix_cars_active_recommendation_status_asc": (recommendation_status.asc().nulls_last(), id.asc()),
+            "ix_cars_active_recommendation_status_desc": (recommendation_status.desc().nulls_last(), id.desc()),
+            "ix_cars_active_auction_date_asc": (date.asc().nulls_last(), id.asc()),
+            "ix_cars_active_auction_date_desc": (date.desc().nulls_last(), id.desc()),
+        }.items()
+    )
+
     inventory = relationship(
         "CarInventoryModel",
         back_populates="car",
@@ -432,3 +453,14 @@ class USZipModel(Base):
         Index("idx_city_state", "city", "state_id"),
         Index("idx_lat_lng", "lat", "lng"),
     )
+
+
+class GeocodeCacheModel(Base):
+    """Memoized geocoder answers for yard locations; lat/lng stay NULL when the geocoder found nothing."""
+
+    __tablename__ = "geocode_cache"
+
+    query = Column(String, primary_key=True)
+    lat = Column(Float, nullable=True)
+    lng = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
@@ -12,3 +12,16 @@ ORDERING_MAP = {
     "auction_date_asc": nulls_last(asc(CarModel.date)),
     "auction_date_desc": nulls_last(desc(CarModel.date)),
 }
+
+# Column + direction behind each ORDERING_MAP key; used by keyset (cursor) pagination,
+# which needs the raw sort column to build the seek predicate.
+ORDERING_KEYS = {
+    "created_at_asc": (CarModel.created_at, "asc"),
+    "created_at_desc": (CarModel.created_at, "desc"),
+    "current_bid_asc": (CarModel.current_bid, "asc"),
+    "current_bid_desc": (CarModel.current_bid, "desc"),
+    "recommendation_status_asc": (CarModel.recommendation_status, "asc"),
+    "recommendation_status_desc": (CarModel.recommendation_status, "desc"),
+    "auction_date_asc": (CarModel.date, "asc"),
+    "auction_date_desc": (CarModel.date, "desc"),
+}
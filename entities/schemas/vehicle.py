@@ -57,6 +57,8 @@ class CarListResponseSchema(BaseModel):
     page_links: dict
     last: bool
     bid_info: dict | None = {}
+    next_cursor: str | None = None
+    facets: Dict[str, Dict[str, int]] | None = None
 
 
 class ConditionAssessmentResponseSchema(BaseModel):
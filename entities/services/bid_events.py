@@ -0,0 +1,110 @@
+# app/services/bid_events.py
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from services.lock import REDIS_DB, REDIS_HOST, REDIS_PORT, redis_client
+
+logger = logging.getLogger(__name__)
+
+BID_EVENTS_CHANNEL = "bids:changes"
+# Per-connection buffer (in messages, one message = one published chunk); a client that
+# falls further behind loses messages instead of growing server memory.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def publish_bid_changes(events: List[Dict[str, Any]]) -> None:
+    """
+    Publish per-car bid/recommendation changes (sync; used from Celery tasks).
+
+    Each event is a JSON-able dict with at least `car_id`. Publishing is best effort.
+    """
+    if not events:
+        return
+    try:
+        redis_client.publish(BID_EVENTS_CHANNEL, json.dumps(events, default=str))
+    except redis.RedisError as e:
+        logger.warning("bid change publish failed: %s", e)
+
+
+@dataclass(eq=False)
+class BidSubscriber:
+    # None = all cars
+    car_ids: Optional[Set[int]]
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+    dropped: int = 0
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        return self.car_ids is None or event.get("car_id") in self.car_ids
+
+
+class BidEventHub:
+    """
+    One Redis subscription per process, fanned out to in-process subscriber queues.
+
+    SSE connections register a BidSubscriber with their car-id filter; the listener task is
+    started by the first subscriber, reconnects on Redis errors and runs until `close`.
+    """
+
+    def __init__(self, channel: str = BID_EVENTS_CHANNEL):
+        self.channel = channel
+        self._subscribers: Set[BidSubscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, car_ids: Optional[Iterable[int]] = None) -> BidSubscriber:
+        sub = BidSubscriber(car_ids=set(car_ids) if car_ids is not None else None)
+        self._subscribers.add(sub)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return sub
+
+    def unsubscribe(self, sub: BidSubscriber) -> None:
+        self._subscribers.discard(sub)
+
+    def dispatch(self, events: List[Dict[str, Any]]) -> None:
+        for sub in list(self._subscribers):
+            matched = [e for e in events if sub.wants(e)]
+            if not matched:
+                continue
+            try:
+                sub.queue.put_nowait(matched)
+            except asyncio.QueueFull:
+                sub.dropped += 1
+
+    async def _listen(self) -> None:
+        while True:
+            client = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            self.dispatch(json.loads(message["data"]))
+                        except (TypeError, ValueError):
+                            logger.warning("bad bid change message: %r", message.get("data"))
+            except redis.RedisError as e:
+                logger.warning("bid change subscription lost: %s; reconnecting", e)
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+    async def close(self) -> None:
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+
+bid_event_hub = BidEventHub()
@@ -0,0 +1,129 @@
+# app/services/bulk_codec.py
+
+import gzip
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Type, get_args
+
+import orjson
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from schemas.vehicle import (
+    CarBulkCreateSchema,
+    CarCreateSchema,
+    ConditionAssessmentResponseSchema,
+    PhotoSchema,
+    SalesHistoryBaseSchema,
+)
+
+# Content-Encoding values accepted on the bulk endpoints; advertised back on 415 so the
+# sender can fall back to an encoding this instance understands.
+SUPPORTED_ENCODINGS = ("identity", "gzip")
+# Set by the parsers service: the payload was produced by our own converter, skip pydantic.
+TRUSTED_PAYLOAD_HEADER = "X-Trusted-Payload"
+
+_NESTED_MODELS: Dict[str, Type[BaseModel]] = {
+    "photos": PhotoSchema,
+    "photos_hd": PhotoSchema,
+    "condition_assessments": ConditionAssessmentResponseSchema,
+    "sales_history": SalesHistoryBaseSchema,
+}
+
+
+async def read_bulk_body(request: Request) -> Any:
+    """Decode a (possibly gzip-compressed) JSON request body with orjson."""
+    encoding = request.headers.get("content-encoding", "identity").strip().lower() or "identity"
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported Content-Encoding: {encoding}",
+            headers={"Accept-Encoding": ", ".join(SUPPORTED_ENCODINGS)},
+        )
+
+    body = await request.body()
+    if encoding == "gzip":
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError, zlib.error):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid gzip body")
+
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+
+
+def is_trusted_payload(request: Request) -> bool:
+    return request.headers.get(TRUSTED_PAYLOAD_HEADER, "").lower() in ("1", "true")
+
+
+@lru_cache(maxsize=None)
+def _scalar_fields(model: Type[BaseModel]) -> Dict[str, type]:
+    """Field name -> scalar type for fields annotated `T` or `T | None`."""
+    fields = {}
+    for name, field in model.model_fields.items():
+        args = [arg for arg in get_args(field.annotation) if arg is not type(None)] or [field.annotation]
+        if len(args) == 1 and args[0] in (bool, int, float, str, datetime):
+            fields[name] = args[0]
+    return fields
+
+
+def _exact_value(expected: type, value: Any) -> Any:
+    """`value` as `expected` without coercion (ISO strings for datetimes aside); TypeError otherwise."""
+    if value is None:
+        return None
+    if expected is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, expected) and (expected is bool or not isinstance(value, bool)):
+        return value
+    raise TypeError(f"expected {expected.__name__}, got {type(value).__name__}")
+
+
+def _construct(model: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    if not isinstance(data, dict):
+        raise TypeError(f"expected an object, got {type(data).__name__}")
+    scalars = _scalar_fields(model)
+    # Missing required fields become None instead of unset attributes.
+    values = {
+        name: data.get(name) for name, field in model.model_fields.items() if name in data or field.is_required()
+    }
+    for name, value in values.items():
+        if name in scalars:
+            values[name] = _exact_value(scalars[name], value)
+    return model.model_construct(**values)
+
+
+def _construct_vehicle(item: Dict[str, Any]) -> CarCreateSchema:
+    try:
+        values = dict(item)
+        for key, model in _NESTED_MODELS.items():
+            if key in values:
+                values[key] = [_construct(model, nested) for nested in values[key] or []]
+        return _construct(CarCreateSchema, values)
+    except (TypeError, ValueError):
+        # not exactly typed (e.g. "4" for an int column): let pydantic coerce it or reject it
+        return CarCreateSchema.model_validate(item)
+
+
+def parse_bulk_payload(body: Any, trusted: bool = False) -> CarBulkCreateSchema:
+    """
+    Turn a decoded /vehicles/bulk body into CarBulkCreateSchema.
+
+    Trusted callers get the fast path: models are built with `model_construct` (only ISO dates
+    are parsed) as long as every scalar already has its field's type; a vehicle with any other
+    value goes through pydantic. Everyone else gets full validation.
+    """
+    try:
+        if trusted and isinstance(body, dict) and isinstance(body.get("vehicles"), list):
+            return CarBulkCreateSchema.model_construct(
+                ivent=body.get("ivent"),
+                vehicles=[_construct_vehicle(v) for v in body["vehicles"] if isinstance(v, dict)],
+            )
+        return CarBulkCreateSchema.model_validate(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
@@ -0,0 +1,117 @@
+# app/services/car_search.py
+
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models.car_search import CarSearchModel
+from models.vehicle import CarModel, ConditionAssessmentModel, RelevanceStatus
+
+# Filter column on cars -> lower-cased column on car_search.
+SEARCH_STRING_COLUMNS = {
+    "make": "make",
+    "model": "model",
+    "body_style": "body_style",
+    "vehicle_type": "vehicle_type",
+    "transmision": "transmission",
+    "drive_type": "drive_type",
+    "fuel_type": "fuel_type",
+    "condition": "condition",
+    "auction": "auction",
+    "auction_name": "auction_name",
+    "location": "location",
+}
+
+REFRESH_CHUNK = 1000
+
+
+def _chunks(ids: List[int], size: int = REFRESH_CHUNK):
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def _is_listable(row) -> bool:
+    """Same base predicate as crud.vehicle.get_filtered_vehicles, minus the filter-dependent parts."""
+    return (
+        row.relevance == RelevanceStatus.ACTIVE
+        and (row.predicted_total_investments or 0) > 0
+        and (row.suggested_bid or 0) > 0
+        and (row.date is not None or row.auction_name == "Buynow")
+    )
+
+
+def _cars_stmt(car_ids: List[int]):
+    return select(
+        CarModel.id,
+        CarModel.relevance,
+        CarModel.predicted_total_investments,
+        CarModel.suggested_bid,
+        CarModel.date,
+        *[getattr(CarModel, col) for col in SEARCH_STRING_COLUMNS],
+    ).where(CarModel.id.in_(car_ids))
+
+
+def _issues_stmt(car_ids: List[int]):
+    return select(ConditionAssessmentModel.car_id, ConditionAssessmentModel.issue_description).where(
+        ConditionAssessmentModel.car_id.in_(car_ids),
+        ConditionAssessmentModel.issue_description.isnot(None),
+    )
+
+
+def _build_rows(car_rows: Iterable[Any], issue_rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    issues: Dict[int, List[str]] = {}
+    for car_id, description in issue_rows:
+        issues.setdefault(car_id, []).append(description)
+
+    rows = []
+    for car in car_rows:
+        if not _is_listable(car):
+            continue
+        row = {"car_id": car.id, "issue_descriptions": sorted(set(issues.get(car.id, [])))}
+        for src, dst in SEARCH_STRING_COLUMNS.items():
+            value = getattr(car, src)
+            row[dst] = value.lower() if isinstance(value, str) else value
+        rows.append(row)
+    return rows
+
+
+async def refresh_car_search(db: AsyncSession, car_ids: Iterable[int]) -> int:
+    """
+    Re-project the given cars into `car_search` (async session).
+
+    Cars that are no longer listable (or were deleted) lose their row. Does not commit;
+    callers run it inside their own short transaction.
+
+    Returns:
+        int: number of rows written.
+    """
+    ids = sorted({int(i) for i in car_ids if i is not None})
+    written = 0
+    for chunk in _chunks(ids):
+        car_rows = (await db.execute(_cars_stmt(chunk))).all()
+        issue_rows = (await db.execute(_issues_stmt(chunk))).all()
+        rows = _build_rows(car_rows, issue_rows)
+
+        await db.execute(delete(CarSearchModel).where(CarSearchModel.car_id.in_(chunk)))
+        if rows:
+            await db.execute(insert(CarSearchModel), rows)
+        written += len(rows)
+    return written
+
+
+def refresh_car_search_sync(db: Session, car_ids: Iterable[int]) -> int:
+    """Sync twin of `refresh_car_search` for Celery tasks (psycopg2 SessionLocal)."""
+    ids = sorted({int(i) for i in car_ids if i is not None})
+    written = 0
+    for chunk in _chunks(ids):
+        car_rows = db.execute(_cars_stmt(chunk)).all()
+        issue_rows = db.execute(_issues_stmt(chunk)).all()
+        rows = _build_rows(car_rows, issue_rows)
+
+        db.execute(delete(CarSearchModel).where(CarSearchModel.car_id.in_(chunk)))
+        if rows:
+            db.execute(insert(CarSearchModel), rows)
+        written += len(rows)
+    return written
@@ -0,0 +1,66 @@
+# app/services/fee_engine.py
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class _FeeTypeArrays:
+    """Ranges of one fee type of one auction, sorted by price_from."""
+
+    def __init__(self, rows: List[tuple]):
+        rows = sorted(rows, key=lambda r: r[0])
+        self.starts = np.array([r[0] for r in rows], dtype=float)
+        self.ends = np.array([r[1] for r in rows], dtype=float)
+        self.amounts = np.array([r[2] for r in rows], dtype=float)
+        self.percent = np.array([bool(r[3]) for r in rows], dtype=bool)
+        # searchsorted picks one range per price, which is only exact when ranges do not overlap
+        self.disjoint = bool(np.all(self.starts[1:] > self.ends[:-1]))
+
+    def _charge(self, prices: np.ndarray, amounts: np.ndarray, percent: np.ndarray) -> np.ndarray:
+        return np.where(percent, amounts / 100.0 * prices, amounts)
+
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        if self.disjoint:
+            idx = np.searchsorted(self.starts, prices, side="right") - 1
+            safe = np.clip(idx, 0, None)
+            hit = (idx >= 0) & (prices <= self.ends[safe])
+            return np.where(hit, self._charge(prices, self.amounts[safe], self.percent[safe]), 0.0)
+
+        total = np.zeros_like(prices)
+        for start, end, amount, percent in zip(self.starts, self.ends, self.amounts, self.percent):
+            hit = (prices >= start) & (prices <= end)
+            total += np.where(hit, amount / 100.0 * prices if percent else amount, 0.0)
+        return total
+
+
+class FeeEngine:
+    """
+    Vectorized twin of tasks.task._load_fees + _apply_fees: the sum of every fee row of the car's
+    auction whose [price_from, price_to] contains the price. Auctions match exactly, as in SQL.
+    """
+
+    def __init__(self, fees: Iterable):
+        grouped: Dict[Optional[str], Dict[str, List[tuple]]] = {}
+        for fee in fees:
+            if fee.price_from is None or fee.price_to is None:
+                continue
+            grouped.setdefault(fee.auction, {}).setdefault(fee.fee_type, []).append(
+                (fee.price_from, fee.price_to, fee.amount, fee.percent)
+            )
+        self.auctions = {
+            auction: [_FeeTypeArrays(rows) for rows in by_type.values()] for auction, by_type in grouped.items()
+        }
+
+    def compute(self, auctions: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Fees for parallel arrays of auction names and prices (predicted_total_investments)."""
+        prices = np.asarray(prices, dtype=float)
+        auctions = np.asarray(auctions, dtype=object)
+        fees = np.zeros_like(prices)
+        for auction, fee_types in self.auctions.items():
+            idx = np.flatnonzero(auctions == auction)
+            if not idx.size:
+                continue
+            for arrays in fee_types:
+                fees[idx] += arrays.compute(prices[idx])
+        return fees
@@ -0,0 +1,50 @@
+# app/services/filter_options_cache.py
+
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+
+from services.lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+FILTER_OPTIONS_VERSION_KEY = "filter_options:version"
+FILTER_OPTIONS_KEY_PREFIX = "filter_options:v"
+# Safety net only: writers bump the version, so entries normally die by becoming unreachable.
+FILTER_OPTIONS_TTL_SECS = 60 * 30
+
+
+def get_cached_filter_options() -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """
+    Return (version, options) for the current cache version.
+
+    options is None on a miss; version is None when Redis is unavailable (then nothing is stored).
+    The version must be passed back to `store_filter_options` so a bump that lands while the
+    options are being computed is not masked by a stale write.
+    """
+    try:
+        version = int(redis_client.get(FILTER_OPTIONS_VERSION_KEY) or 0)
+        raw = redis_client.get(f"{FILTER_OPTIONS_KEY_PREFIX}{version}")
+    except redis.RedisError as e:
+        logger.warning("filter options cache read failed: %s", e)
+        return None, None
+    return version, (json.loads(raw) if raw else None)
+
+
+def store_filter_options(version: Optional[int], options: Dict[str, Any]) -> None:
+    if version is None:
+        return
+    try:
+        redis_client.set(f"{FILTER_OPTIONS_KEY_PREFIX}{version}", json.dumps(options), ex=FILTER_OPTIONS_TTL_SECS)
+    except redis.RedisError as e:
+        logger.warning("filter options cache write failed: %s", e)
+
+
+def bump_filter_options_version() -> None:
+    """Invalidate cached filter options; call after writes that change the set of active cars."""
+    try:
+        redis_client.incr(FILTER_OPTIONS_VERSION_KEY)
+    except redis.RedisError as e:
+        logger.warning("filter options cache bump failed: %s", e)
@@ -49,3 +49,26 @@ def is_kickoff_busy() -> bool:
         return redis_client.exists(KICKOFF_LOCK_KEY) == 1
     except redis.RedisError:
         return False
+
+
+BID_REFRESH_LOCK_KEY = "bids:refresh:lock"
+# Slightly longer than the parser call timeout so a crashed run never blocks refreshes for long.
+BID_REFRESH_LOCK_TTL_SECS = 90
+
+
+def acquire_bid_refresh_lock(token: str, ttl: Optional[int] = None, scope: str = "all") -> bool:
+    """One lock per refresh scope (time-to-auction tier), so tiers never block each other."""
+    if ttl is None:
+        ttl = BID_REFRESH_LOCK_TTL_SECS
+    try:
+        return redis_client.set(f"{BID_REFRESH_LOCK_KEY}:{scope}", token, nx=True, ex=ttl) is True
+    except redis.RedisError:
+        # no Redis, no coordination: better a possible overlap than no bid refresh at all
+        return True
+
+def release_bid_refresh_lock(token: str, scope: str = "all") -> bool:
+    try:
+        res = _compare_and_del(keys=[f"{BID_REFRESH_LOCK_KEY}:{scope}"], args=[token])
+        return bool(res)
+    except redis.RedisError:
+        return False
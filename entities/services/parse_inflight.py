@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, Iterable, List
+
+import redis
+
+from services.lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+PARSE_INFLIGHT_KEY = "parse:inflight"
+# Hash of "<source>:claimed" / "<source>:suppressed" counters since the key was created.
+PARSE_INFLIGHT_STATS_KEY = "parse:inflight-stats"
+PARSE_TASK_NAME = "tasks.task.parse_and_update_car"
+PARSE_QUEUE = "car_parsing_queue"
+# Upper bound for a VIN to sit in car_parsing_queue plus its retries; a crashed worker never pins a VIN for longer.
+PARSE_INFLIGHT_TTL_SECS = int(os.getenv("PARSE_INFLIGHT_TTL_SECS", str(60 * 60 * 4)))
+
+
+def _key(vin: str) -> str:
+    return f"{PARSE_INFLIGHT_KEY}:{vin}"
+
+
+def claim_vins(vins: Iterable[str], source: str = "other", ttl: int | None = None) -> List[str]:
+    """
+    Mark VINs as queued for parse_and_update_car and return only those that were not already
+    queued or in flight. One pipelined round trip for the whole batch; `source` labels the
+    enqueue path in the suppression stats.
+    """
+    vins = list(dict.fromkeys(vins))
+    if not vins:
+        return []
+    if ttl is None:
+        ttl = PARSE_INFLIGHT_TTL_SECS
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for vin in vins:
+            pipe.set(_key(vin), "1", nx=True, ex=ttl)
+        claimed = [vin for vin, ok in zip(vins, pipe.execute()) if ok]
+    except redis.RedisError:
+        # no Redis, no dedup: better a duplicate parse than a car that is never parsed
+        return vins
+
+    suppressed = len(vins) - len(claimed)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hincrby(PARSE_INFLIGHT_STATS_KEY, f"{source}:claimed", len(claimed))
+        pipe.hincrby(PARSE_INFLIGHT_STATS_KEY, f"{source}:suppressed", suppressed)
+        pipe.execute()
+    except redis.RedisError:
+        pass
+    if suppressed:
+        logger.info("parse in-flight: %s duplicate VIN(s) suppressed from %s", suppressed, source)
+    return claimed
+
+
+def release_vins(vins: Iterable[str]) -> None:
+    keys = [_key(vin) for vin in vins]
+    if not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+    except redis.RedisError:
+        pass
+
+
+def send_parse_tasks(celery_app, payloads: List[Dict[str, Any]], source: str) -> List[Dict[str, Any]]:
+    """
+    Enqueue parse_and_update_car for each payload whose VIN is not queued or in flight yet.
+    Returns the payloads that were actually sent.
+    """
+    by_vin = {p["vin"]: p for p in payloads}
+    claimed = claim_vins(by_vin, source=source)
+    sent = []
+    try:
+        for vin in claimed:
+            celery_app.send_task(PARSE_TASK_NAME, kwargs=by_vin[vin], queue=PARSE_QUEUE)
+            sent.append(by_vin[vin])
+    finally:
+        # a VIN that never reached the broker must not stay blocked until the TTL
+        release_vins(vin for vin in claimed[len(sent):])
+    return sent
+
+
+def get_inflight_stats() -> Dict[str, Dict[str, int]]:
+    """{source: {"claimed": n, "suppressed": m}} plus the number of VINs currently queued or in flight."""
+    stats: Dict[str, Dict[str, int]] = {}
+    try:
+        raw = redis_client.hgetall(PARSE_INFLIGHT_STATS_KEY)
+        in_flight = sum(1 for _ in redis_client.scan_iter(match=f"{PARSE_INFLIGHT_KEY}:*", count=1000))
+    except redis.RedisError as e:
+        logger.warning("parse in-flight stats read failed: %s", e)
+        return {}
+    for field, value in raw.items():
+        source, _, metric = field.rpartition(":")
+        stats.setdefault(source, {"claimed": 0, "suppressed": 0})[metric] = int(value)
+    stats["total"] = {
+        "claimed": sum(v["claimed"] for v in stats.values()),
+        "suppressed": sum(v["suppressed"] for v in stats.values()),
+        "in_flight": in_flight,
+    }
+    return stats
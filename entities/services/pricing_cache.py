@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.admin import ROIModel
+from models.vehicle import FeeModel
+from services.lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+PRICING_VERSION_KEY = "pricing:version"
+PRICING_CHANNEL = "pricing:invalidate"
+# Safety net for a missed pub/sub message (Redis restart, listener reconnecting).
+PRICING_CACHE_MAX_AGE_SECS = int(os.getenv("PRICING_CACHE_MAX_AGE_SECS", "300"))
+
+
+@dataclass(frozen=True)
+class ROISnapshot:
+    roi: float
+    profit_margin: float
+
+
+@dataclass(frozen=True)
+class FeeRow:
+    fee_type: str
+    amount: float
+    percent: bool
+    price_from: float
+    price_to: float
+
+
+class FeeSchedule:
+    """
+    Fee rows of one auction sorted by price_from.
+
+    `max_to[i]` is the largest price_to among rows[0..i], so a lookup walks back from the
+    bisect position only while an earlier row can still cover the price.
+    """
+
+    def __init__(self, rows: List[FeeRow]):
+        self.rows = sorted(rows, key=lambda r: r.price_from)
+        self.starts = [r.price_from for r in self.rows]
+        self.max_to: List[float] = []
+        running = float("-inf")
+        for r in self.rows:
+            running = max(running, r.price_to)
+            self.max_to.append(running)
+
+    def lookup(self, price: float) -> List[FeeRow]:
+        """Rows with price_from <= price <= price_to, in price_from order."""
+        matched = []
+        i = bisect.bisect_right(self.starts, price) - 1
+        while i >= 0 and self.max_to[i] >= price:
+            if self.rows[i].price_to >= price:
+                matched.append(self.rows[i])
+            i -= 1
+        matched.reverse()
+        return matched
+
+
+class PricingCache:
+    """Per-process snapshot of the latest ROI and all fee schedules, dropped when a writer bumps the version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._roi: Optional[ROISnapshot] = None
+        self._fees: Dict[Optional[str], FeeSchedule] = {}
+        self._listener_pid: Optional[int] = None
+
+    def invalidate(self, version: Optional[int] = None) -> None:
+        with self._lock:
+            if version is None or self._version is None or version > self._version:
+                self._loaded_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return bool(self._loaded_at) and time.monotonic() - self._loaded_at < PRICING_CACHE_MAX_AGE_SECS
+
+    def _ensure_loaded(self, db: Session) -> None:
+        self._ensure_listener()
+        if self._is_fresh():
+            return
+        with self._lock:
+            if self._is_fresh():
+                return
+            # read the version first: a bump during the load leaves us older than the message and reloads
+            version = _current_version()
+            roi = db.execute(select(ROIModel).order_by(ROIModel.created_at.desc()).limit(1)).scalars().first()
+            by_auction: Dict[Optional[str], List[FeeRow]] = {}
+            for fee in db.execute(select(FeeModel)).scalars():
+                if fee.price_from is None or fee.price_to is None:
+                    continue  # never matched by the range query either
+                by_auction.setdefault(fee.auction, []).append(
+                    FeeRow(fee.fee_type, float(fee.amount), bool(fee.percent), fee.price_from, fee.price_to)
+                )
+            self._roi = ROISnapshot(roi.roi, roi.profit_margin) if roi else None
+            self._fees = {auction: FeeSchedule(rows) for auction, rows in by_auction.items()}
+            self._version = version
+            self._loaded_at = time.monotonic()
+            logger.info("pricing cache loaded: version=%s auctions=%s", version, len(self._fees))
+
+    def roi(self, db: Session) -> Optional[ROISnapshot]:
+        self._ensure_loaded(db)
+        return self._roi
+
+    def fees(self, db: Session, auction: Optional[str], investment: float) -> List[FeeRow]:
+        self._ensure_loaded(db)
+        schedule = self._fees.get(auction)
+        return schedule.lookup(investment) if schedule else []
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        # set before subscribing: a failing Redis falls back to max-age instead of retrying per call
+        self._listener_pid = pid
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{PRICING_CHANNEL: self._on_message})
+            pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except redis.RedisError as e:
+            logger.warning("pricing cache listener unavailable, relying on max age: %s", e)
+
+    def _on_message(self, message) -> None:
+        try:
+            self.invalidate(int(message["data"]))
+        except (TypeError, ValueError):
+            self.invalidate()
+
+
+def _current_version() -> Optional[int]:
+    try:
+        return int(redis_client.get(PRICING_VERSION_KEY) or 0)
+    except redis.RedisError:
+        return None
+
+
+def bump_pricing_version() -> None:
+    """Call after committing changes to ROI or fee tables; every process drops its pricing cache."""
+    try:
+        version = redis_client.incr(PRICING_VERSION_KEY)
+        redis_client.publish(PRICING_CHANNEL, version)
+    except redis.RedisError as e:
+        logger.warning("pricing cache bump failed: %s", e)
+
+
+pricing_cache = PricingCache()
@@ -1,5 +1,5 @@
 from logging import getLogger
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import httpx
 from fastapi import HTTPException
@@ -92,10 +92,8 @@ async def scrape_and_save_vehicle(vin: str, db: AsyncSession, settings: Settings
     return CarBaseSchema.model_validate(vehicle_data)
 
 
-async def prepare_response(
-    vehicles: List[CarModel], total_pages: int, page: int, base_url: str, bid_info: dict
-) -> CarListResponseSchema:
-    """Prepare the response with validated cars and pagination links."""
+def _validate_cars(vehicles: List[CarModel]) -> List[CarBaseSchema]:
+    """Convert CarModel rows (with the computed `liked` flag) into response schemas."""
     validated_cars = []
     for car in vehicles:
         try:
@@ -106,6 +104,14 @@ async def prepare_response(
         except Exception as e:
             logger.error(f"Failed to validate car VIN {car.vin}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Validation error for car VIN {car.vin}: {str(e)}")
+    return validated_cars
+
+
+async def prepare_response(
+    vehicles: List[CarModel], total_pages: int, page: int, base_url: str, bid_info: dict
+) -> CarListResponseSchema:
+    """Prepare the response with validated cars and pagination links."""
+    validated_cars = _validate_cars(vehicles)
 
     page_links = {i: f"{base_url}&page={i}" for i in range(1, total_pages + 1) if i != page}
     return CarListResponseSchema(
@@ -113,6 +119,16 @@ async def prepare_response(
     )
 
 
+async def prepare_cursor_response(
+    vehicles: List[CarModel], next_cursor: Optional[str], bid_info: dict
+) -> CarListResponseSchema:
+    """Prepare the response for keyset pagination: no page links, just the cursor of the next page."""
+    return CarListResponseSchema(
+        cars=_validate_cars(vehicles), page_links={}, last=next_cursor is None, bid_info=bid_info,
+        next_cursor=next_cursor,
+    )
+
+
 async def prepare_car_detail_response(car: CarModel) -> CarDetailResponseSchema:
     """Prepare the detailed response for a car."""
     return CarDetailResponseSchema(
@@ -0,0 +1,106 @@
+# app/services/zip_index.py
+
+import asyncio
+import logging
+import time
+from math import asin, cos, floor, radians, sin, sqrt
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.vehicle import USZipModel
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_MI = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+# Grid cell size in degrees; a 1° cell is ~69 mi tall, so typical radius searches touch a few cells.
+CELL_DEG = 1.0
+# Other workers/processes are not notified by `invalidate_zip_index`, so reload periodically too.
+ZIP_INDEX_MAX_AGE_SECS = 60 * 60
+
+
+def _haversine_mi(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MI * asin(min(1.0, sqrt(a)))
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return floor(lat / CELL_DEG), floor(lng / CELL_DEG)
+
+
+class ZipGeoIndex:
+    """
+    In-memory grid index over `us_zips`.
+
+    Keeps every ZIP's coordinates (for resolving the search centre) and buckets only the ZIPs
+    that carry a Copart/IAAI yard name into lat/lng cells, so a radius lookup checks a handful
+    of yards instead of running acos over the whole table.
+    """
+
+    def __init__(self, rows: List[Tuple[str, float, float, Optional[str], Optional[str]]]):
+        self.coords: Dict[str, Tuple[float, float]] = {}
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, Tuple[str, ...]]]] = {}
+        for zip_code, lat, lng, copart_name, iaai_name in rows:
+            if lat is None or lng is None:
+                continue
+            lat, lng = float(lat), float(lng)
+            self.coords[zip_code] = (lat, lng)
+            names = tuple(n.lower() for n in (copart_name, iaai_name) if n)
+            if names:
+                self.cells.setdefault(_cell(lat, lng), []).append((lat, lng, names))
+        self.loaded_at = time.monotonic()
+
+    def lookup(self, zip_code: str) -> Optional[Tuple[float, float]]:
+        return self.coords.get(zip_code)
+
+    def names_within(self, lat: float, lng: float, radius_mi: float) -> Set[str]:
+        """Lower-cased yard names (copart_name / iaai_name) within `radius_mi` of the point."""
+        dlat = radius_mi / MILES_PER_DEGREE_LAT
+        # longitude degrees shrink towards the poles; clamp to avoid blowing up near them
+        dlng = radius_mi / (MILES_PER_DEGREE_LAT * max(cos(radians(lat)), 0.01))
+        min_cell, max_cell = _cell(lat - dlat, lng - dlng), _cell(lat + dlat, lng + dlng)
+
+        found: Set[str] = set()
+        for ci in range(min_cell[0], max_cell[0] + 1):
+            for cj in range(min_cell[1], max_cell[1] + 1):
+                for zlat, zlng, names in self.cells.get((ci, cj), ()):
+                    if _haversine_mi(lat, lng, zlat, zlng) <= radius_mi:
+                        found.update(names)
+        return found
+
+
+_zip_index: Optional[ZipGeoIndex] = None
+_zip_index_lock = asyncio.Lock()
+
+
+async def load_zip_index(db: AsyncSession) -> ZipGeoIndex:
+    rows = (
+        await db.execute(
+            select(USZipModel.zip, USZipModel.lat, USZipModel.lng, USZipModel.copart_name, USZipModel.iaai_name)
+        )
+    ).all()
+    index = ZipGeoIndex([tuple(r) for r in rows])
+    logger.info("ZIP index loaded: %d zips, %d yard cells", len(index.coords), len(index.cells))
+    return index
+
+
+async def get_zip_index(db: AsyncSession) -> ZipGeoIndex:
+    """Return the process-wide index, (re)loading it on first use, after invalidation or when stale."""
+    global _zip_index
+    index = _zip_index
+    if index is not None and time.monotonic() - index.loaded_at < ZIP_INDEX_MAX_AGE_SECS:
+        return index
+    async with _zip_index_lock:
+        index = _zip_index
+        if index is None or time.monotonic() - index.loaded_at >= ZIP_INDEX_MAX_AGE_SECS:
+            index = _zip_index = await load_zip_index(db)
+    return index
+
+
+def invalidate_zip_index() -> None:
+    """Drop the cached index; the next zip_search reloads it from `us_zips`."""
+    global _zip_index
+    _zip_index = None
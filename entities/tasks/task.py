@@ -9,21 +9,41 @@ import time
 from datetime import datetime, timezone, timedelta
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import re
 from datetime import datetime
 from io import BytesIO
 from typing import Any, Dict, Optional
 
+from celery import group
 from celery.exceptions import MaxRetriesExceededError
+from celery.signals import task_postrun
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 import anyio
 import httpx
+import numpy as np
 import redis
-from sqlalchemy import and_, create_engine, delete, func, or_, select, text
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    create_engine,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    update,
+    values,
+)
 from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.orm import Session, selectinload, sessionmaker
+from sqlalchemy.orm import Session, aliased, selectinload, sessionmaker
 import requests
 
 from core.celery_config import app
@@ -50,9 +70,17 @@ from models.filter_kickoff_queue import (
     FILTER_QUEUE_DISPATCH_LOCK_KEY
 )
 from models.user import user_likes
+from services.bid_events import publish_bid_changes
+from services.car_search import refresh_car_search_sync
 from services.email_sync import send_email_sync
+from services.fee_engine import FeeEngine
+from services.filter_options_cache import bump_filter_options_version
+from services.parse_inflight import claim_vins, release_vins
+from services.pricing_cache import FeeRow, ROISnapshot, bump_pricing_version, pricing_cache
 from services.lock import (
+    acquire_bid_refresh_lock,
     acquire_kickoff_lock,
+    release_bid_refresh_lock,
     release_kickoff_lock,
     is_kickoff_busy,
     generate_lock_token,
@@ -232,21 +260,16 @@ def run_async(func: Callable[..., Any], *args, **kwargs) -> Union[Any, asyncio.T
 # =========================
 # Core helpers (pure sync)
 # =========================
-def _load_default_roi(db: Session) -> Optional[ROIModel]:
-    return db.execute(select(ROIModel).order_by(ROIModel.created_at.desc()).limit(1)).scalars().first()
+def _load_default_roi(db: Session) -> Optional[ROISnapshot]:
+    # served from the per-process pricing cache; `db` is only used on a cache miss
+    return pricing_cache.roi(db)
 
 
-def _load_fees(db: Session, auction: Optional[str], investment: float) -> List[FeeModel]:
-    return db.execute(
-        select(FeeModel).where(
-            FeeModel.auction == auction,
-            FeeModel.price_from <= investment,
-            FeeModel.price_to >= investment,
-        )
-    ).scalars().all()
+def _load_fees(db: Session, auction: Optional[str], investment: float) -> List[FeeRow]:
+    return pricing_cache.fees(db, auction, investment)
 
 
-def _apply_fees(investment: float, fees: List[FeeModel]) -> float:
+def _apply_fees(investment: float, fees: List[FeeRow]) -> float:
     fee_total = 0.0
     for fee in fees:
         if fee.percent:
@@ -720,6 +743,8 @@ def parse_and_update_car(
             car.attempts = (car.attempts or 0) + 1
 
             db.add(car)
+            db.flush()
+            refresh_car_search_sync(db, [car.id])
             db.commit()
 
             logger.info(
@@ -750,6 +775,16 @@ def parse_and_update_car(
             raise
 
 
+@task_postrun.connect(sender=parse_and_update_car)
+def _release_parse_inflight(task_id=None, task=None, args=None, kwargs=None, state=None, **_):
+    """Free the VIN's in-flight slot once the task is done for good (not when it is only retrying)."""
+    if state == "RETRY":
+        return
+    vin = (kwargs or {}).get("vin") or (args[0] if args else None)
+    if vin:
+        release_vins([vin])
+
+
 def _norm_site(val) -> str:
     s = str(val or "").strip().lower()
     if s in {"1", "copart", "copart.com"}:
@@ -758,18 +793,221 @@ def _norm_site(val) -> str:
         return "iaai"
     return s
 
+BID_UPDATE_CHUNK = 5000
+BID_EVENTS_PUBLISH_CHUNK = 500
+# The parser fetches all active lots concurrently; a refresh has to fit the one-minute beat.
+BID_REFRESH_TIMEOUT_SECS = 60.0
+# Time-to-auction buckets (from, to) relative to now; None = open end. Lots already past their
+# auction date stay in "hot" until the expired-auction job archives them.
+BID_REFRESH_TIERS: Dict[str, tuple] = {
+    "hot": (None, timedelta(hours=2)),
+    "warm": (timedelta(hours=2), timedelta(hours=24)),
+    "cold": (timedelta(hours=24), None),
+}
+BID_GT_SUGGESTED_REASON = "suggested bid < current bid;"
+
+
+def _parse_bid_items(bids: List[Dict[str, Any]]) -> List[tuple]:
+    """Parser bid items -> unique (lot, site, bid) rows; a later item for the same lot wins."""
+    rows: Dict[tuple, int] = {}
+    for item in bids:
+        # lot_id like "68271795-1" -> take the left part
+        lot_raw = str(item.get("lot_id") or "").split("-")[0].strip()
+        if not lot_raw.isdigit():
+            logger.debug("skip: bad lot_id=%r", item.get("lot_id"))
+            continue
+
+        site = _norm_site(item.get("site"))
+        pre_bid = item.get("pre_bid")
+        if pre_bid is None:
+            logger.debug("skip: no pre_bid for lot=%s site=%s", lot_raw, site)
+            continue
+        try:
+            bid = int(float(pre_bid))
+        except (ValueError, TypeError):
+            logger.debug("skip: invalid pre_bid=%r lot=%s", pre_bid, lot_raw)
+            continue
+
+        rows[(int(lot_raw), site)] = bid
+    return [(lot, site, bid) for (lot, site), bid in rows.items()]
+
+
+def _bid_flagged(car) -> Any:
+    return func.coalesce(car.recommendation_status_reasons, "").contains(BID_GT_SUGGESTED_REASON, autoescape=True)
+
+
+def _bid_toggle_values(bid, suggested_bid) -> Dict[str, Any]:
+    """
+    UPDATE values for the bid-vs-suggested toggle of CarModel, given SQL expressions for the
+    bid and suggested bid being written: BID_GT_SUGGESTED_REASON is added while the bid exceeds
+    the suggested bid and removed otherwise; without other reasons the car is RECOMMENDED again.
+    """
+    reasons = CarModel.recommendation_status_reasons
+    status_type = CarModel.recommendation_status.type
+    exceeds = and_(suggested_bid.isnot(None), bid > suggested_bid)
+    within = and_(suggested_bid.isnot(None), bid <= suggested_bid)
+    reasons_without = func.replace(reasons, BID_GT_SUGGESTED_REASON, "")
+    return {
+        "recommendation_status": case(
+            (exceeds, literal(RecommendationStatus.NOT_RECOMMENDED, status_type)),
+            (
+                and_(within, func.coalesce(reasons_without, "") == ""),
+                literal(RecommendationStatus.RECOMMENDED, status_type),
+            ),
+            else_=CarModel.recommendation_status,
+        ),
+        "recommendation_status_reasons": case(
+            (
+                and_(exceeds, ~_bid_flagged(CarModel)),
+                func.trim(func.coalesce(reasons, "") + BID_GT_SUGGESTED_REASON),
+            ),
+            (within, reasons_without),
+            else_=reasons,
+        ),
+    }
+
+
+def _apply_bids(db: Session, rows: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Apply (lot, site, bid) rows with one UPDATE ... FROM (VALUES ...) and return one
+    bid-change event (see services.bid_events) per changed car.
+
+    Cars are matched by lot + lower(auction); rows locked by someone else are skipped, as are
+    cars whose current_bid already equals the new bid and whose toggle already agrees with it
+    (suggested_bid may have moved since the bid did). The recommendation toggle and the predicted
+    margin/ROI are recomputed in SQL with the same rules as CarModel.sum_of_investments.
+    """
+    if not rows:
+        return []
+
+    bids = values(
+        column("lot", Integer), column("site", String), column("bid", Float), name="bids"
+    ).data(rows)
+    target = aliased(CarModel)
+    matched = (
+        select(target.id.label("car_id"), bids.c.bid)
+        .join_from(
+            target,
+            bids,
+            and_(target.lot == bids.c.lot, func.lower(func.coalesce(target.auction, "")) == bids.c.site),
+        )
+        .where(
+            or_(
+                target.current_bid.is_distinct_from(bids.c.bid),
+                and_(
+                    target.suggested_bid.isnot(None),
+                    (bids.c.bid > target.suggested_bid) != _bid_flagged(target),
+                ),
+            )
+        )
+        .with_for_update(of=target, skip_locked=True)
+        .subquery("matched")
+    )
+
+    new_bid = matched.c.bid
+
+    base = cast(
+        func.coalesce(CarModel.auction_fee, 0)
+        + func.coalesce(CarModel.transportation, 0)
+        + func.coalesce(CarModel.labor, 0)
+        + func.coalesce(CarModel.maintenance, 0)
+        + func.coalesce(CarModel.parts_cost, 0)
+        + new_bid,
+        Float,
+    )
+    has_margin = and_(CarModel.avg_market_price.isnot(None), base > 0)
+    margin = cast(CarModel.avg_market_price, Float) - base
+
+    stmt = (
+        update(CarModel)
+        .where(CarModel.id == matched.c.car_id)
+        .values(
+            current_bid=new_bid,
+            **_bid_toggle_values(new_bid, CarModel.suggested_bid),
+            predicted_profit_margin=case((has_margin, margin), else_=CarModel.predicted_profit_margin),
+            predicted_roi=case((has_margin, margin / base * 100.0), else_=CarModel.predicted_roi),
+        )
+        .returning(
+            CarModel.id,
+            CarModel.current_bid,
+            CarModel.suggested_bid,
+            CarModel.recommendation_status,
+            CarModel.recommendation_status_reasons,
+            CarModel.predicted_profit_margin,
+            CarModel.predicted_roi,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return [
+        {
+            "car_id": r.id,
+            "current_bid": r.current_bid,
+            "suggested_bid": r.suggested_bid,
+            "recommendation_status": r.recommendation_status.value if r.recommendation_status else None,
+            "recommendation_status_reasons": r.recommendation_status_reasons,
+            "predicted_profit_margin": r.predicted_profit_margin,
+            "predicted_roi": r.predicted_roi,
+        }
+        for r in db.execute(stmt)
+    ]
+
+
+def _bid_tier_condition(tier: str, now: datetime):
+    """WHERE clause for cars whose time-to-auction falls in `tier` (see BID_REFRESH_TIERS)."""
+    lower, upper = BID_REFRESH_TIERS[tier]
+    conds = []
+    if lower is not None:
+        conds.append(CarModel.date >= now + lower)
+    if upper is not None:
+        conds.append(CarModel.date < now + upper)
+    in_window = and_(CarModel.date.isnot(None), *conds)
+    if upper is None:
+        # Buy-now lots have no auction date and never close on a clock: refresh with the far-off ones.
+        return or_(in_window, and_(CarModel.date.is_(None), func.lower(CarModel.auction_name) == "buynow"))
+    return in_window
+
+
 @app.task(name="tasks.task.update_car_bids")
-def update_car_bids() -> Dict[str, Any]:
+def update_car_bids(tier: Optional[str] = None) -> Dict[str, Any]:
     """
     Pull current bids from the parser and update active vehicles.
-    Match by (lot + auction) case-insensitively; if not found — fallback by lot only.
+
+    `tier` limits the run to one time-to-auction bucket of BID_REFRESH_TIERS; beat schedules
+    each tier at its own cadence (core/celery_config.py). Without it every active lot is refreshed.
+    A run that finds the previous one for the same tier still in progress is skipped.
     """
-    logger.info("update_car_bids: start")
+    if tier is not None and tier not in BID_REFRESH_TIERS:
+        raise ValueError(f"unknown bid refresh tier: {tier}")
+
+    scope = tier or "all"
+    token = generate_lock_token()
+    if not acquire_bid_refresh_lock(token, scope=scope):
+        logger.info("update_car_bids[%s]: previous refresh still running, skip", scope)
+        return {"status": "skipped", "tier": scope, "updated_cars": 0}
+    try:
+        return _refresh_car_bids(tier)
+    finally:
+        release_bid_refresh_lock(token, scope=scope)
+
+
+def _refresh_car_bids(tier: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Match by (lot + auction) case-insensitively; applied set-based in chunks (see `_apply_bids`).
+    """
+    logger.info("update_car_bids[%s]: start", tier or "all")
     updated = 0
+    updated_ids: List[int] = []
 
     with SessionLocal() as db:
         try:
             # take active vehicles with valid lot/auction
+            if tier is None:
+                schedule_cond = or_(
+                    CarModel.date.isnot(None),
+                    func.lower(CarModel.auction_name) == "buynow",
+                )
+            else:
+                schedule_cond = _bid_tier_condition(tier, datetime.now(timezone.utc))
             rows = db.execute(
                 select(CarModel.id, CarModel.lot, CarModel.auction)
                 .where(
@@ -777,103 +1015,40 @@ def update_car_bids() -> Dict[str, Any]:
                         CarModel.relevance == RelevanceStatus.ACTIVE,
                         CarModel.lot.isnot(None),
                         CarModel.auction.isnot(None),
-                        or_(
-                            CarModel.date.isnot(None),
-                            func.lower(CarModel.auction_name) == "buynow",
-                        )
+                        schedule_cond,
                     )
                 )
             ).all()
             cars = [{"id": r.id, "lot": r.lot, "auction": r.auction} for r in rows]
             if not cars:
-                return {"status": "success", "updated_cars": 0}
+                return {"status": "success", "tier": tier or "all", "updated_cars": 0}
 
             # call the parser
             resp = http_post_with_retries(
                 url="http://parsers:8001/api/v1/parsers/scrape/current_bid",
                 json={"items": [{"id": c["id"], "source": c["auction"], "lot": c["lot"]} for c in cars]},
                 headers={"X-Auth-Token": settings.PARSERS_AUTH_TOKEN},
-                timeout=900.0,
+                timeout=BID_REFRESH_TIMEOUT_SECS,
+                max_retries=1,
             )
             payload = resp.json()
             bids = payload.get("bids", []) if isinstance(payload, dict) else payload
 
-            for item in bids:
-                try:
-                    # lot_id like "68271795-1" -> take the left part
-                    lot_raw = str(item.get("lot_id") or "").split("-")[0].strip()
-                    if not lot_raw.isdigit():
-                        logger.debug("skip: bad lot_id=%r", item.get("lot_id"))
-                        continue
-                    lot = int(lot_raw)
-
-                    site = _norm_site(item.get("site"))
-                    pre_bid = item.get("pre_bid")
-                    if pre_bid is None and pre_bid != 0:
-                        logger.debug("skip: no pre_bid for lot=%s site=%s", lot, site)
-                        continue
-
-                    # 1) match by lot + auction (case-insensitive)
-                    stmt = (
-                        select(CarModel)
-                        .where(
-                            and_(
-                                CarModel.lot == lot,
-                                func.lower(func.coalesce(CarModel.auction, "")) == site,
-                            )
-                        )
-                        .with_for_update(skip_locked=True)
-                    )
-                    car = db.execute(stmt).scalars().first()
-
-                    # 2) fallback — by lot only (in case of auction name discrepancies in DB)
-                    if not car:
-                        # stmt2 = (
-                        #     select(CarModel)
-                        #     .where(CarModel.lot == lot)
-                        #     .with_for_update(skip_locked=True)
-                        # )
-                        # car = db.execute(stmt2).scalars().first()
-                        # if not car:
-                        #     logger.debug("not found: lot=%s site=%s", lot, site)
-                        continue
-
-                    # update bids/status
-                    try:
-                        car.current_bid = int(float(pre_bid))
-                    except (ValueError, TypeError):
-                        logger.debug("skip: invalid pre_bid=%r lot=%s", pre_bid, lot)
-                        continue
-
-                    if car.suggested_bid is not None:
-                        if car.current_bid > car.suggested_bid:
-                            car.recommendation_status = RecommendationStatus.NOT_RECOMMENDED
-                            reasons = (car.recommendation_status_reasons or "")
-                            if "suggested bid < current bid;" not in reasons:
-                                car.recommendation_status_reasons = (reasons + "suggested bid < current bid;").strip()
-                        else:
-                            # current bid does not exceed suggested
-                            if car.recommendation_status_reasons:
-                                car.recommendation_status_reasons = car.recommendation_status_reasons.replace(
-                                    "suggested bid < current bid;", ""
-                                )
-                            if not car.recommendation_status_reasons:
-                                car.recommendation_status = RecommendationStatus.RECOMMENDED
-
-                    base = (car.sum_of_investments or 0) + (car.current_bid or 0)
-                    if car.avg_market_price is not None and base > 0:
-                        car.predicted_profit_margin = float(car.avg_market_price) - float(base)
-                        car.predicted_roi = (car.predicted_profit_margin / base) * 100.0
-
-                    updated += 1
-
-                except Exception as e:
-                    logger.info("update_car_bids: skipped lot=%r due to: %s", item.get("lot_id"), e)
-                    continue
+            parsed = _parse_bid_items(bids)
+            events: List[Dict[str, Any]] = []
+            for i in range(0, len(parsed), BID_UPDATE_CHUNK):
+                events.extend(_apply_bids(db, parsed[i:i + BID_UPDATE_CHUNK]))
+            updated_ids = [e["car_id"] for e in events]
+            updated = len(updated_ids)
 
+            db.flush()
+            refresh_car_search_sync(db, updated_ids)
             db.commit()
-            logger.info("update_car_bids: updated=%s", updated)
-            return {"status": "success", "updated_cars": updated}
+
+            for i in range(0, len(events), BID_EVENTS_PUBLISH_CHUNK):
+                publish_bid_changes(events[i:i + BID_EVENTS_PUBLISH_CHUNK])
+            logger.info("update_car_bids[%s]: lots=%s updated=%s", tier or "all", len(cars), updated)
+            return {"status": "success", "tier": tier or "all", "updated_cars": updated}
 
         except Exception:
             db.rollback()
@@ -1008,7 +1183,9 @@ def update_car_fees() -> Dict[str, Any]:
                 ))
 
             db.commit()
+            bump_pricing_version()
             logger.info("update_car_fees: OK")
+            recompute_auction_fees.delay(auctions=["copart"])
             return {"status": "success"}
 
         except Exception:
@@ -1017,6 +1194,270 @@ def update_car_fees() -> Dict[str, Any]:
             raise
 
 
+FEE_RECOMPUTE_CHUNK = 5000
+
+
+def _suggested_bid_sql(investment, fee):
+    """SQL twin of int(predicted_total_investments - CarModel.sum_of_investments)."""
+    others = (
+        func.coalesce(CarModel.transportation, 0)
+        + func.coalesce(CarModel.labor, 0)
+        + func.coalesce(CarModel.maintenance, 0)
+        + func.coalesce(CarModel.parts_cost, 0)
+    )
+    # int() truncation, as in parse_and_update_car
+    return cast(func.trunc(cast(investment - fee - others, Float)), Integer)
+
+
+def _apply_auction_fees(db: Session, rows: List[tuple]) -> List[int]:
+    """
+    Write (car_id, investment, fee) rows with one UPDATE ... FROM (VALUES ...); suggested_bid is
+    recomputed in SQL from the same columns as CarModel.sum_of_investments, and the bid toggle
+    follows it. Rows locked by a running parse (which prices the car itself) or whose investment
+    changed since the read are skipped.
+    """
+    fees = values(
+        column("car_id", Integer), column("investment", Float), column("fee", Float), name="fees"
+    ).data(rows)
+    target = aliased(CarModel)
+    matched = (
+        select(target.id.label("car_id"), fees.c.fee)
+        .join_from(target, fees, target.id == fees.c.car_id)
+        .where(target.predicted_total_investments == fees.c.investment)
+        .with_for_update(of=target, skip_locked=True)
+        .subquery("matched")
+    )
+    suggested_bid = _suggested_bid_sql(CarModel.predicted_total_investments, matched.c.fee)
+    stmt = (
+        update(CarModel)
+        .where(CarModel.id == matched.c.car_id)
+        .values(
+            auction_fee=matched.c.fee,
+            suggested_bid=suggested_bid,
+            **_bid_toggle_values(CarModel.current_bid, suggested_bid),
+        )
+        .returning(CarModel.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+@app.task(name="tasks.task.recompute_auction_fees")
+def recompute_auction_fees(auctions: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Re-price auction_fee and suggested_bid of every active car after a fee table refresh,
+    instead of waiting for each car to be re-parsed. Fees are computed for all cars at once
+    (services.fee_engine); only cars whose fee changed are written.
+    """
+    started = time.monotonic()
+    with SessionLocal() as db:
+        try:
+            engine = FeeEngine(db.execute(select(FeeModel)).scalars())
+            conditions = [
+                CarModel.relevance == RelevanceStatus.ACTIVE,
+                CarModel.predicted_total_investments.isnot(None),
+            ]
+            if auctions:
+                conditions.append(CarModel.auction.in_(auctions))
+            cars = db.execute(
+                select(
+                    CarModel.id, CarModel.auction, CarModel.predicted_total_investments, CarModel.auction_fee
+                ).where(and_(*conditions))
+            ).all()
+            if not cars:
+                return {"status": "success", "cars": 0, "updated_cars": 0}
+
+            ids = np.fromiter((c.id for c in cars), dtype=np.int64, count=len(cars))
+            investments = np.fromiter((c.predicted_total_investments for c in cars), dtype=float, count=len(cars))
+            old_fees = np.array([np.nan if c.auction_fee is None else c.auction_fee for c in cars], dtype=float)
+            new_fees = engine.compute(np.array([c.auction for c in cars], dtype=object), investments)
+
+            changed = np.flatnonzero(np.isnan(old_fees) | ~np.isclose(old_fees, new_fees, rtol=0, atol=1e-6))
+            rows = [(int(ids[i]), float(investments[i]), float(new_fees[i])) for i in changed]
+
+            updated_ids: List[int] = []
+            for i in range(0, len(rows), FEE_RECOMPUTE_CHUNK):
+                updated_ids.extend(_apply_auction_fees(db, rows[i:i + FEE_RECOMPUTE_CHUNK]))
+
+            db.flush()
+            refresh_car_search_sync(db, updated_ids)
+            db.commit()
+            if updated_ids:
+                bump_filter_options_version()
+
+            logger.info(
+                "recompute_auction_fees[%s]: cars=%s changed=%s updated=%s in %.1fs",
+                ",".join(auctions or ["all"]),
+                len(cars),
+                len(rows),
+                len(updated_ids),
+                time.monotonic() - started,
+            )
+            return {"status": "success", "cars": len(cars), "updated_cars": len(updated_ids)}
+
+        except Exception:
+            db.rollback()
+            logger.exception("recompute_auction_fees failed")
+            raise
+
+
+ROI_RECOMPUTE_CHUNK = int(os.getenv("ROI_RECOMPUTE_CHUNK", "5000"))
+# Cars locked by a running parse are skipped and retried after the pass, a few times at most.
+ROI_LOCKED_RETRIES = 3
+ROI_LOCKED_RETRY_DELAY_SECS = 2.0
+
+
+def _latest_roi_id(db: Session) -> Optional[int]:
+    return db.execute(select(ROIModel.id).order_by(ROIModel.created_at.desc()).limit(1)).scalar()
+
+
+def _apply_roi_to_range(
+    db: Session, roi: ROIModel, id_from: int, id_to: int, only_ids: Optional[List[int]] = None
+) -> Tuple[List[int], List[int]]:
+    """
+    Re-price the active cars with a market price in [id_from, id_to) (and in `only_ids`, if given)
+    for `roi` with one UPDATE. Mirrors parse_and_update_car: the auction fee depends on the new
+    investment, so it is summed from the fee table in a correlated subquery instead of being read
+    back, and the bid toggle follows the new suggested_bid.
+    Rows locked by a running parse are skipped instead of waited on; returns (updated ids, skipped ids).
+    """
+    target = aliased(CarModel)
+    investment = cast(target.avg_market_price, Float) / (1 + roi.roi / 100.0)
+    fee = (
+        select(
+            func.coalesce(
+                func.sum(case((FeeModel.percent, FeeModel.amount / 100.0 * investment), else_=FeeModel.amount)),
+                0.0,
+            )
+        )
+        .where(
+            FeeModel.auction == target.auction,
+            FeeModel.price_from <= investment,
+            FeeModel.price_to >= investment,
+        )
+        .scalar_subquery()
+    )
+    scope = [
+        target.id >= id_from,
+        target.id < id_to,
+        target.relevance == RelevanceStatus.ACTIVE,
+        target.avg_market_price > 0,
+    ]
+    if only_ids is not None:
+        scope.append(target.id.in_(only_ids))
+    matched = (
+        select(target.id, investment.label("investment"), fee.label("fee"))
+        .where(*scope)
+        .with_for_update(of=target, skip_locked=True)
+        .subquery("matched")
+    )
+    suggested_bid = _suggested_bid_sql(matched.c.investment, matched.c.fee)
+    stmt = (
+        update(CarModel)
+        .where(CarModel.id == matched.c.id)
+        .values(
+            predicted_total_investments=matched.c.investment,
+            predicted_profit_margin_percent=roi.profit_margin,
+            predicted_profit_margin=cast(CarModel.avg_market_price, Float) * (roi.profit_margin / 100.0),
+            predicted_roi=roi.roi,
+            auction_fee=matched.c.fee,
+            suggested_bid=suggested_bid,
+            **_bid_toggle_values(CarModel.current_bid, suggested_bid),
+        )
+        .returning(CarModel.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = list(db.execute(stmt).scalars())
+    skipped_ids = sorted(set(db.execute(select(target.id).where(*scope)).scalars()) - set(updated_ids))
+    return updated_ids, skipped_ids
+
+
+@app.task(name="tasks.task.recompute_predicted_roi", bind=True)
+def recompute_predicted_roi(self, roi_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Apply a new ROI record to every active car with a known avg_market_price, instead of
+    waiting for each car to be re-parsed. Cars are updated in id ranges of ROI_RECOMPUTE_CHUNK,
+    each committed on its own so row locks stay short; progress is published as the PROGRESS
+    state meta. Cars locked by a running parse are skipped and retried after the pass (up to
+    ROI_LOCKED_RETRIES times); the ones still locked are reported as "skipped". A run stops early
+    once a newer ROI record exists (its own run takes over).
+    """
+    started = time.monotonic()
+    with SessionLocal() as db:
+        try:
+            latest_id = _latest_roi_id(db)
+            roi_id = roi_id or latest_id
+            roi = db.get(ROIModel, roi_id) if roi_id else None
+            if roi is None:
+                return {"status": "skipped", "reason": "roi not found", "roi_id": roi_id}
+
+            eligible = and_(CarModel.relevance == RelevanceStatus.ACTIVE, CarModel.avg_market_price > 0)
+            total, min_id, max_id = db.execute(
+                select(func.count(CarModel.id), func.min(CarModel.id), func.max(CarModel.id)).where(eligible)
+            ).one()
+            db.rollback()  # end the read transaction before the long loop
+
+            progress = {
+                "roi_id": roi.id, "total": total, "updated": 0, "skipped": 0, "chunks_done": 0, "chunks_total": 0
+            }
+            status = "success"
+            skipped_ids: List[int] = []
+
+            def apply_chunk(id_from: int, id_to: int, only_ids: Optional[List[int]] = None) -> None:
+                updated_ids, locked_ids = _apply_roi_to_range(db, roi, id_from, id_to, only_ids)
+                refresh_car_search_sync(db, updated_ids)
+                db.commit()
+                skipped_ids.extend(locked_ids)
+                progress["updated"] += len(updated_ids)
+
+            if total:
+                progress["chunks_total"] = (max_id - min_id) // ROI_RECOMPUTE_CHUNK + 1
+                for id_from in range(min_id, max_id + 1, ROI_RECOMPUTE_CHUNK):
+                    if _latest_roi_id(db) != roi.id:
+                        status = "superseded"
+                        break
+                    apply_chunk(id_from, id_from + ROI_RECOMPUTE_CHUNK)
+                    progress["chunks_done"] += 1
+                    progress["skipped"] = len(skipped_ids)
+                    self.update_state(state="PROGRESS", meta=progress)
+
+            for _ in range(ROI_LOCKED_RETRIES):
+                if status != "success" or not skipped_ids:
+                    break
+                time.sleep(ROI_LOCKED_RETRY_DELAY_SECS)
+                if _latest_roi_id(db) != roi.id:
+                    status = "superseded"
+                    break
+                retry_ids = list(skipped_ids)
+                skipped_ids.clear()
+                for i in range(0, len(retry_ids), ROI_RECOMPUTE_CHUNK):
+                    ids = retry_ids[i:i + ROI_RECOMPUTE_CHUNK]
+                    apply_chunk(ids[0], ids[-1] + 1, ids)
+                progress["skipped"] = len(skipped_ids)
+                self.update_state(state="PROGRESS", meta=progress)
+
+            if progress["updated"]:
+                bump_filter_options_version()
+
+            logger.info(
+                "recompute_predicted_roi[%s]: %s total=%s updated=%s skipped=%s chunks=%s/%s in %.1fs",
+                roi.id,
+                status,
+                total,
+                progress["updated"],
+                progress["skipped"],
+                progress["chunks_done"],
+                progress["chunks_total"],
+                time.monotonic() - started,
+            )
+            return {"status": status, **progress}
+
+        except Exception:
+            db.rollback()
+            logger.exception("recompute_predicted_roi failed")
+            raise
+
+
 @app.task(name="tasks.task.kickoff_parse_for_filter")
 def kickoff_parse_for_filter(
     filter_id: int,
@@ -1069,57 +1510,46 @@ def kickoff_parse_for_filter(
                     CarModel.transmision,
                 )
                 .where(and_(*conditions))
+                .execution_options(yield_per=stream_chunk)
             )
 
-            result = session.execute(stmt).mappings().all()
-
-        batch = []
-        enqueued = 0
-
-        for row in result:
-            batch.append(
-                {
-                    "vin": row["vin"],
-                    "vehicle": row["vehicle"],
-                    "engine_title": row["engine_title"],
-                    "mileage": row["mileage"],
-                    "make": row["make"],
-                    "model": row["model"],
-                    "year": row["year"],
-                    "transmision": row["transmision"],
-                }
-            )
-
-            if len(batch) >= batch_size:
-                for v in batch:
-                    parse_and_update_car.delay(
-                        vin=v["vin"],
-                        car_name=v["vehicle"],
-                        car_engine=v["engine_title"],
-                        mileage=v["mileage"],
-                        car_make=v["make"],
-                        car_model=v["model"],
-                        car_year=v["year"],
-                        car_transmison=v["transmision"],
-                    )
-
-                enqueued += len(batch)
-                batch.clear()
-
-        if batch:
-            for v in batch:
-                parse_and_update_car.delay(
-                    vin=v["vin"],
-                    car_name=v["vehicle"],
-                    car_engine=v["engine_title"],
-                    mileage=v["mileage"],
-                    car_make=v["make"],
-                    car_model=v["model"],
-                    car_year=v["year"],
-                    car_transmison=v["transmision"],
-                )
-
-            enqueued += len(batch)
+            enqueued = 0
+            duplicates = 0
+
+            # server-side cursor: at most `stream_chunk` rows in memory, one producer connection for all publishes
+            with app.producer_or_acquire() as producer:
+                for rows in session.execute(stmt).mappings().partitions():
+                    by_vin = {row["vin"]: row for row in rows}
+                    claimed = claim_vins(by_vin, source="filter")
+                    duplicates += len(rows) - len(claimed)
+
+                    for i in range(0, len(claimed), batch_size):
+                        vins = claimed[i: i + batch_size]
+                        try:
+                            group(
+                                parse_and_update_car.s(
+                                    vin=vin,
+                                    car_name=by_vin[vin]["vehicle"],
+                                    car_engine=by_vin[vin]["engine_title"],
+                                    mileage=by_vin[vin]["mileage"],
+                                    car_make=by_vin[vin]["make"],
+                                    car_model=by_vin[vin]["model"],
+                                    car_year=by_vin[vin]["year"],
+                                    car_transmison=by_vin[vin]["transmision"],
+                                )
+                                for vin in vins
+                            ).apply_async(producer=producer)
+                        except Exception:
+                            release_vins(claimed[i:])
+                            raise
+                        enqueued += len(vins)
+
+        logger.info(
+            "kickoff_parse_for_filter: filter_id=%s enqueued=%s skipped_duplicates=%s",
+            filter_id,
+            enqueued,
+            duplicates,
+        )
 
         with SessionLocal() as session:
             queue_item = session.get(FilterKickoffQueueModel, queue_item_id)
@@ -1133,6 +1563,7 @@ def kickoff_parse_for_filter(
             "status": "ok",
             "filter_id": filter_id,
             "enqueued": enqueued,
+            "skipped_duplicates": duplicates,
         }
 
     except Exception as exc:
@@ -1427,6 +1858,8 @@ def parse_and_update_cars_with_expired_auction_date() -> Dict[str, Any]:
                         car.relevance = RelevanceStatus.ARCHIVAL
                         car.is_manually_upserted = False
                         db.add(car)
+                        db.flush()
+                        refresh_car_search_sync(db, [car.id])
                         db.commit()
                         stats["archived"] += 1
                         logger.info("VIN %s marked as ARCHIVAL after 404", vin)
@@ -1488,6 +1921,8 @@ def parse_and_update_cars_with_expired_auction_date() -> Dict[str, Any]:
                     logger.info("VIN %s kept ACTIVE after refresh", vin)
 
                 db.add(existing_vehicle)
+                db.flush()
+                refresh_car_search_sync(db, [existing_vehicle.id])
                 db.commit()
                 stats["updated"] += 1
 
@@ -1500,6 +1935,9 @@ def parse_and_update_cars_with_expired_auction_date() -> Dict[str, Any]:
                 logger.exception("VIN %s: update failed: %s", vin, e)
                 stats["errors"] += 1
 
+    if stats["archived"] or stats["updated"]:
+        bump_filter_options_version()
+
     logger.info("Expired auction update finished: %s", stats)
     return stats
 
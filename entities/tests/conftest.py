@@ -11,6 +11,7 @@ from types import SimpleNamespace
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -346,6 +347,45 @@ def patch_task_sessionlocal(monkeypatch, db_session_sync):
     monkeypatch.setattr(task_module, "SessionLocal", _SessionLocalProxy())
 
 
+@pytest.fixture(scope="function")
+def pg_engine_sync():
+    """
+    Sync engine on a scratch Postgres (POSTGRES_TEST_DATABASE_URL) with freshly created tables,
+    for task SQL that SQLite cannot run (UPDATE ... FROM VALUES, SKIP LOCKED). Skips when unset.
+    """
+    database_url = os.getenv("POSTGRES_TEST_DATABASE_URL")
+    if not database_url:
+        pytest.skip("POSTGRES_TEST_DATABASE_URL is not set")
+    sync_engine = create_engine(make_url(database_url).set(drivername="postgresql+psycopg2"), future=True)
+    from models import Base
+    Base.metadata.drop_all(bind=sync_engine)
+    Base.metadata.create_all(bind=sync_engine)
+    try:
+        yield sync_engine
+    finally:
+        sync_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session_pg_sync(pg_engine_sync):
+    """
+    Sync Session on the scratch Postgres.
+    """
+    with sessionmaker(bind=pg_engine_sync, autoflush=False, autocommit=False)() as pg_session:
+        yield pg_session
+
+
+@pytest.fixture(autouse=False)
+def patch_task_sessionlocal_pg(monkeypatch, pg_engine_sync):
+    """
+    Patch task_module.SessionLocal to open real sessions on the scratch Postgres, so tasks commit
+    per chunk and other sessions can hold row locks.
+    """
+    monkeypatch.setattr(
+        task_module, "SessionLocal", sessionmaker(bind=pg_engine_sync, autoflush=False, autocommit=False)
+    )
+
+
 @pytest.fixture(autouse=False)
 def patch_task_settings(monkeypatch):
     """
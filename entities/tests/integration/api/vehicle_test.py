@@ -341,3 +341,135 @@ async def test_update_car_info_network_error(client, db_session, test_user, use_
     response = await client.post(f"{API_PREFIX}/update-car-info/{car_row.id}")
     assert response.status_code == 503
     assert "Cannot reach parser service" in response.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_filter_options_served_from_cache(client, test_user, use_test_user, monkeypatch):
+    """
+    A cache hit returns the stored options without touching the database.
+    """
+    import api.v1.routers.vehicle as vehicle_router_mod
+
+    cached = {"auctions": ["Copart"], "makes_and_models": {"Honda": ["Civic"]}, "years": {"min": 2010, "max": 2020}}
+    monkeypatch.setattr(vehicle_router_mod, "get_cached_filter_options", lambda: (7, cached))
+
+    async def _must_not_run(db):
+        raise AssertionError("filter options recomputed on cache hit")
+
+    monkeypatch.setattr(vehicle_router_mod, "compute_car_filter_options", _must_not_run)
+
+    response = await client.get(f"{API_PREFIX}/filter-options/")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["auctions"] == ["Copart"]
+    assert body["makes_and_models"] == {"Honda": ["Civic"]}
+    assert body["years"] == {"min": 2010, "max": 2020}
+
+
+@pytest.mark.anyio
+async def test_bulk_accepts_gzip_trusted_payload(client, monkeypatch):
+    """
+    Gzip + trusted header takes the construct fast path; nested items still expose attributes.
+    """
+    import gzip
+    import json
+
+    import api.v1.routers.vehicle as vehicle_router_mod
+
+    monkeypatch.setenv("PARSERS_AUTH_TOKEN", "test-parsers-token")
+    captured = {}
+
+    async def _fake_bulk_save(db, data):
+        captured["data"] = data
+        return {"celery_tasks": [], "new_count": 1, "updated_count": 0, "unchanged_count": 0}
+
+    monkeypatch.setattr(vehicle_router_mod, "bulk_save_vehicles", _fake_bulk_save)
+
+    payload = {
+        "ivent": "created",
+        "vehicles": [
+            {
+                "vin": "GZIPVIN0000000001",
+                "vehicle": "2018 Honda Accord",
+                "date": "2026-01-02T03:04:05+00:00",
+                "photos": [{"url": "https://img/1.jpg"}],
+                "condition_assessments": [{"issue_description": "Minor Dent"}],
+            }
+        ],
+    }
+    response = await client.post(
+        f"{API_PREFIX}/bulk",
+        content=gzip.compress(json.dumps(payload).encode()),
+        headers={
+            "X-Auth-Token": "test-parsers-token",
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            "X-Trusted-Payload": "1",
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["new"] == 1
+
+    vehicle = captured["data"].vehicles[0]
+    assert vehicle.vin == "GZIPVIN0000000001"
+    assert vehicle.date == datetime.fromisoformat("2026-01-02T03:04:05+00:00")
+    assert vehicle.photos[0].url == "https://img/1.jpg"
+    assert vehicle.condition_assessments[0].type_of_damage is None
+    assert vehicle.year is None and vehicle.is_salvage is False
+
+
+@pytest.mark.anyio
+async def test_bulk_trusted_payload_with_loose_types_is_validated(client, monkeypatch):
+    """
+    A trusted vehicle whose values are not exactly typed falls back to pydantic instead of
+    reaching the database as strings.
+    """
+    import json
+
+    import api.v1.routers.vehicle as vehicle_router_mod
+
+    monkeypatch.setenv("PARSERS_AUTH_TOKEN", "test-parsers-token")
+    captured = {}
+
+    async def _fake_bulk_save(db, data):
+        captured["data"] = data
+        return {"celery_tasks": [], "new_count": 2, "updated_count": 0, "unchanged_count": 0}
+
+    monkeypatch.setattr(vehicle_router_mod, "bulk_save_vehicles", _fake_bulk_save)
+    headers = {
+        "X-Auth-Token": "test-parsers-token",
+        "Content-Type": "application/json",
+        "X-Trusted-Payload": "1",
+    }
+
+    payload = {
+        "ivent": "created",
+        "vehicles": [
+            {"vin": "LOOSEVIN000000001", "lot": "12345", "engine_cylinder": "4", "mileage": "1000", "has_keys": "yes"},
+            {"vin": "EXACTVIN000000001", "lot": 12345, "current_bid": 1500, "sales_history": [{"final_bid": "900"}]},
+        ],
+    }
+    response = await client.post(f"{API_PREFIX}/bulk", content=json.dumps(payload), headers=headers)
+    assert response.status_code == 201
+
+    loose, exact = captured["data"].vehicles
+    assert (loose.lot, loose.engine_cylinder, loose.mileage, loose.has_keys) == (12345, 4, 1000, True)
+    assert exact.current_bid == 1500.0 and isinstance(exact.current_bid, float)
+    assert exact.sales_history[0].final_bid == 900
+
+    payload["vehicles"] = [{"vin": "BADVIN00000000001", "lot": "not-a-lot"}]
+    response = await client.post(f"{API_PREFIX}/bulk", content=json.dumps(payload), headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_bulk_rejects_unknown_encoding_and_validates_untrusted(client, monkeypatch):
+    monkeypatch.setenv("PARSERS_AUTH_TOKEN", "test-parsers-token")
+    headers = {"X-Auth-Token": "test-parsers-token", "Content-Type": "application/json"}
+
+    response = await client.post(f"{API_PREFIX}/bulk", content=b"{}", headers={**headers, "Content-Encoding": "br"})
+    assert response.status_code == 415
+    assert "gzip" in response.headers["accept-encoding"]
+
+    response = await client.post(f"{API_PREFIX}/bulk", content=b'{"ivent": "created", "vehicles": [{}]}', headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import core.setup as core_setup
+from core.setup import _geocode_cached, _ZipArrays
+from models import GeocodeCacheModel
+
+pytestmark = pytest.mark.anyio
+
+
+def _zip(code, lat, lng, state, city="Dallas"):
+    return SimpleNamespace(zip=code, lat=lat, lng=lng, state_id=state, city=city)
+
+
+def test_zip_arrays_candidates_within_radius_and_state():
+    zips = _ZipArrays(
+        [
+            _zip("75201", 32.79, -96.80, "TX"),  # ~1 mi from the point
+            _zip("75050", 32.77, -97.00, "TX"),  # ~12 mi
+            _zip("77001", 29.76, -95.37, "TX"),  # Houston, ~225 mi
+            _zip("73301", 32.79, -96.81, "OK"),  # close, but state not in the location
+        ]
+    )
+
+    found = zips.candidates(32.78, -96.80, "DALLAS (TX)")
+
+    assert sorted(z.zip for z in found) == ["75050", "75201"]
+    assert zips.candidates(32.78, -96.80, "no state here") == []
+
+
+def _geocoder(monkeypatch, answer):
+    calls = []
+
+    def fake(query):
+        calls.append(query)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(core_setup, "get_location_coordinates", fake)
+    return calls
+
+
+async def test_geocode_cached_hits_table_after_first_lookup(db_session: AsyncSession, monkeypatch):
+    calls = _geocoder(monkeypatch, (32.7, -96.8))
+
+    assert await _geocode_cached(db_session, "GEO HIT TX", {}) == (32.7, -96.8)
+    await db_session.commit()
+    assert await _geocode_cached(db_session, "GEO HIT TX", {}) == (32.7, -96.8)
+
+    assert calls == ["GEO HIT TX"]
+
+
+async def test_geocode_cached_does_not_store_failures(db_session: AsyncSession, monkeypatch):
+    calls = _geocoder(monkeypatch, RuntimeError("geocoder returned HTTP 429"))
+
+    known = {}
+    assert await _geocode_cached(db_session, "GEO FAIL TX", known) == (None, None)
+    assert await _geocode_cached(db_session, "GEO FAIL TX", known) == (None, None)
+    await db_session.commit()
+    assert calls == ["GEO FAIL TX"]  # once per run
+    assert await db_session.get(GeocodeCacheModel, "GEO FAIL TX") is None
+
+    _geocoder(monkeypatch, (30.0, -97.0))
+    assert await _geocode_cached(db_session, "GEO FAIL TX", {}) == (30.0, -97.0)
+
+
+async def test_geocode_cached_retries_expired_no_result(db_session: AsyncSession, monkeypatch):
+    stale = datetime.utcnow() - core_setup.GEOCODE_MISS_TTL - timedelta(days=1)
+    db_session.add_all(
+        [
+            GeocodeCacheModel(query="GEO STALE TX", lat=None, lng=None, created_at=stale),
+            GeocodeCacheModel(query="GEO FRESH TX", lat=None, lng=None, created_at=datetime.utcnow()),
+        ]
+    )
+    await db_session.commit()
+    calls = _geocoder(monkeypatch, (31.0, -97.5))
+
+    assert await _geocode_cached(db_session, "GEO FRESH TX", {}) == (None, None)
+    assert await _geocode_cached(db_session, "GEO STALE TX", {}) == (31.0, -97.5)
+    await db_session.commit()
+
+    assert calls == ["GEO STALE TX"]
+    refreshed = await db_session.get(GeocodeCacheModel, "GEO STALE TX")
+    assert (refreshed.lat, refreshed.lng) == (31.0, -97.5)
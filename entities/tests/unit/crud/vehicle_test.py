@@ -5,7 +5,7 @@ import pytest
 from sqlalchemy import desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from crud.vehicle import get_filtered_vehicles, save_vehicle_with_photos
+from crud.vehicle import get_filtered_vehicles, get_filtered_vehicles_keyset, save_vehicle_with_photos
 from models import Base
 from models.admin import FilterModel
 from models.vehicle import (
@@ -306,6 +306,112 @@ async def test_pagination_and_aggregates(db_session, seeded_cars, patch_ordering
     assert bids_page2 == {}
 
 
+async def test_facet_counts_follow_current_filters(db_session, seeded_cars, patch_ordering):
+    import crud.vehicle as filters_module
+    patch_ordering(filters_module)
+
+    cars, total, _, extra = await get_filtered_vehicles(
+        db_session, {"make": ["honda", "ford"]}, "created_desc", 1, 50, facets=["make", "location"]
+    )
+
+    assert total == len(cars) == 2
+    assert extra["facets"] == {
+        "make": {"Honda": 1, "Ford": 1},
+        "location": {"Los Angeles": 1, "Houston": 1},
+    }
+
+
+async def test_zip_search_uses_yard_names_within_radius(db_session, seeded_cars, patch_ordering):
+    from fastapi import HTTPException
+
+    import crud.vehicle as filters_module
+    from models.vehicle import USZipModel
+    from services.zip_index import invalidate_zip_index
+
+    patch_ordering(filters_module)
+    db_session.add_all([
+        USZipModel(zip="90012", lat=34.06, lng=-118.24, city="Los Angeles", state_id="CA",
+                   state_name="California", copart_name="Los Angeles"),
+        USZipModel(zip="90301", lat=33.96, lng=-118.35, city="Inglewood", state_id="CA",
+                   state_name="California"),
+        USZipModel(zip="77002", lat=29.76, lng=-95.37, city="Houston", state_id="TX",
+                   state_name="Texas", iaai_name="Houston"),
+    ])
+    await db_session.commit()
+    invalidate_zip_index()
+
+    try:
+        cars, *_ = await run_vehicle_query(db_session, {"zip_search": ["90301", 50]})
+        assert {car.location for car in cars} == {"Los Angeles"}
+
+        cars, *_ = await run_vehicle_query(db_session, {"zip_search": ["90301", 5]})
+        assert cars == []
+
+        with pytest.raises(HTTPException) as exc:
+            await run_vehicle_query(db_session, {"zip_search": ["00000", 50]})
+        assert exc.value.status_code == 404
+    finally:
+        invalidate_zip_index()
+
+
+async def test_keyset_pagination_walks_all_pages(db_session, seeded_cars):
+    seen, cursor, first_total = [], None, None
+    while True:
+        cars, cursor, total, bids = await get_filtered_vehicles_keyset(
+            db_session, {}, "current_bid_asc", cursor, page_size=1
+        )
+        if first_total is None:
+            first_total = total
+            assert bids.get("total_count") == total
+        else:
+            assert total is None and bids == {}
+        seen.extend(car.id for car in cars)
+        if cursor is None:
+            break
+
+    expected = [seeded_cars[k].id for k in ("car_4", "car_3", "car_5")]
+    assert seen == expected
+    assert first_total == len(expected)
+
+
+async def test_keyset_rejects_cursor_from_other_ordering(db_session, seeded_cars):
+    from fastapi import HTTPException
+
+    _, cursor, _, _ = await get_filtered_vehicles_keyset(db_session, {}, "created_at_desc", None, page_size=1)
+    with pytest.raises(HTTPException) as exc:
+        await get_filtered_vehicles_keyset(db_session, {}, "current_bid_desc", cursor, page_size=1)
+    assert exc.value.status_code == 400
+
+
+async def test_refresh_car_search_projects_only_listable_cars(db_session, seeded_cars):
+    from models.car_search import CarSearchModel
+    from services.car_search import refresh_car_search
+
+    archived = seeded_cars["car_4"]
+    archived.relevance = RelevanceStatus.ARCHIVAL
+    await db_session.commit()
+
+    ids = [car.id for car in seeded_cars.values()]
+    written = await refresh_car_search(db_session, ids)
+    await db_session.commit()
+
+    rows = {r.car_id: r for r in await all_from(db_session, select(CarSearchModel))}
+    assert written == len(rows) == 4
+    assert archived.id not in rows
+    assert rows[seeded_cars["car_3"].id].make == "toyota"
+    assert rows[seeded_cars["car_1"].id].issue_descriptions == ["Water/Flood"]
+
+    archived.relevance = RelevanceStatus.ACTIVE
+    seeded_cars["car_3"].suggested_bid = 0
+    await db_session.commit()
+    await refresh_car_search(db_session, [archived.id, seeded_cars["car_3"].id])
+    await db_session.commit()
+
+    ids_now = {r.car_id for r in await all_from(db_session, select(CarSearchModel))}
+    assert archived.id in ids_now
+    assert seeded_cars["car_3"].id not in ids_now
+
+
 def make_schema(
     vin: str,
     make="Honda",
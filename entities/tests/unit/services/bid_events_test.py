@@ -0,0 +1,45 @@
+import pytest
+
+from services.bid_events import BidEventHub
+
+
+@pytest.mark.anyio
+async def test_dispatch_respects_subscriber_filters(monkeypatch):
+    hub = BidEventHub(channel="test")
+
+    async def _no_listen():
+        return None
+
+    monkeypatch.setattr(hub, "_listen", _no_listen)
+
+    everything = hub.subscribe()
+    only_two = hub.subscribe([2])
+    nothing = hub.subscribe([])
+
+    hub.dispatch([{"car_id": 1, "current_bid": 100}, {"car_id": 2, "current_bid": 200}])
+
+    assert [e["car_id"] for e in everything.queue.get_nowait()] == [1, 2]
+    assert only_two.queue.get_nowait() == [{"car_id": 2, "current_bid": 200}]
+    assert nothing.queue.empty()
+
+    hub.unsubscribe(only_two)
+    hub.dispatch([{"car_id": 2, "current_bid": 250}])
+    assert only_two.queue.empty()
+
+
+@pytest.mark.anyio
+async def test_slow_subscriber_drops_instead_of_blocking(monkeypatch):
+    hub = BidEventHub(channel="test")
+
+    async def _no_listen():
+        return None
+
+    monkeypatch.setattr(hub, "_listen", _no_listen)
+    monkeypatch.setattr("services.bid_events.SUBSCRIBER_QUEUE_SIZE", 1)
+
+    sub = hub.subscribe([1])
+    hub.dispatch([{"car_id": 1}])
+    hub.dispatch([{"car_id": 1}])
+
+    assert sub.queue.qsize() == 1
+    assert sub.dropped == 1
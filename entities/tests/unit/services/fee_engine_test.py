@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.fee_engine import FeeEngine
+
+
+def _fee(auction, fee_type, price_from, price_to, amount, percent=False):
+    return SimpleNamespace(
+        auction=auction, fee_type=fee_type, price_from=price_from, price_to=price_to, amount=amount, percent=percent
+    )
+
+
+FEES = [
+    _fee("copart", "bidding_fees", 0.0, 99.99, 25.0),
+    _fee("copart", "bidding_fees", 100.0, 999.99, 10.0, percent=True),
+    _fee("copart", "bidding_fees", 1000.0, 1e9, 6.0, percent=True),
+    _fee("copart", "virtual_bid_fee", 0.0, 499.99, 0.0),
+    _fee("copart", "virtual_bid_fee", 500.0, 1e9, 79.0),
+    _fee("copart", "gate_fee", 0.0, 1e9, 95.0),
+    # overlapping ranges of one type: summed like the SQL range query does
+    _fee("iaai", "high_volume_buyer_fees", 0.0, 500.0, 50.0),
+    _fee("iaai", "high_volume_buyer_fees", 400.0, 1e9, 100.0),
+    _fee("iaai", "service_fee", None, None, 1000.0),
+]
+
+
+def _row_by_row(auction, price):
+    total = 0.0
+    for f in FEES:
+        if f.auction == auction and f.price_from is not None and f.price_from <= price <= f.price_to:
+            total += (f.amount / 100.0) * price if f.percent else float(f.amount)
+    return total
+
+
+def test_fee_engine_matches_row_by_row_fees():
+    rng = np.random.default_rng(7)
+    prices = np.concatenate([[0.0, 99.99, 100.0, 450.0, 500.0, 999.99, 1000.0], rng.uniform(0, 20_000, 500)])
+    auctions = np.array(["copart", "iaai", "Copart", None] * (len(prices) // 4 + 1), dtype=object)[: len(prices)]
+
+    fees = FeeEngine(FEES).compute(auctions, prices)
+
+    expected = [_row_by_row(a, p) for a, p in zip(auctions, prices)]
+    np.testing.assert_allclose(fees, expected)
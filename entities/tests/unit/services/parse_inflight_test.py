@@ -0,0 +1,123 @@
+import redis
+
+import services.parse_inflight as inflight
+
+
+class _FakePipeline:
+    def __init__(self, redis_):
+        self.redis = redis_
+        self.ops = []
+
+    def set(self, key, value, nx=False, ex=None):
+        self.ops.append(lambda: self.redis.set(key, value, nx=nx))
+
+    def hincrby(self, key, field, amount):
+        self.ops.append(lambda: self.redis.hincrby(key, field, amount))
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def set(self, key, value, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def hincrby(self, key, field, amount):
+        h = self.hashes.setdefault(key, {})
+        h[field] = h.get(field, 0) + amount
+        return h[field]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def hgetall(self, key):
+        return {field: str(value) for field, value in self.hashes.get(key, {}).items()}
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return (key for key in list(self.store) if key.startswith(prefix))
+
+
+class _DownRedis:
+    def pipeline(self, transaction=True):
+        raise redis.ConnectionError("down")
+
+
+def test_claim_vins_skips_queued_and_repeated_vins(monkeypatch):
+    monkeypatch.setattr(inflight, "redis_client", _FakeRedis())
+
+    assert inflight.claim_vins(["A", "B", "A"]) == ["A", "B"]
+    assert inflight.claim_vins(["B", "C"]) == ["C"]
+
+    inflight.release_vins(["B"])
+    assert inflight.claim_vins(["B"]) == ["B"]
+
+
+def test_claim_vins_without_redis_claims_everything(monkeypatch):
+    monkeypatch.setattr(inflight, "redis_client", _DownRedis())
+
+    assert inflight.claim_vins(["A", "B"]) == ["A", "B"]
+
+
+class _Celery:
+    def __init__(self, fail_on=None):
+        self.sent = []
+        self.fail_on = fail_on
+
+    def send_task(self, name, kwargs=None, queue=None):
+        if kwargs["vin"] == self.fail_on:
+            raise RuntimeError("broker down")
+        self.sent.append((name, kwargs["vin"], queue))
+
+
+def test_send_parse_tasks_suppresses_duplicates_and_counts_them(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(inflight, "redis_client", fake)
+    celery = _Celery()
+
+    sent = inflight.send_parse_tasks(celery, [{"vin": "A"}, {"vin": "B"}], source="bulk")
+    assert [p["vin"] for p in sent] == ["A", "B"]
+    assert inflight.send_parse_tasks(celery, [{"vin": "A"}], source="scrape") == []
+    assert celery.sent == [
+        ("tasks.task.parse_and_update_car", "A", "car_parsing_queue"),
+        ("tasks.task.parse_and_update_car", "B", "car_parsing_queue"),
+    ]
+    stats = fake.hashes[inflight.PARSE_INFLIGHT_STATS_KEY]
+    assert stats["bulk:claimed"] == 2
+    assert stats["scrape:suppressed"] == 1
+
+
+def test_send_parse_tasks_releases_vins_that_were_not_sent(monkeypatch):
+    monkeypatch.setattr(inflight, "redis_client", _FakeRedis())
+
+    try:
+        inflight.send_parse_tasks(_Celery(fail_on="B"), [{"vin": "A"}, {"vin": "B"}, {"vin": "C"}], source="bulk")
+    except RuntimeError:
+        pass
+
+    assert inflight.claim_vins(["A", "B", "C"]) == ["B", "C"]
+
+
+def test_get_inflight_stats_sums_sources_and_counts_queued_vins(monkeypatch):
+    monkeypatch.setattr(inflight, "redis_client", _FakeRedis())
+
+    inflight.claim_vins(["A", "B"], source="bulk")
+    inflight.claim_vins(["B", "C"], source="scrape")
+    inflight.release_vins(["A"])
+
+    assert inflight.get_inflight_stats() == {
+        "bulk": {"claimed": 2, "suppressed": 0},
+        "scrape": {"claimed": 1, "suppressed": 1},
+        "total": {"claimed": 3, "suppressed": 1, "in_flight": 2},
+    }
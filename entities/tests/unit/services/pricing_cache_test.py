@@ -0,0 +1,45 @@
+import random
+
+from services.pricing_cache import FeeRow, FeeSchedule, PricingCache
+
+
+def _row(fee_type, price_from, price_to, amount=1.0):
+    return FeeRow(fee_type=fee_type, amount=amount, percent=False, price_from=price_from, price_to=price_to)
+
+
+def test_fee_schedule_lookup_matches_range_query():
+    rows = [
+        _row("bidding", 0.0, 99.99),
+        _row("bidding", 100.0, 499.99),
+        _row("bidding", 500.0, 1e9),
+        _row("virtual", 0.0, 999.99),
+        _row("virtual", 1000.0, 1e9),
+        _row("gate", 0.0, 1e9),
+        _row("single", 250.0, 250.0),
+    ]
+    schedule = FeeSchedule(rows)
+
+    for price in [0.0, 50.0, 99.99, 100.0, 250.0, 499.995, 999.99, 1000.0, 5e5] + [
+        random.uniform(0, 2000) for _ in range(200)
+    ]:
+        expected = sorted((r for r in rows if r.price_from <= price <= r.price_to), key=lambda r: r.price_from)
+        assert sorted(schedule.lookup(price), key=lambda r: (r.price_from, r.fee_type)) == sorted(
+            expected, key=lambda r: (r.price_from, r.fee_type)
+        )
+
+
+def test_fee_schedule_lookup_below_all_ranges():
+    assert FeeSchedule([_row("bidding", 100.0, 200.0)]).lookup(50.0) == []
+    assert FeeSchedule([]).lookup(50.0) == []
+
+
+def test_invalidate_ignores_versions_already_loaded():
+    cache = PricingCache()
+    cache._version = 5
+    cache._loaded_at = 1e12  # far future: fresh
+
+    cache.invalidate(5)
+    assert cache._loaded_at
+
+    cache.invalidate(6)
+    assert not cache._loaded_at
@@ -3,7 +3,8 @@ from datetime import datetime
 
 import pytest
 
-from models.vehicle import AutoCheckModel, CarModel, RecommendationStatus, RelevanceStatus
+from models.admin import ROIModel
+from models.vehicle import AutoCheckModel, CarModel, FeeModel, RecommendationStatus, RelevanceStatus
 
 
 class _RespBase:
@@ -276,3 +277,302 @@ def test_sales_history_four_entries_only_verify_invocation_and_effect_flag(
     updated = db_session_sync.query(CarModel).filter_by(vin="VINHIST4").first()
     assert updated.recommendation_status == RecommendationStatus.NOT_RECOMMENDED
     assert "sales at auction in the last 3 years: 4;" in (updated.recommendation_status_reasons or "")
+
+
+def test_parse_bid_items_skips_bad_and_missing_items():
+    from tasks.task import _parse_bid_items
+
+    rows = _parse_bid_items(
+        [
+            {"lot_id": "68271795-1", "site": "1", "pre_bid": "1500"},
+            {"lot_id": "abc", "site": "copart", "pre_bid": 100},
+            {"site": "copart", "pre_bid": 100},
+            {"lot_id": "555", "site": "IAAI", "pre_bid": None},
+            {"lot_id": "556", "site": "iaai"},
+            {"lot_id": "557", "site": "iaai", "pre_bid": "n/a"},
+            {"lot_id": "558", "site": "iaai.com", "pre_bid": 99.9},
+            {"lot_id": "68271795", "site": "copart", "pre_bid": 1600},  # a later item for the same lot wins
+        ]
+    )
+
+    assert sorted(rows) == [(558, "iaai", 99), (68271795, "copart", 1600)]
+
+
+def test_apply_bids_toggles_bid_gt_suggested(db_session_pg_sync):
+    from tasks.task import BID_GT_SUGGESTED_REASON, _apply_bids
+
+    db = db_session_pg_sync
+    plain = CarModel(
+        vin="VINBID1", vehicle="A", lot=101, auction="Copart", suggested_bid=1000, current_bid=500,
+        recommendation_status=RecommendationStatus.RECOMMENDED,
+    )
+    other_reason = CarModel(
+        vin="VINBID2", vehicle="B", lot=102, auction="Copart", suggested_bid=1000, current_bid=500,
+        recommendation_status=RecommendationStatus.NOT_RECOMMENDED, recommendation_status_reasons="Manual;",
+    )
+    db.add_all([plain, other_reason])
+    db.commit()
+
+    events = _apply_bids(db, [(101, "copart", 1500.0), (102, "copart", 1500.0)])
+    db.commit()
+    db.expire_all()
+
+    assert sorted(e["car_id"] for e in events) == sorted([plain.id, other_reason.id])
+    assert plain.current_bid == 1500
+    assert plain.recommendation_status == RecommendationStatus.NOT_RECOMMENDED
+    assert plain.recommendation_status_reasons == BID_GT_SUGGESTED_REASON
+    assert other_reason.recommendation_status_reasons == "Manual;" + BID_GT_SUGGESTED_REASON
+
+    assert _apply_bids(db, [(101, "copart", 1500.0)]) == []  # unchanged bid: no write, no event
+
+    _apply_bids(db, [(101, "copart", 800.0), (102, "copart", 800.0)])
+    db.commit()
+    db.expire_all()
+
+    assert plain.recommendation_status == RecommendationStatus.RECOMMENDED
+    assert not plain.recommendation_status_reasons
+    # another reason keeps the car not recommended
+    assert other_reason.recommendation_status == RecommendationStatus.NOT_RECOMMENDED
+    assert other_reason.recommendation_status_reasons == "Manual;"
+
+    # a re-price moved suggested_bid under the unchanged bid: the toggle still has to flip
+    plain.suggested_bid = 700
+    db.commit()
+    events = _apply_bids(db, [(101, "copart", 800.0), (102, "copart", 800.0)])
+    db.commit()
+    db.expire_all()
+
+    assert [e["car_id"] for e in events] == [plain.id]
+    assert plain.recommendation_status == RecommendationStatus.NOT_RECOMMENDED
+    assert plain.recommendation_status_reasons == BID_GT_SUGGESTED_REASON
+
+
+def test_apply_bids_skips_locked_cars(pg_engine_sync, db_session_pg_sync):
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    from tasks.task import _apply_bids
+
+    db = db_session_pg_sync
+    db.add(CarModel(vin="VINLOCK1", vehicle="A", lot=201, auction="IAAI", current_bid=500))
+    db.commit()
+
+    with Session(pg_engine_sync) as parse_session:
+        parse_session.execute(select(CarModel).where(CarModel.vin == "VINLOCK1").with_for_update()).all()
+        assert _apply_bids(db, [(201, "iaai", 900.0)]) == []
+        db.rollback()
+
+    assert [e["current_bid"] for e in _apply_bids(db, [(201, "iaai", 900.0)])] == [900]
+
+
+def test_bid_refresh_tiers_partition_the_refreshed_cars(db_session_sync):
+    from datetime import timedelta, timezone
+
+    from sqlalchemy import select
+
+    from tasks.task import BID_REFRESH_TIERS, _bid_tier_condition
+
+    now = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+    dates = {
+        "past": now - timedelta(hours=1),
+        "soon": now + timedelta(minutes=30),
+        "hot_edge": now + timedelta(hours=2),
+        "today": now + timedelta(hours=23, minutes=59),
+        "warm_edge": now + timedelta(hours=24),
+        "next_week": now + timedelta(days=7),
+        "no_date": None,
+    }
+    cars = {
+        name: CarModel(vin=f"VINTIER{i}", vehicle=name, lot=900 + i, auction="tiers", auction_name="Copart", date=date)
+        for i, (name, date) in enumerate(dates.items())
+    }
+    cars["buy_now"] = CarModel(
+        vin="VINTIERBN", vehicle="buy_now", lot=999, auction="tiers", auction_name="BuyNow", date=None
+    )
+    db_session_sync.add_all(cars.values())
+    db_session_sync.commit()
+
+    tiers = {
+        tier: set(
+            db_session_sync.execute(
+                select(CarModel.vehicle).where(CarModel.auction == "tiers", _bid_tier_condition(tier, now))
+            ).scalars()
+        )
+        for tier in BID_REFRESH_TIERS
+    }
+
+    assert tiers == {
+        "hot": {"past", "soon"},
+        "warm": {"hot_edge", "today"},
+        "cold": {"warm_edge", "next_week", "buy_now"},
+    }
+    # every car the untiered refresh would take lands in exactly one tier; undated auction lots in none
+    assert sum(len(names) for names in tiers.values()) == len(set().union(*tiers.values()))
+    assert set().union(*tiers.values()) == set(cars) - {"no_date"}
+
+
+def test_recompute_predicted_roi_reprices_active_cars_in_chunks(
+    monkeypatch,
+    patch_task_sessionlocal,
+    db_session_sync,
+):
+    import tasks.task as task_module
+
+    monkeypatch.setattr(task_module, "ROI_RECOMPUTE_CHUNK", 1)
+    monkeypatch.setattr(task_module, "refresh_car_search_sync", lambda *_a, **_k: None)
+    bumps = []
+    monkeypatch.setattr(task_module, "bump_filter_options_version", lambda: bumps.append(1))
+    states = []
+    monkeypatch.setattr(
+        task_module.recompute_predicted_roi, "update_state", lambda **kw: states.append(dict(kw["meta"]))
+    )
+
+    roi = ROIModel(roi=25.0)  # profit_margin = 20.0
+    db_session_sync.add_all(
+        [
+            roi,
+            FeeModel(auction="roi-recompute", fee_type="buyer", amount=10.0, percent=True, price_from=0, price_to=100000),
+            FeeModel(auction="roi-recompute", fee_type="gate", amount=100.0, percent=False, price_from=0, price_to=100000),
+        ]
+    )
+    active = CarModel(
+        vin="VINROI1", vehicle="A", relevance=RelevanceStatus.ACTIVE, auction="roi-recompute",
+        avg_market_price=10000, transportation=500, current_bid=7000,
+        recommendation_status=RecommendationStatus.RECOMMENDED,
+    )
+    archived = CarModel(
+        vin="VINROI2", vehicle="B", relevance=RelevanceStatus.ARCHIVAL, auction="roi-recompute",
+        avg_market_price=10000, suggested_bid=1,
+    )
+    no_price = CarModel(vin="VINROI3", vehicle="C", relevance=RelevanceStatus.ACTIVE, auction="roi-recompute", suggested_bid=2)
+    db_session_sync.add_all([active, archived, no_price])
+    db_session_sync.commit()
+
+    out = task_module.recompute_predicted_roi.run(roi_id=roi.id)
+
+    assert out["status"] == "success"
+    # the sync DB is shared across tests: other active cars may be re-priced too
+    assert out["updated"] == out["total"] >= 1
+    assert states[-1]["updated"] == out["updated"] and states[-1]["chunks_done"] == out["chunks_total"]
+    assert bumps == [1]
+
+    db_session_sync.expire_all()
+    car = db_session_sync.get(CarModel, active.id)
+    assert car.predicted_total_investments == pytest.approx(8000.0)
+    assert car.predicted_roi == pytest.approx(25.0)
+    assert car.predicted_profit_margin_percent == pytest.approx(20.0)
+    assert car.predicted_profit_margin == pytest.approx(2000.0)
+    assert car.auction_fee == pytest.approx(900.0)
+    assert car.suggested_bid == 8000 - 900 - 500
+    assert car.recommendation_status == RecommendationStatus.NOT_RECOMMENDED
+    assert car.recommendation_status_reasons == "suggested bid < current bid;"
+    assert db_session_sync.get(CarModel, archived.id).suggested_bid == 1
+    assert db_session_sync.get(CarModel, no_price.id).suggested_bid == 2
+
+
+def test_recompute_auction_fees_writes_changed_fees_in_chunks_and_skips_locked_cars(
+    monkeypatch,
+    patch_task_sessionlocal_pg,
+    pg_engine_sync,
+    db_session_pg_sync,
+):
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    import tasks.task as task_module
+
+    monkeypatch.setattr(task_module, "FEE_RECOMPUTE_CHUNK", 1)
+    monkeypatch.setattr(task_module, "bump_filter_options_version", lambda: None)
+    chunks = []
+    apply_auction_fees = task_module._apply_auction_fees
+    monkeypatch.setattr(
+        task_module, "_apply_auction_fees", lambda db, rows: chunks.append(rows) or apply_auction_fees(db, rows)
+    )
+
+    db = db_session_pg_sync
+    db.add_all(
+        [
+            FeeModel(auction="Copart", fee_type="buyer", amount=100.0, percent=False, price_from=0, price_to=5000),
+            FeeModel(auction="Copart", fee_type="buyer", amount=10.0, percent=True, price_from=5000.01, price_to=100000),
+        ]
+    )
+
+    def _car(vin, investment, **kw):
+        return CarModel(
+            vin=vin, vehicle=vin, auction="Copart", relevance=RelevanceStatus.ACTIVE,
+            predicted_total_investments=investment, **kw,
+        )
+
+    flat = _car("VINFEE1", 1000.0, transportation=200, suggested_bid=1000, current_bid=800)
+    percent = _car(
+        "VINFEE2", 6000.0, auction_fee=100.0, suggested_bid=1, current_bid=1000,
+        recommendation_status=RecommendationStatus.NOT_RECOMMENDED,
+        recommendation_status_reasons="suggested bid < current bid;",
+    )
+    unchanged = _car("VINFEE3", 2000.0, auction_fee=100.0, suggested_bid=1)
+    locked = _car("VINFEE4", 3000.0, suggested_bid=1)
+    archived = _car("VINFEE5", 3000.0, suggested_bid=1)
+    archived.relevance = RelevanceStatus.ARCHIVAL
+    db.add_all([flat, percent, unchanged, locked, archived])
+    db.commit()
+
+    with Session(pg_engine_sync) as parse_session:
+        parse_session.execute(select(CarModel).where(CarModel.id == locked.id).with_for_update()).all()
+        out = task_module.recompute_auction_fees.run()
+
+    assert out == {"status": "success", "cars": 4, "updated_cars": 2}
+    assert sorted(row[0] for rows in chunks for row in rows) == sorted([flat.id, percent.id, locked.id])
+    assert all(len(rows) == 1 for rows in chunks)
+
+    db.expire_all()
+    assert (flat.auction_fee, flat.suggested_bid) == (100.0, 1000 - 100 - 200)
+    assert (percent.auction_fee, percent.suggested_bid) == (600.0, 6000 - 600)
+    # the bid toggle follows the re-priced suggested_bid
+    assert flat.recommendation_status == RecommendationStatus.NOT_RECOMMENDED
+    assert flat.recommendation_status_reasons == "suggested bid < current bid;"
+    assert percent.recommendation_status == RecommendationStatus.RECOMMENDED
+    assert not percent.recommendation_status_reasons
+    assert (unchanged.auction_fee, unchanged.suggested_bid) == (100.0, 1)
+    assert (locked.auction_fee, locked.suggested_bid) == (None, 1)  # locked by a parse: left to it
+    assert (archived.auction_fee, archived.suggested_bid) == (None, 1)
+
+
+def test_recompute_predicted_roi_retries_cars_locked_by_a_parse(
+    monkeypatch,
+    patch_task_sessionlocal_pg,
+    pg_engine_sync,
+    db_session_pg_sync,
+):
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    import tasks.task as task_module
+
+    monkeypatch.setattr(task_module, "ROI_LOCKED_RETRY_DELAY_SECS", 0)
+    monkeypatch.setattr(task_module, "bump_filter_options_version", lambda: None)
+
+    db = db_session_pg_sync
+    roi = ROIModel(roi=25.0)
+    free = CarModel(vin="VINROIL1", vehicle="A", relevance=RelevanceStatus.ACTIVE, auction="Copart", avg_market_price=10000)
+    locked = CarModel(vin="VINROIL2", vehicle="B", relevance=RelevanceStatus.ACTIVE, auction="Copart", avg_market_price=10000)
+    db.add_all([roi, free, locked])
+    db.commit()
+
+    with Session(pg_engine_sync) as parse_session:
+        parse_session.execute(select(CarModel).where(CarModel.id == locked.id).with_for_update()).all()
+
+        # the lock outlives every retry: the car is reported, not waited on
+        monkeypatch.setattr(task_module.recompute_predicted_roi, "update_state", lambda **kw: None)
+        out = task_module.recompute_predicted_roi.run(roi_id=roi.id)
+        assert (out["status"], out["updated"], out["skipped"]) == ("success", 1, 1)
+
+        # the parse commits after the first pass: the retry picks the car up
+        monkeypatch.setattr(
+            task_module.recompute_predicted_roi, "update_state", lambda **kw: parse_session.rollback()
+        )
+        out = task_module.recompute_predicted_roi.run(roi_id=roi.id)
+        assert (out["status"], out["updated"], out["skipped"]) == ("success", 2, 0)
+
+    db.expire_all()
+    assert locked.predicted_total_investments == pytest.approx(8000.0)
+    assert locked.suggested_bid == 8000
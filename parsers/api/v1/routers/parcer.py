@@ -6,11 +6,14 @@ from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from core.config import settings
 from core.dependencies import get_token
 from schemas.schemas import (
+    DCBatchItemSchema,
+    DCBatchRequestSchema,
+    DCBatchResultSchema,
     DCResponseSchema,
     UpdateCurrentBidListRequestSchema,
     UpdateCurrentBidListResponseSchema,
@@ -20,6 +23,7 @@ from schemas.schemas import (
 from services.fees.copart_fees_parser import scrape_copart_fees
 from services.fees.iaai_fees_image_parser import parse_fee_table
 from services.parsers.copart_current_bid_parser import get_current_bid
+from services.parsers.dc_result_cache import get_cached_result, set_cached_result
 
 if settings.ENVIRON == "dev":
     from services.parsers.dc_scraper_local import DealerCenterScraper
@@ -36,6 +40,9 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 
 router = APIRouter(prefix="/parsers", tags=["parsers"])
 
+# VINs of one batch scraped at the same time; bounded by the DealerCenter rate budget.
+DC_BATCH_CONCURRENCY = int(os.getenv("DC_BATCH_CONCURRENCY", "4"))
+
 
 @router.get(
     "/scrape/dc",
@@ -52,7 +59,75 @@ async def scrape_dc(
     car_year: int = Query(..., description="Year of the car"),
     car_transmison: str = Query(..., description="Transmission type of the car"),
     only_history: bool = Query(False, description="If true, only scrape history data"),
+    max_age: int = Query(
+        None,
+        ge=0,
+        description="Serve a cached result no older than this many seconds (0 forces a fresh scrape)",
+    ),
 ):
+    return await _scrape_dc_vin(
+        car_vin=car_vin,
+        car_name=car_name,
+        car_engine=car_engine,
+        car_mileage=car_mileage,
+        car_make=car_make,
+        car_model=car_model,
+        car_year=car_year,
+        car_transmison=car_transmison,
+        only_history=only_history,
+        max_age=max_age,
+    )
+
+
+@router.post(
+    "/scrape/dc/batch",
+    description="Scrape Dealer Center data for many VINs; streams one NDJSON line per VIN as it completes",
+)
+async def scrape_dc_batch(data: DCBatchRequestSchema):
+    semaphore = asyncio.Semaphore(DC_BATCH_CONCURRENCY)
+    logger.info(f"Starting DealerCenter batch scrape for {len(data.items)} VINs")
+
+    async def run(item: DCBatchItemSchema) -> DCBatchResultSchema:
+        async with semaphore:
+            try:
+                result = await _scrape_dc_vin(**item.model_dump(exclude={"id"}), max_age=data.max_age)
+            except Exception as e:
+                logger.error(f"Batch scrape failed for VIN {item.car_vin}: {e}", exc_info=True)
+                result = DCResponseSchema(error=str(e))
+        return DCBatchResultSchema(id=item.id, car_vin=item.car_vin, **result.model_dump())
+
+    async def stream():
+        tasks = [asyncio.create_task(run(item)) for item in data.items]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                yield result.model_dump_json() + "\n"
+        finally:
+            # client went away: do not keep scraping for nobody
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+async def _scrape_dc_vin(
+    car_vin: str,
+    car_name: str | None,
+    car_engine: str | None,
+    car_mileage: int | None,
+    car_make: str,
+    car_model: str,
+    car_year: int,
+    car_transmison: str,
+    only_history: bool = False,
+    max_age: int | None = None,
+) -> DCResponseSchema:
+    """Scrape one VIN with up to 3 attempts, serving and filling the result cache."""
+    cached = await get_cached_result(car_vin, car_mileage, only_history, max_age)
+    if cached is not None:
+        logger.info(f"Serving cached DealerCenter data for VIN {car_vin}")
+        return DCResponseSchema(**cached)
+
     attempts = 0
     max_attempts = 3
     retry_delay = 2
@@ -75,6 +150,7 @@ async def scrape_dc(
             else:
                 result = await scraper.get_history_and_market_data_async()
             logger.info(f"Successfully scraped data for VIN {car_vin}")
+            await set_cached_result(car_vin, car_mileage, only_history, result)
             return DCResponseSchema(**result)
         except Exception as e:
             logger.error(f"Error during scraping for VIN {car_vin}: {str(e)} attempt: {attempts + 1}", exc_info=True)
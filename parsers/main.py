@@ -2,6 +2,8 @@ from fastapi import FastAPI
 
 from api.v1.routers.apicar import router as apicar_router
 from api.v1.routers.parcer import router as parcer_router
+from services.parsers.copart_current_bid_parser import close_apicar_client
+from services.parsers.dc_scraper import close_dc_client
 from tasks.tasks import fetch_api_data
 
 app = FastAPI(title="My Async FastAPI Project")
@@ -12,6 +14,12 @@ app = FastAPI(title="My Async FastAPI Project")
 #     fetch_api_data.delay(base_url="https://api.apicar.store/api/cars/db/all", size=5000)
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    await close_apicar_client()
+    await close_dc_client()
+
+
 app.include_router(parcer_router, prefix="/api/v1")
 app.include_router(apicar_router, prefix="/api/v1")
 
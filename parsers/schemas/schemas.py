@@ -14,6 +14,29 @@ class DCResponseSchema(BaseModel):
     error: Optional[str] = None
 
 
+class DCBatchItemSchema(BaseModel):
+    id: Optional[int] = None  # caller's reference, echoed back in the result line
+    car_vin: str
+    car_name: Optional[str] = None
+    car_engine: Optional[str] = None
+    car_mileage: Optional[int] = None
+    car_make: str
+    car_model: str
+    car_year: int
+    car_transmison: str
+    only_history: bool = False
+
+
+class DCBatchRequestSchema(BaseModel):
+    items: list[DCBatchItemSchema] = Field(..., min_length=1, max_length=500)
+    max_age: Optional[int] = Field(None, ge=0)
+
+
+class DCBatchResultSchema(DCResponseSchema):
+    id: Optional[int] = None
+    car_vin: str
+
+
 class UpdateCurrentBidRequestSchema(BaseModel):
     id: int
     source: str
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from lxml import etree, html
+
+logger = logging.getLogger(__name__)
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Same selections as the former BeautifulSoup queries, compiled once per process.
+OWNERS_XPATH = etree.XPath(f"(//span[{_has_class('box-title-owners')}]/span)[1]")
+ODOMETER_XPATH = etree.XPath(
+    f"(//p[contains(., 'Last reported odometer:')]//span[{_has_class('font-weight-bold')}])[1]"
+)
+# bs4 `class_="table table-striped"` matches the exact attribute value, not "table-stripedX"
+DAMAGE_TABLES_XPATH = etree.XPath("//table[@class='table table-striped'][contains(., 'Damage Type')]")
+DAMAGE_ROWS_XPATH = etree.XPath(".//tr[count(td) >= 3]")
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AUTOCHECK_PARSE_WORKERS", "4")), thread_name_prefix="autocheck-parse"
+)
+
+
+def extract_history(html_data: str, fallback_odometer: Optional[int]) -> dict:
+    """
+    Extract owners, odometer and accident count from the AutoCheck HTML.
+    """
+    tree = html.fromstring(html_data)
+
+    # owners
+    try:
+        owners_el = OWNERS_XPATH(tree)
+        owners_val = int(owners_el[0].text_content()) if owners_el else 1
+    except Exception:
+        logger.warning("Failed to extract owners, defaulting to 1")
+        owners_val = 1
+
+    # odometer
+    try:
+        odo_el = ODOMETER_XPATH(tree)
+        odo_val = int(odo_el[0].text_content().replace(",", "")) if odo_el else fallback_odometer
+    except Exception:
+        logger.error("Failed to extract odometer value")
+        odo_val = fallback_odometer
+
+    # accidents
+    acc_cnt = 0
+    try:
+        tables = DAMAGE_TABLES_XPATH(tree)
+        if tables:
+            acc_cnt = len(DAMAGE_ROWS_XPATH(tables[0]))
+    except Exception as e:
+        logger.warning(f"Failed to extract accidents: {e}, defaulting to 0")
+
+    return {
+        "owners": owners_val,
+        "mileage": odo_val,
+        "accident_count": acc_cnt,
+    }
+
+
+async def extract_history_async(html_data: str, fallback_odometer: Optional[int]) -> dict:
+    """Run `extract_history` on the parse thread pool so large reports do not block the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, extract_history, html_data, fallback_odometer)
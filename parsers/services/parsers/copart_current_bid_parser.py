@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import os
+import random
 import time
 
 import httpx
@@ -156,52 +157,139 @@ async def process_url_copart(vehicle_id: int, lot: str):
         return vehicle_id, result.json().get("pre_bid", None)
 
 
-async def fetch_current_bids(lots: list[dict]) -> list[dict]:
+CURRENT_BID_MANY_URL = "https://api.apicar.store/api/cars/current-bid/many"
+CURRENT_BID_BATCH_SIZE = int(os.getenv("CURRENT_BID_BATCH_SIZE", "20"))
+CURRENT_BID_CONCURRENCY = int(os.getenv("CURRENT_BID_CONCURRENCY", "8"))
+# APICAR requests per second across all concurrent batches of this process.
+CURRENT_BID_RATE_PER_SEC = float(os.getenv("CURRENT_BID_RATE_PER_SEC", "10"))
+CURRENT_BID_MAX_RETRIES = int(os.getenv("CURRENT_BID_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY_SECS = 0.5
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+_apicar_client: httpx.AsyncClient | None = None
+_rate_limiter = TokenBucket(CURRENT_BID_RATE_PER_SEC)
+
+
+def get_apicar_client() -> httpx.AsyncClient:
+    """Process-wide pooled HTTP/2 client for APICAR current-bid calls."""
+    global _apicar_client
+    if _apicar_client is None or _apicar_client.is_closed:
+        _apicar_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=CURRENT_BID_CONCURRENCY, max_keepalive_connections=CURRENT_BID_CONCURRENCY
+            ),
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": "insomnia/11.3.0",
+            },
+        )
+    return _apicar_client
+
+
+async def close_apicar_client() -> None:
+    global _apicar_client
+    if _apicar_client is not None:
+        await _apicar_client.aclose()
+        _apicar_client = None
+
+
+def _retry_delay(attempt: int) -> float:
+    # full jitter: spreads retries of concurrent batches instead of retrying in lockstep
+    return random.uniform(0, RETRY_BASE_DELAY_SECS * 2**attempt)
+
+
+async def fetch_current_bids(
+    lots: list[dict],
+    client: httpx.AsyncClient | None = None,
+    rate_limiter: TokenBucket | None = None,
+    max_retries: int = CURRENT_BID_MAX_RETRIES,
+) -> list[dict]:
     """
     Відправляє POST-запит до API з переданими lot_id та site,
     та повертає список відповідей по кожному лоту.
+
+    Retries transport errors, 429 and 5xx with jittered backoff; other errors give [].
     """
-    async with httpx.AsyncClient(timeout=30) as client:
+    client = client or get_apicar_client()
+    rate_limiter = rate_limiter or _rate_limiter
+
+    for attempt in range(max_retries + 1):
+        await rate_limiter.acquire()
         try:
             response = await client.post(
-                "https://api.apicar.store/api/cars/current-bid/many",
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "insomnia/11.3.0",
-                    "api-key": os.getenv("APICAR_KEY"),
-                },
+                CURRENT_BID_MANY_URL,
+                headers={"api-key": os.getenv("APICAR_KEY")},
                 json={"lots": lots},
             )
             response.raise_for_status()
-            result = response.json()
-            return result
+            return response.json()
         except httpx.HTTPStatusError as e:
-            print(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
+            code = e.response.status_code
+            if code != 429 and code < 500:
+                logger.error(f"HTTP error occurred: {code} - {e.response.text}")
+                return []
+            error = f"HTTP {code}"
         except httpx.RequestError as e:
-            print(f"Request error: {e}")
-        return []
-
-
-
-async def get_current_bid(urls: list[UpdateCurrentBidRequestSchema]):
+            error = f"Request error: {e}"
+
+        if attempt == max_retries:
+            logger.error(f"current-bid batch of {len(lots)} lots failed after {attempt + 1} attempts: {error}")
+            return []
+        await asyncio.sleep(_retry_delay(attempt))
+    return []
+
+
+async def get_current_bid(
+    urls: list[UpdateCurrentBidRequestSchema],
+    batch_size: int = CURRENT_BID_BATCH_SIZE,
+    concurrency: int = CURRENT_BID_CONCURRENCY,
+    client: httpx.AsyncClient | None = None,
+    rate_limiter: TokenBucket | None = None,
+):
     """
-    Main function to process multiple URLs concurrently.
+    Fetch current bids for all lots: batches of `batch_size`, at most `concurrency` in flight,
+    over one shared client and rate limiter.
     """
-
-    # Create tasks for all URLs
-    # logger.info(f"where tuple? type: {type(urls)}")
     payload = []
     for obj in urls:
         payload.append(
             {"lot_id": obj.lot,
              "site": 1 if ("copart" in obj.source.lower() or "copart" == obj.source.lower()) else 2}
         )
-    
-    batch_size = 20
-    results = []
-    for i in range(0, len(payload), batch_size):
-        batch = payload[i: i + batch_size]
-        result = await fetch_current_bids(batch)
-        results.extend(result)
-
-    return results
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(batch: list[dict]) -> list[dict]:
+        async with semaphore:
+            return await fetch_current_bids(batch, client=client, rate_limiter=rate_limiter)
+
+    started = time.monotonic()
+    batches = [payload[i: i + batch_size] for i in range(0, len(payload), batch_size)]
+    results = await asyncio.gather(*(run(batch) for batch in batches))
+    logger.info(f"current bids: lots={len(payload)} batches={len(batches)} in {time.monotonic() - started:.1f}s")
+
+    return [bid for batch in results for bid in batch]
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from services.parsers.dc_session_store import REDIS_HOST, REDIS_PORT
+
+logger = logging.getLogger(__name__)
+
+REDIS_DB = int(os.getenv("DC_RESULT_CACHE_REDIS_DB", "3"))
+
+RESULT_KEY_PREFIX = "dc:result"
+LRU_KEY = "dc:result:lru"
+RESULT_CACHE_TTL_SECS = int(os.getenv("DC_RESULT_CACHE_TTL", str(60 * 60 * 24 * 7)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("DC_RESULT_CACHE_MAX_ENTRIES", "50000"))
+# Mileage differences below this do not change the valuation enough to re-scrape.
+ODOMETER_BUCKET_MILES = int(os.getenv("DC_RESULT_CACHE_ODOMETER_BUCKET", "5000"))
+
+_redis: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        # binary client: entries are zlib-compressed JSON (AutoCheck HTML is large)
+        _redis = aioredis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            socket_connect_timeout=2,
+            socket_timeout=5,
+        )
+    return _redis
+
+
+def result_key(vin: str, odometer: Optional[int], only_history: bool) -> str:
+    bucket = "na" if odometer is None else odometer // ODOMETER_BUCKET_MILES
+    mode = "history" if only_history else "full"
+    return f"{RESULT_KEY_PREFIX}:{vin.upper()}:{bucket}:{mode}"
+
+
+async def get_cached_result(
+    vin: str, odometer: Optional[int], only_history: bool, max_age: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Return a cached scrape result not older than `max_age` seconds (default: the cache TTL).
+    A history-only request is also served from a cached full result.
+    """
+    if max_age is not None and max_age <= 0:
+        return None
+    keys = [result_key(vin, odometer, only_history)]
+    if only_history:
+        keys.append(result_key(vin, odometer, only_history=False))
+
+    client = get_redis()
+    try:
+        raws = await client.mget(keys)
+    except redis.RedisError as e:
+        logger.warning(f"DealerCenter result cache unavailable: {e}")
+        return None
+
+    now = time.time()
+    for key, raw in zip(keys, raws):
+        if not raw:
+            continue
+        try:
+            entry = json.loads(zlib.decompress(raw))
+            saved_at, result = entry["saved_at"], entry["result"]
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            # corrupt or written in an older format: a miss; the next scrape overwrites it
+            logger.warning(f"Ignoring unreadable DealerCenter result cache entry {key}: {e}")
+            continue
+        if max_age is not None and now - saved_at > max_age:
+            continue
+        try:
+            await client.zadd(LRU_KEY, {key: now})
+        except redis.RedisError:
+            pass
+        return result
+    return None
+
+
+async def set_cached_result(vin: str, odometer: Optional[int], only_history: bool, result: Dict[str, Any]) -> None:
+    """Store a successful scrape result and evict the least recently used entries above the size bound."""
+    key = result_key(vin, odometer, only_history)
+    now = time.time()
+    raw = zlib.compress(json.dumps({"saved_at": now, "result": result}).encode())
+    client = get_redis()
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(key, raw, ex=RESULT_CACHE_TTL_SECS)
+            pipe.zadd(LRU_KEY, {key: now})
+            # entries last touched before the TTL window have certainly expired already
+            pipe.zremrangebyscore(LRU_KEY, "-inf", now - RESULT_CACHE_TTL_SECS)
+            pipe.zcard(LRU_KEY)
+            *_, size = await pipe.execute()
+
+        overflow = size - RESULT_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            evicted = [k for k, _ in await client.zpopmin(LRU_KEY, overflow)]
+            if evicted:
+                await client.delete(*evicted)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to cache DealerCenter result for VIN {vin}: {e}")
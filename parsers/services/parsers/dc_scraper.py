@@ -1,5 +1,6 @@
 import asyncio
 import email
+import functools
 import imaplib
 import json
 import logging
@@ -14,6 +15,9 @@ from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from playwright.async_api import async_playwright
 
+from services.parsers.autocheck_extractor import extract_history, extract_history_async
+from services.parsers.dc_session_store import invalidate_credentials, login_singleflight
+
 # ------------------------------------------------------------
 # Logging / env
 # ------------------------------------------------------------
@@ -70,6 +74,10 @@ class Config:
     CREDENTIALS: Dict[str, Any] = {}
 
     TIMEOUT = 100
+    # Shared HTTP/2 pool used by every scraper instance of the process
+    MAX_CONNECTIONS = int(os.getenv("DC_MAX_CONNECTIONS", "20"))
+    MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("DC_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    KEEPALIVE_EXPIRY = float(os.getenv("DC_KEEPALIVE_EXPIRY", "60"))
     MAX_WAIT_VERIFICATION = 30
     POLL_INTERVAL = 4
     VIEWPORT = {"width": 1280, "height": 720}
@@ -227,6 +235,44 @@ class EmailClient:
         return None
 
 
+@functools.lru_cache(maxsize=None)
+def get_email_client(email_addr: str, password: str) -> EmailClient:
+    """One EmailClient per mailbox for the whole process."""
+    return EmailClient(email_addr, password)
+
+
+# ------------------------------------------------------------
+# Shared HTTP client
+# ------------------------------------------------------------
+_dc_client: Optional[httpx.AsyncClient] = None
+
+
+def get_dc_client() -> httpx.AsyncClient:
+    """
+    Process-wide pooled HTTP/2 client for DealerCenter API calls.
+    History, valuation and market-stats requests of all scraper instances reuse its keep-alive connections.
+    """
+    global _dc_client
+    if _dc_client is None or _dc_client.is_closed:
+        _dc_client = httpx.AsyncClient(
+            http2=True,
+            timeout=Config.TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=Config.MAX_CONNECTIONS,
+                max_keepalive_connections=Config.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _dc_client
+
+
+async def close_dc_client() -> None:
+    global _dc_client
+    if _dc_client is not None:
+        await _dc_client.aclose()
+        _dc_client = None
+
+
 # ------------------------------------------------------------
 # Scraper
 # ------------------------------------------------------------
@@ -265,7 +311,7 @@ class DealerCenterScraper:
         smtp_password = os.getenv("SMTP_PASSWORD")
         if not smtp_user or not smtp_password:
             raise ValueError("SMTP_USER and SMTP_PASSWORD must be set in .env file")
-        self.email_client = EmailClient(smtp_user, smtp_password)
+        self.email_client = get_email_client(smtp_user, smtp_password)
 
         self.cookies: list = []
         self.access_token: Optional[str] = None
@@ -350,7 +396,9 @@ class DealerCenterScraper:
         """
         Ensure the scraper is logged in.
         CLASS-level single-flight: if one instance is logging in, others wait.
-        If `force=True`, always perform login regardless of the current ready state.
+        Across processes the session comes from the Redis store, and only the holder of its
+        login lock runs the browser login (see dc_session_store.login_singleflight).
+        If `force=True`, ignore the in-process ready state and go to the store again.
         """
         # sync from shared first
         self._sync_from_shared()
@@ -373,7 +421,10 @@ class DealerCenterScraper:
             DealerCenterScraper._class_login_ready.clear()
 
             try:
-                await self._perform_login_with_mfa_retry()
+                creds = await login_singleflight(self._login_and_collect)
+                self.cookies = creds.get("cookies") or []
+                self.access_token = creds.get("access_token")
+                self._save_credentials()
                 # after successful login, mark ready
                 DealerCenterScraper._class_login_ready.set()
             except Exception:
@@ -384,6 +435,11 @@ class DealerCenterScraper:
                 # make sure this instance sees the shared creds
                 self._sync_from_shared()
 
+    async def _login_and_collect(self) -> Dict[str, Any]:
+        """Run the browser login and return the resulting session for the shared store."""
+        await self._perform_login_with_mfa_retry()
+        return {"cookies": self.cookies, "access_token": self.access_token}
+
     async def _perform_login_with_mfa_retry(self, max_attempts: int = 5):
         """
         Retry login ONLY when MFA email limit exceeded:
@@ -478,6 +534,7 @@ class DealerCenterScraper:
         """
         Single POST with current credentials.
         On 401/403: force a re-login (clear cached creds, reset ready flag), then raise AuthRefreshedError.
+        The Redis session is dropped only if it still holds the rejected token, so one refresh serves all workers.
         Other HTTP errors: re-raise.
         """
         # ensure class-level login
@@ -485,29 +542,31 @@ class DealerCenterScraper:
 
         headers = self._headers()
         cookies = self._cookies_dict()
+        used_token = self.access_token
 
-        async with httpx.AsyncClient(timeout=Config.TIMEOUT) as client:
-            try:
-                r = await client.post(url, headers=headers, cookies=cookies, json=payload)
-                r.raise_for_status()
-                return r
-            except httpx.HTTPStatusError as e:
-                if e.response is not None and e.response.status_code in (401, 403):
-                    logging.info("401/403 received → forcing re-login (clearing cached credentials)")
+        client = get_dc_client()
+        try:
+            r = await client.post(url, headers=headers, cookies=cookies, json=payload)
+            r.raise_for_status()
+            return r
+        except httpx.HTTPStatusError as e:
+            if e.response is not None and e.response.status_code in (401, 403):
+                logging.info("401/403 received → forcing re-login (clearing cached credentials)")
+
+                # Invalidate cached credentials (cluster + shared + instance) and reset ready flag
+                await invalidate_credentials(used_token)
+                self.cookies = []
+                self.access_token = None
+                self._save_credentials()
 
-                    # Invalidate cached credentials (shared + instance) and reset ready flag
-                    self.cookies = []
-                    self.access_token = None
-                    self._save_credentials()
+                DealerCenterScraper._class_login_ready.clear()
 
-                    DealerCenterScraper._class_login_ready.clear()
+                # Perform a fresh login (class single-flight; forced)
+                await self._ensure_logged_in_singleflight(force=True)
 
-                    # Perform a fresh login (class single-flight; forced)
-                    await self._ensure_logged_in_singleflight(force=True)
-
-                    # Ask the caller to retry the request with fresh creds
-                    raise AuthRefreshedError("Credentials refreshed, please retry") from e
-                raise
+                # Ask the caller to retry the request with fresh creds
+                raise AuthRefreshedError("Credentials refreshed, please retry") from e
+            raise
 
     # ----------------------- parsing & API helpers ---------------------
 
@@ -516,42 +575,7 @@ class DealerCenterScraper:
         """
         Extract owners, odometer and accident count from the AutoCheck HTML.
         """
-        soup = BeautifulSoup(html_data, "html.parser")
-
-        # owners
-        try:
-            owners_element = soup.select_one("span.box-title-owners > span")
-            owners_val = int(owners_element.text) if owners_element else 1
-        except Exception:
-            logging.warning("Failed to extract owners, defaulting to 1")
-            owners_val = 1
-
-        # odometer
-        try:
-            odo_el = soup.select_one("p:contains('Last reported odometer:') span.font-weight-bold")
-            odo_val = int(odo_el.text.replace(",", "")) if odo_el else fallback_odometer
-        except Exception:
-            logging.error("Failed to extract odometer value")
-            odo_val = fallback_odometer
-
-        # accidents
-        acc_cnt = 0
-        try:
-            tables = soup.find_all("table", class_="table table-striped")
-            for table in tables:
-                if "Damage Type" in table.get_text():
-                    rows = table.find_all("tr")
-                    damage_rows = [row for row in rows if len(row.find_all("td")) >= 3]
-                    acc_cnt = len(damage_rows)
-                    break
-        except Exception as e:
-            logging.warning(f"Failed to extract accidents: {e}, defaulting to 0")
-
-        return {
-            "owners": owners_val,
-            "mileage": odo_val,
-            "accident_count": acc_cnt,
-        }
+        return extract_history(html_data, fallback_odometer)
 
     async def _fetch_history_html(self) -> str:
         """Call AutoCheck endpoint and return the embedded HTML string."""
@@ -590,22 +614,21 @@ class DealerCenterScraper:
                 {"bookType": 4},
             ],
         }
-        async with httpx.AsyncClient(timeout=Config.TIMEOUT) as client:
-            r = await client.post(
-                Config.VALUATION_URL,
-                headers=self._headers(),
-                cookies=self._cookies_dict(),
-                json=payload_jd,
-            )
-            r.raise_for_status()
-            j = r.json()
-            jd = manheim = None
-            try:
-                jd = int(float(j.get("nada", {}).get("retailBook")))
-                manheim = int(float(j.get("manheim", {}).get("adjustedRetailAverage")))
-            except Exception:
-                logging.warning("Valuation fields missing")
-            return jd, manheim
+        r = await get_dc_client().post(
+            Config.VALUATION_URL,
+            headers=self._headers(),
+            cookies=self._cookies_dict(),
+            json=payload_jd,
+        )
+        r.raise_for_status()
+        j = r.json()
+        jd = manheim = None
+        try:
+            jd = int(float(j.get("nada", {}).get("retailBook")))
+            manheim = int(float(j.get("manheim", {}).get("adjustedRetailAverage")))
+        except Exception:
+            logging.warning("Valuation fields missing")
+        return jd, manheim
 
     async def _fetch_market_stats(self, odometer_value: Optional[int]) -> Optional[int]:
         """
@@ -655,20 +678,19 @@ class DealerCenterScraper:
             },
             "maxDigitalPriceLockType": None,
         }
-        async with httpx.AsyncClient(timeout=Config.TIMEOUT) as client:
-            r = await client.post(
-                Config.MARKET_DATA_URL,
-                headers=self._headers(),
-                cookies=self._cookies_dict(),
-                json=payload_market_data,
-            )
-            r.raise_for_status()
-            j = r.json()
-            try:
-                return int(float(j.get("priceAvg")))
-            except Exception:
-                logging.warning("priceAvg missing")
-                return None
+        r = await get_dc_client().post(
+            Config.MARKET_DATA_URL,
+            headers=self._headers(),
+            cookies=self._cookies_dict(),
+            json=payload_market_data,
+        )
+        r.raise_for_status()
+        j = r.json()
+        try:
+            return int(float(j.get("priceAvg")))
+        except Exception:
+            logging.warning("priceAvg missing")
+            return None
 
     # ----------------------- public API --------------------------
 
@@ -684,7 +706,7 @@ class DealerCenterScraper:
 
         start_t = time.time()
         html_data = await self._fetch_history_html()  # may raise AuthRefreshedError
-        parsed = self._parse_history(html_data, self.odometer)
+        parsed = await extract_history_async(html_data, self.odometer)
 
         result = {
             "owners": parsed["owners"],
@@ -710,7 +732,7 @@ class DealerCenterScraper:
         start_t = time.time()
         # 1) history
         html_data = await self._fetch_history_html()  # may raise AuthRefreshedError
-        parsed = self._parse_history(html_data, self.odometer)
+        parsed = await extract_history_async(html_data, self.odometer)
 
         # 2) valuations
         jd, manheim = await self._fetch_valuation()
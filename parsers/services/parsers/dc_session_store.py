@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_DB = int(os.getenv("DC_SESSION_REDIS_DB", "3"))
+
+CREDENTIALS_KEY = "dc:session:credentials"
+LOGIN_LOCK_KEY = "dc:session:login-lock"
+CREDENTIALS_TTL_SECS = int(os.getenv("DC_CREDENTIALS_TTL", str(60 * 60 * 24)))
+# Must outlive a full MFA-rate-limited login (up to 5 x ~6 min of sleeps).
+LOGIN_LOCK_TTL_SECS = int(os.getenv("DC_LOGIN_LOCK_TTL", str(60 * 40)))
+LOGIN_POLL_INTERVAL_SECS = 2
+
+_redis: Optional[aioredis.Redis] = None
+
+_COMPARE_AND_DEL = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+  return redis.call("DEL", KEYS[1])
+else
+  return 0
+end
+"""
+
+# Deletes the stored credentials only if they still carry the token that got the 401,
+# so a worker with stale credentials never wipes a session another worker just refreshed.
+_INVALIDATE_IF_TOKEN = """
+local raw = redis.call("GET", KEYS[1])
+if not raw then
+  return 0
+end
+if cjson.decode(raw)["access_token"] == ARGV[1] then
+  return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = aioredis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=5,
+        )
+    return _redis
+
+
+async def load_credentials() -> Optional[Dict[str, Any]]:
+    """Return {"cookies", "access_token"} shared by all parser processes, or None."""
+    try:
+        raw = await get_redis().get(CREDENTIALS_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"DealerCenter session store unavailable: {e}")
+        return None
+    if not raw:
+        return None
+    data = json.loads(raw)
+    if not (data.get("cookies") and data.get("access_token")):
+        return None
+    return data
+
+
+async def save_credentials(cookies: list, access_token: Optional[str]) -> None:
+    if not (cookies and access_token):
+        return
+    payload = json.dumps({"cookies": cookies, "access_token": access_token, "saved_at": time.time()})
+    try:
+        await get_redis().set(CREDENTIALS_KEY, payload, ex=CREDENTIALS_TTL_SECS)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to store DealerCenter session: {e}")
+
+
+async def invalidate_credentials(stale_token: Optional[str]) -> bool:
+    """Drop the shared session if it is still the one identified by `stale_token`."""
+    if not stale_token:
+        return False
+    try:
+        return bool(await get_redis().eval(_INVALIDATE_IF_TOKEN, 1, CREDENTIALS_KEY, stale_token))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate DealerCenter session: {e}")
+        return False
+
+
+async def _acquire_login_lock(token: str) -> bool:
+    return await get_redis().set(LOGIN_LOCK_KEY, token, nx=True, ex=LOGIN_LOCK_TTL_SECS) is True
+
+
+async def _release_login_lock(token: str) -> None:
+    try:
+        await get_redis().eval(_COMPARE_AND_DEL, 1, LOGIN_LOCK_KEY, token)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to release DealerCenter login lock: {e}")
+
+
+async def login_singleflight(login: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Return a valid shared session, running `login` in at most one process of the cluster.
+
+    If the store already holds credentials they are returned as is. Otherwise the caller that
+    wins the Redis lock runs `login` and publishes its result; everyone else polls the store
+    until that session appears (or the lock is released, in which case they compete again).
+    Without Redis, `login` simply runs locally.
+    """
+    lock_token = str(uuid.uuid4())
+    while True:
+        creds = await load_credentials()
+        if creds:
+            return creds
+
+        try:
+            acquired = await _acquire_login_lock(lock_token)
+        except redis.RedisError as e:
+            logger.warning(f"DealerCenter login lock unavailable, logging in locally: {e}")
+            return await login()
+
+        if acquired:
+            try:
+                # a login may have finished between our read and the lock
+                creds = await load_credentials()
+                if creds:
+                    return creds
+                creds = await login()
+                await save_credentials(creds.get("cookies"), creds.get("access_token"))
+                return creds
+            finally:
+                await _release_login_lock(lock_token)
+
+        logger.info("DealerCenter login in progress in another process, waiting for the shared session")
+        deadline = time.monotonic() + LOGIN_LOCK_TTL_SECS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOGIN_POLL_INTERVAL_SECS)
+            creds = await load_credentials()
+            if creds:
+                return creds
+            try:
+                if not await get_redis().exists(LOGIN_LOCK_KEY):
+                    break
+            except redis.RedisError:
+                break
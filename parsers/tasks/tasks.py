@@ -1,8 +1,10 @@
+import asyncio
 import json
 import logging
 import os
 import shutil
 import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from itertools import islice
 from typing import Optional
@@ -13,6 +15,7 @@ from celery import Celery
 from celery.schedules import crontab
 from dotenv import load_dotenv
 
+from services.bulk_wire import BulkBodyEncoder, post_bulk, post_bulk_sync
 from services.convert.vehicle import format_car_data
 
 # Configure logging
@@ -62,116 +65,220 @@ def chunked(iterable, size):
     for first in it:
         yield [first, *islice(it, size - 1)]
 
-@app.task
-def fetch_api_data(size: Optional[int] = None, base_url: Optional[str] = None):
-    """Streaming: fetch page -> process -> forward -> next"""
+# Forward stage tuning for fetch_api_data; env overrides keep the beat task signature unchanged.
+FORWARD_BATCH_SIZE = int(os.getenv("APICAR_FORWARD_BATCH_SIZE", "50"))
+FORWARD_CONCURRENCY = int(os.getenv("APICAR_FORWARD_CONCURRENCY", "4"))
+# Pages fetched ahead of the transformer; bounds memory while page N+1 downloads during page N.
+PREFETCH_PAGES = int(os.getenv("APICAR_PREFETCH_PAGES", "2"))
 
-    if not base_url:
-        base_url = "https://api.apicar.store/api/cars/db/update"
-    if not size:
-        size = 1000
+
+def to_bulk_vehicle(raw: dict) -> dict:
+    """Map one APICAR row to the /vehicles/bulk item shape."""
+    formatted = format_car_data(raw)
+    return {
+        "vin": formatted["vin"],
+        "vehicle": formatted["vehicle"],
+        "make": formatted["make"],
+        "model": formatted["model"],
+        "year": formatted.get("year"),
+        "mileage": formatted.get("mileage"),
+        "auction": formatted.get("auction"),
+        "auction_name": formatted.get("auction_name"),
+        "date": formatted.get("date").isoformat() if formatted.get("date") else None,
+        "lot": formatted.get("lot"),
+        "seller": formatted.get("seller"),
+        "seller_type": formatted.get("seller_type"),
+        "location": formatted.get("location"),
+        "current_bid": formatted.get("current_bid"),
+        "engine": formatted.get("engine"),
+        "has_keys": formatted.get("has_keys"),
+        "engine_title": formatted.get("engine_title"),
+        "engine_cylinder": formatted.get("engine_cylinder"),
+        "drive_type": formatted.get("drive_type"),
+        "exterior_color": formatted.get("exterior_color"),
+        "condition": formatted.get("condition"),
+        "body_style": formatted.get("body_style"),
+        "fuel_type": formatted.get("fuel_type"),
+        "transmision": formatted.get("transmision"),
+        "vehicle_type": formatted.get("vehicle_type"),
+        "link": formatted.get("link"),
+        "is_salvage": formatted.get("is_salvage", False),
+        "photos": formatted.get("photos", []),
+        "photos_hd": formatted.get("photos_hd", []),
+        "condition_assessments": formatted.get("condition_assessments", []),
+    }
+
+
+def _transform_page(data: list) -> list:
+    vehicles = []
+    for raw in data:
+        try:
+            vehicles.append(to_bulk_vehicle(raw))
+        except Exception:
+            continue
+    return vehicles
+
+
+@dataclass
+class PipelineStats:
+    """Backpressure counters for the fetch -> transform -> forward pipeline (seconds are wall time)."""
+
+    pages: int = 0
+    vehicles: int = 0
+    batches_sent: int = 0
+    batches_failed: int = 0
+    # producer blocked because the transformer is behind
+    fetch_blocked_s: float = 0.0
+    # transformer blocked because the forwarders are behind
+    transform_blocked_s: float = 0.0
+    # forwarders idle waiting for batches (upstream is the bottleneck)
+    forward_idle_s: float = 0.0
+    forward_s: float = 0.0
+    max_batch_queue: int = 0
+
+    def as_dict(self) -> dict:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in asdict(self).items()}
+
+
+async def _timed_put(queue: asyncio.Queue, item) -> float:
+    started = time.perf_counter()
+    await queue.put(item)
+    return time.perf_counter() - started
+
+
+async def run_apicar_pipeline(
+    size: int,
+    base_url: str,
+    save_url: str,
+    event: str,
+    batch_size: int = FORWARD_BATCH_SIZE,
+    concurrency: int = FORWARD_CONCURRENCY,
+    prefetch_pages: int = PREFETCH_PAGES,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> PipelineStats:
+    """
+    Stream APICAR pages into /vehicles/bulk.
+
+    fetch pages -> page queue -> format rows (thread) -> batch queue -> `concurrency` forwarders
+
+    Both queues are bounded, so a slow stage pushes back on the one before it; the time each
+    stage spends blocked is recorded in the returned stats.
+    """
+    stats = PipelineStats()
+    encoder = BulkBodyEncoder()
+    page_queue: asyncio.Queue = asyncio.Queue(maxsize=max(prefetch_pages, 1))
+    batch_queue: asyncio.Queue = asyncio.Queue(maxsize=max(concurrency, 1) * 2)
 
     headers_entities = {"X-Auth-Token": os.getenv("PARSERS_AUTH_TOKEN")}
     apicar_headers = {"api-key": os.getenv("APICAR_KEY")}
-    save_url = "http://entities:8000/api/v1/vehicles/bulk"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
 
-    page = 1
-    total_pages = 0
-    total_vehicles = 0
+    async with httpx.AsyncClient(timeout=20, transport=transport) as fetch_client, \
+            httpx.AsyncClient(timeout=3600, limits=limits, transport=transport) as forward_client:
 
-    logger.info(f"[APICAR] Streaming start. base_url={base_url} size={size}")
+        async def fetch_pages():
+            page = 1
+            try:
+                while True:
+                    url = generate_car_api_url(page=page, size=size, base_url=base_url)
+                    logger.info(f"[APICAR] Fetch page {page}")
+                    try:
+                        resp = await fetch_client.get(url, headers=apicar_headers)
+                        resp.raise_for_status()
+                        data = resp.json().get("data", [])
+                    except httpx.HTTPError as e:
+                        logger.error(f"[APICAR] Fetch failed page {page}: {e}")
+                        break
 
-    with httpx.Client(timeout=20) as fetch_client, \
-         httpx.Client(timeout=3600) as forward_client:
+                    if not data:
+                        logger.info(f"[APICAR] Empty page {page}. Stop.")
+                        break
 
-        while True:
-            url = generate_car_api_url(page=page, size=size, base_url=base_url)
-            logger.info(f"[APICAR] Fetch page {page}")
+                    stats.fetch_blocked_s += await _timed_put(page_queue, (page, data))
+                    page += 1
+            finally:
+                await page_queue.put(None)
 
+        async def transform_pages():
             try:
-                resp = fetch_client.get(url, headers=apicar_headers)
-                resp.raise_for_status()
-                payload = resp.json()
-                data = payload.get("data", [])
-            except httpx.HTTPError as e:
-                logger.error(f"[APICAR] Fetch failed page {page}: {e}")
-                break
-
-            if not data:
-                logger.info(f"[APICAR] Empty page {page}. Stop.")
-                break
-
-            vehicles = []
-            for raw in data:
+                while (item := await page_queue.get()) is not None:
+                    page, data = item
+                    vehicles = await asyncio.to_thread(_transform_page, data)
+                    for batch in chunked(vehicles, batch_size):
+                        stats.transform_blocked_s += await _timed_put(batch_queue, (page, batch))
+                        stats.max_batch_queue = max(stats.max_batch_queue, batch_queue.qsize())
+
+                    stats.pages += 1
+                    stats.vehicles += len(vehicles)
+                    logger.info(f"[APICAR] Page {page} done. vehicles={len(vehicles)}")
+            finally:
+                for _ in range(concurrency):
+                    await batch_queue.put(None)
+
+        async def forward_batches():
+            while True:
+                waited = time.perf_counter()
+                item = await batch_queue.get()
+                stats.forward_idle_s += time.perf_counter() - waited
+                if item is None:
+                    return
+
+                page, batch = item
+                started = time.perf_counter()
                 try:
-                    formatted = format_car_data(raw)
-                    vehicles.append({
-                        "vin": formatted["vin"],
-                        "vehicle": formatted["vehicle"],
-                        "make": formatted["make"],
-                        "model": formatted["model"],
-                        "year": formatted.get("year"),
-                        "mileage": formatted.get("mileage"),
-                        "auction": formatted.get("auction"),
-                        "auction_name": formatted.get("auction_name"),
-                        "date": formatted.get("date").isoformat() if formatted.get("date") else None,
-                        "lot": formatted.get("lot"),
-                        "seller": formatted.get("seller"),
-                        "seller_type": formatted.get("seller_type"),
-                        "location": formatted.get("location"),
-                        "current_bid": formatted.get("current_bid"),
-                        "engine": formatted.get("engine"),
-                        "has_keys": formatted.get("has_keys"),
-                        "engine_title": formatted.get("engine_title"),
-                        "engine_cylinder": formatted.get("engine_cylinder"),
-                        "drive_type": formatted.get("drive_type"),
-                        "exterior_color": formatted.get("exterior_color"),
-                        "condition": formatted.get("condition"),
-                        "body_style": formatted.get("body_style"),
-                        "fuel_type": formatted.get("fuel_type"),
-                        "transmision": formatted.get("transmision"),
-                        "vehicle_type": formatted.get("vehicle_type"),
-                        "link": formatted.get("link"),
-                        "is_salvage": formatted.get("is_salvage", False),
-                        "photos": formatted.get("photos", []),
-                        "photos_hd": formatted.get("photos_hd", []),
-                        "condition_assessments": formatted.get("condition_assessments", []),
-                    })
-                except Exception:
-                    continue
-
-            if vehicles:
-                for batch in chunked(vehicles, 50):
-                    payload = {
-                        "ivent": "updated" if size == 1000 else "created",
-                        "vehicles": batch,
-                    }
-                    try:
-                        r = forward_client.post(
-                            save_url,
-                            json=payload,
-                            headers=headers_entities,
-                        )
-                        r.raise_for_status()
-                    except httpx.HTTPError as e:
-                        logger.error(f"[FORWARD] Failed page {page}: {e}")
+                    r = await post_bulk(
+                        forward_client,
+                        save_url,
+                        {"ivent": event, "vehicles": batch},
+                        headers_entities,
+                        encoder,
+                    )
+                    r.raise_for_status()
+                    stats.batches_sent += 1
+                except httpx.HTTPError as e:
+                    stats.batches_failed += 1
+                    logger.error(f"[FORWARD] Failed page {page}: {e}")
+                finally:
+                    stats.forward_s += time.perf_counter() - started
+
+        await asyncio.gather(
+            fetch_pages(),
+            transform_pages(),
+            *(forward_batches() for _ in range(concurrency)),
+        )
+
+    return stats
 
-            total_pages += 1
-            total_vehicles += len(vehicles)
-            logger.info(
-                f"[APICAR] Page {page} done. vehicles={len(vehicles)}"
-            )
 
-            page += 1
+@app.task
+def fetch_api_data(size: Optional[int] = None, base_url: Optional[str] = None):
+    """Pipelined: fetch page N+1 while page N is formatted and forwarded concurrently."""
+
+    if not base_url:
+        base_url = "https://api.apicar.store/api/cars/db/update"
+    if not size:
+        size = 1000
+
+    save_url = "http://entities:8000/api/v1/vehicles/bulk"
+    event = "updated" if size == 1000 else "created"
 
     logger.info(
-        f"[DONE] Streaming finished. pages={total_pages} vehicles={total_vehicles}"
+        f"[APICAR] Streaming start. base_url={base_url} size={size} "
+        f"batch_size={FORWARD_BATCH_SIZE} concurrency={FORWARD_CONCURRENCY}"
     )
 
+    started = time.perf_counter()
+    stats = asyncio.run(run_apicar_pipeline(size=size, base_url=base_url, save_url=save_url, event=event))
+    elapsed = time.perf_counter() - started
+
+    logger.info(f"[DONE] Streaming finished in {elapsed:.1f}s. {stats.as_dict()}")
+
     return {
         "message": "Streaming finished",
-        "pages": total_pages,
-        "vehicles": total_vehicles,
+        "pages": stats.pages,
+        "vehicles": stats.vehicles,
+        "elapsed_s": round(elapsed, 3),
+        "pipeline": stats.as_dict(),
     }
 
 
@@ -195,14 +302,12 @@ def delete_vehicle():
 
     batch_size = 100
 
+    encoder = BulkBodyEncoder(trusted=False)
+
     with httpx.Client(timeout=1000) as client:
         for i in range(0, len(items), batch_size):
             batch = items[i:i + batch_size]
 
             body = {"data": batch}
 
-            client.post(
-                delete_url,
-                json=body,
-                headers=headers,
-            )
\ No newline at end of file
+            post_bulk_sync(client, delete_url, body, headers, encoder)
\ No newline at end of file
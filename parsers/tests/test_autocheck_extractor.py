@@ -0,0 +1,67 @@
+import logging
+import os
+import time
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from services.parsers.autocheck_extractor import extract_history
+from tests.test_dealercenter_scraper import fake_autocheck_html
+
+SAMPLE_REPORT = Path(__file__).resolve().parent.parent / "response.html"
+
+
+def _bs4_parse_history(html_data: str, fallback_odometer):
+    """The BeautifulSoup implementation extract_history replaced; kept as parity and speed reference."""
+    soup = BeautifulSoup(html_data, "html.parser")
+    try:
+        owners_element = soup.select_one("span.box-title-owners > span")
+        owners_val = int(owners_element.text) if owners_element else 1
+    except Exception:
+        owners_val = 1
+    try:
+        odo_el = soup.select_one("p:-soup-contains('Last reported odometer:') span.font-weight-bold")
+        odo_val = int(odo_el.text.replace(",", "")) if odo_el else fallback_odometer
+    except Exception:
+        odo_val = fallback_odometer
+    acc_cnt = 0
+    for table in soup.find_all("table", class_="table table-striped"):
+        if "Damage Type" in table.get_text():
+            acc_cnt = len([row for row in table.find_all("tr") if len(row.find_all("td")) >= 3])
+            break
+    return {"owners": owners_val, "mileage": odo_val, "accident_count": acc_cnt}
+
+
+@pytest.mark.parametrize(
+    "html_data",
+    [
+        SAMPLE_REPORT.read_text(),
+        fake_autocheck_html(owners=3, odo=135_000, damage_rows=2),
+        fake_autocheck_html(owners=5, damage_rows=0),
+        "<html><body></body></html>",
+    ],
+)
+def test_extract_history_matches_beautifulsoup(html_data):
+    assert extract_history(html_data, 4242) == _bs4_parse_history(html_data, 4242)
+
+
+def test_extract_history_sample_report():
+    assert extract_history(SAMPLE_REPORT.read_text(), None) == {"owners": 1, "mileage": 11490, "accident_count": 2}
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run")
+def test_benchmark_extract_history_vs_beautifulsoup():
+    html_data = SAMPLE_REPORT.read_text()
+    rounds = 50
+
+    def timed(fn) -> float:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            fn(html_data, None)
+        return (time.perf_counter() - started) / rounds
+
+    bs4_secs = timed(_bs4_parse_history)
+    lxml_secs = timed(extract_history)
+    logging.warning(f"AutoCheck parse per report: bs4 {bs4_secs * 1000:.1f} ms, lxml {lxml_secs * 1000:.1f} ms")
+    assert lxml_secs * 5 < bs4_secs
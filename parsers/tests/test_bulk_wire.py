@@ -0,0 +1,57 @@
+import gzip
+
+import httpx
+import orjson
+import pytest
+
+from services.bulk_wire import BulkBodyEncoder, post_bulk_sync
+
+
+def _client(handler) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(handler), base_url="http://entities")
+
+
+def test_default_encoding_is_identity():
+    body, headers = BulkBodyEncoder().encode({"vehicles": []})
+    assert orjson.loads(body) == {"vehicles": []}
+    assert "Content-Encoding" not in headers
+
+
+@pytest.mark.parametrize(
+    "rejection",
+    [
+        httpx.Response(415, json={"detail": "Unsupported Content-Encoding: gzip"}),
+        httpx.Response(400, json={"detail": "There was an error parsing the body"}),
+    ],
+)
+def test_gzip_falls_back_to_identity_when_entities_cannot_decode_it(rejection):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("content-encoding"))
+        if request.headers.get("content-encoding") == "gzip":
+            assert orjson.loads(gzip.decompress(request.content)) == {"vehicles": [1]}
+            return rejection
+        assert orjson.loads(request.content) == {"vehicles": [1]}
+        return httpx.Response(201, json={"new": 1})
+
+    encoder = BulkBodyEncoder(encoding="gzip")
+    with _client(handler) as client:
+        assert post_bulk_sync(client, "/bulk", {"vehicles": [1]}, {}, encoder).status_code == 201
+        assert post_bulk_sync(client, "/bulk", {"vehicles": [1]}, {}, encoder).status_code == 201
+
+    assert seen == ["gzip", None, None]
+
+
+def test_other_bad_requests_are_not_retried():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"detail": "Invalid JSON body"})
+
+    encoder = BulkBodyEncoder(encoding="gzip")
+    with _client(handler) as client:
+        assert post_bulk_sync(client, "/bulk", {"vehicles": []}, {}, encoder).status_code == 400
+
+    assert len(calls) == 1 and encoder.encoding == "gzip"
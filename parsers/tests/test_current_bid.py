@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from schemas.schemas import UpdateCurrentBidRequestSchema
+from services.parsers import copart_current_bid_parser as bids
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch):
+    monkeypatch.setattr(bids, "_retry_delay", lambda attempt: 0)
+    monkeypatch.setenv("APICAR_KEY", "key")
+
+
+def _items(n: int) -> list[UpdateCurrentBidRequestSchema]:
+    return [
+        UpdateCurrentBidRequestSchema(id=i, lot=1000 + i, source="Copart" if i % 2 else "IAAI")
+        for i in range(n)
+    ]
+
+
+async def test_get_current_bid_runs_batches_concurrently_and_retries():
+    state = {"in_flight": 0, "max_in_flight": 0, "calls": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["calls"] += 1
+        lots = json.loads(request.content)["lots"]
+        # first attempt of the batch starting at lot 1000 fails once
+        if lots[0]["lot_id"] == 1000 and not state.get("failed"):
+            state["failed"] = True
+            return httpx.Response(503)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return httpx.Response(200, json=[{"lot_id": f"{lot['lot_id']}-1", "site": lot["site"], "pre_bid": 1} for lot in lots])
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await bids.get_current_bid(
+            _items(25),
+            batch_size=5,
+            concurrency=3,
+            client=client,
+            rate_limiter=bids.TokenBucket(rate=1000),
+        )
+
+    assert len(result) == 25
+    assert state["calls"] == 6  # 5 batches + 1 retry
+    assert 1 < state["max_in_flight"] <= 3
+    assert {r["site"] for r in result} == {1, 2}
+
+
+async def test_fetch_current_bids_gives_up_on_client_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, text="bad lots")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await bids.fetch_current_bids(
+            [{"lot_id": 1, "site": 1}], client=client, rate_limiter=bids.TokenBucket(rate=1000)
+        )
+
+    assert result == []
+    assert len(calls) == 1
+
+
+async def test_token_bucket_limits_rate():
+    bucket = bids.TokenBucket(rate=50, capacity=1)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(6):
+        await bucket.acquire()
+    # 1 burst token + 5 refills at 50/s
+    assert loop.time() - started >= 0.09
@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.routers import parcer
+from schemas.schemas import DCResponseSchema
+
+
+def _item(i: int) -> dict:
+    return {
+        "id": i,
+        "car_vin": f"VIN{i}",
+        "car_make": "Honda",
+        "car_model": "CR-V",
+        "car_year": 2016,
+        "car_transmison": "Automatic",
+    }
+
+
+def test_scrape_dc_batch_streams_one_line_per_vin_with_bounded_concurrency(monkeypatch):
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def fake_scrape(car_vin, **kwargs):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if car_vin == "VIN3":
+            return DCResponseSchema(error="boom")
+        return DCResponseSchema(owners=1, mileage=kwargs["car_mileage"])
+
+    monkeypatch.setattr(parcer, "_scrape_dc_vin", fake_scrape)
+    monkeypatch.setattr(parcer, "DC_BATCH_CONCURRENCY", 2)
+    app = FastAPI()
+    app.include_router(parcer.router)
+
+    response = TestClient(app).post("/parsers/scrape/dc/batch", json={"items": [_item(i) for i in range(6)]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["id"] for line in lines) == list(range(6))
+    assert next(line for line in lines if line["car_vin"] == "VIN3")["error"] == "boom"
+    assert state["max_in_flight"] == 2
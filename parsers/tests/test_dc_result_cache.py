@@ -0,0 +1,143 @@
+import json
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+from services.parsers import dc_result_cache as cache
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+class _FakeRedis:
+    """In-memory stand-in for the binary client: plain values plus the LRU sorted set."""
+
+    def __init__(self):
+        self.values = {}
+        self.lru = {}
+
+    async def mget(self, keys):
+        return [self.values.get(k) for k in keys]
+
+    async def zadd(self, name, mapping):
+        self.lru.update(mapping)
+
+    async def zpopmin(self, name, count):
+        popped = sorted(self.lru.items(), key=lambda kv: kv[1])[:count]
+        for key, _ in popped:
+            del self.lru[key]
+        return popped
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.redis.values[key] = value
+        self.results.append(True)
+
+    def zadd(self, name, mapping):
+        self.redis.lru.update(mapping)
+        self.results.append(len(mapping))
+
+    def zremrangebyscore(self, name, min_score, max_score):
+        stale = [k for k, score in self.redis.lru.items() if score <= max_score]
+        for key in stale:
+            del self.redis.lru[key]
+        self.results.append(len(stale))
+
+    def zcard(self, name):
+        self.results.append(len(self.redis.lru))
+
+    async def execute(self):
+        return self.results
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_result_key_buckets_odometer_and_mode():
+    assert cache.result_key("1hgcm82633a004352", 101_000, False) == cache.result_key("1HGCM82633A004352", 104_999, False)
+    assert cache.result_key("VIN", 101_000, False) != cache.result_key("VIN", 106_000, False)
+    assert cache.result_key("VIN", None, True).endswith(":na:history")
+
+
+@pytest.mark.anyio
+async def test_max_age_bounds_the_entry_age(fake_redis, clock):
+    await cache.set_cached_result("VIN1", 50_000, False, {"price": 1})
+    clock.value += 100
+
+    assert await cache.get_cached_result("VIN1", 50_000, False) == {"price": 1}
+    assert await cache.get_cached_result("VIN1", 50_000, False, max_age=200) == {"price": 1}
+    assert await cache.get_cached_result("VIN1", 50_000, False, max_age=50) is None
+    assert await cache.get_cached_result("VIN1", 50_000, False, max_age=0) is None  # forces a fresh scrape
+
+
+@pytest.mark.anyio
+async def test_history_request_is_served_from_a_full_entry(fake_redis, clock):
+    await cache.set_cached_result("VIN2", 50_000, False, {"price": 1, "history": ["a"]})
+    clock.value += 10
+
+    assert await cache.get_cached_result("VIN2", 50_000, True) == {"price": 1, "history": ["a"]}
+    assert fake_redis.lru[cache.result_key("VIN2", 50_000, False)] == clock.value
+
+    await cache.set_cached_result("VIN3", 50_000, True, {"history": ["b"]})
+    assert await cache.get_cached_result("VIN3", 50_000, False) is None  # a full request needs the valuation
+
+
+@pytest.mark.anyio
+async def test_set_evicts_the_least_recently_used_entries(fake_redis, clock, monkeypatch):
+    monkeypatch.setattr(cache, "RESULT_CACHE_MAX_ENTRIES", 2)
+    for vin in ("VINA", "VINB"):
+        await cache.set_cached_result(vin, None, False, {"vin": vin})
+        clock.value += 1
+    assert await cache.get_cached_result("VINA", None, False) == {"vin": "VINA"}  # touch A: B is now oldest
+    clock.value += 1
+
+    await cache.set_cached_result("VINC", None, False, {"vin": "VINC"})
+
+    assert await cache.get_cached_result("VINB", None, False) is None
+    assert await cache.get_cached_result("VINA", None, False) == {"vin": "VINA"}
+    assert await cache.get_cached_result("VINC", None, False) == {"vin": "VINC"}
+    assert sorted(fake_redis.values) == sorted(cache.result_key(v, None, False) for v in ("VINA", "VINC"))
+
+
+@pytest.mark.anyio
+async def test_unreadable_entry_is_a_miss(fake_redis, clock):
+    fake_redis.values[cache.result_key("VIN4", None, False)] = b"not zlib"
+    fake_redis.values[cache.result_key("VIN5", None, False)] = zlib.compress(json.dumps({"price": 1}).encode())
+    fake_redis.values[cache.result_key("VIN6", None, True)] = b"not zlib"
+    await cache.set_cached_result("VIN6", None, False, {"price": 6})
+
+    assert await cache.get_cached_result("VIN4", None, False) is None
+    assert await cache.get_cached_result("VIN5", None, False) is None  # older format without saved_at
+    assert await cache.get_cached_result("VIN6", None, True) == {"price": 6}  # falls through to the full entry
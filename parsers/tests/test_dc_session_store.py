@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from services.parsers import dc_session_store as store
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeStore:
+    """In-memory stand-in for the credentials key and the login lock."""
+
+    def __init__(self):
+        self.creds = None
+        self.lock = None
+
+    async def load_credentials(self):
+        return self.creds
+
+    async def save_credentials(self, cookies, access_token):
+        self.creds = {"cookies": cookies, "access_token": access_token}
+
+    async def acquire(self, token):
+        if self.lock is None:
+            self.lock = token
+            return True
+        return False
+
+    async def release(self, token):
+        if self.lock == token:
+            self.lock = None
+
+    async def exists(self, key):
+        return int(self.lock is not None)
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    fake = _FakeStore()
+    monkeypatch.setattr(store, "load_credentials", fake.load_credentials)
+    monkeypatch.setattr(store, "save_credentials", fake.save_credentials)
+    monkeypatch.setattr(store, "_acquire_login_lock", fake.acquire)
+    monkeypatch.setattr(store, "_release_login_lock", fake.release)
+    monkeypatch.setattr(store, "get_redis", lambda: fake)
+    monkeypatch.setattr(store, "LOGIN_POLL_INTERVAL_SECS", 0.01)
+    return fake
+
+
+async def test_login_singleflight_runs_one_login_for_all_callers(fake_store):
+    calls = {"login": 0}
+
+    async def login():
+        calls["login"] += 1
+        await asyncio.sleep(0.05)
+        return {"cookies": [{"name": "sid", "value": "x"}], "access_token": "fresh"}
+
+    results = await asyncio.gather(*(store.login_singleflight(login) for _ in range(5)))
+
+    assert calls["login"] == 1
+    assert all(r["access_token"] == "fresh" for r in results)
+    assert fake_store.lock is None
+
+
+async def test_login_singleflight_reuses_stored_session(fake_store):
+    fake_store.creds = {"cookies": [{"name": "sid", "value": "x"}], "access_token": "stored"}
+
+    async def login():
+        raise AssertionError("must not log in while a session is stored")
+
+    assert (await store.login_singleflight(login))["access_token"] == "stored"
+
+
+async def test_login_singleflight_retries_after_failed_login_elsewhere(fake_store):
+    fake_store.lock = "other-process"
+
+    async def release_later():
+        await asyncio.sleep(0.03)
+        fake_store.lock = None
+
+    async def login():
+        return {"cookies": [{"name": "sid", "value": "y"}], "access_token": "mine"}
+
+    _, creds = await asyncio.gather(release_later(), store.login_singleflight(login))
+
+    assert creds["access_token"] == "mine"
+    assert fake_store.creds["access_token"] == "mine"
@@ -3,7 +3,7 @@ import asyncio
 import httpx
 import pytest
 
-from services.parsers.dc_scraper import AuthRefreshedError, DealerCenterScraper
+from services.parsers.dc_scraper import AuthRefreshedError, DealerCenterScraper, close_dc_client, get_dc_client
 
 
 @pytest.fixture(scope="session")
@@ -109,3 +109,14 @@ async def test__ensure_logged_in_singleflight_force_ignores_ready(monkeypatch):
     await dc._ensure_logged_in_singleflight(force=True)
     assert calls["perform_login"] == 1
     assert dc._login_ready.is_set()
+
+async def test_scrapers_share_http_and_email_clients():
+    a = DealerCenterScraper(vin="VIN1")
+    b = DealerCenterScraper(vin="VIN2")
+    assert a.email_client is b.email_client
+    client = get_dc_client()
+    assert get_dc_client() is client
+    await close_dc_client()
+    assert client.is_closed
+    assert get_dc_client() is not client
+    await close_dc_client()
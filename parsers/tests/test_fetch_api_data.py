@@ -0,0 +1,112 @@
+import gzip
+import json
+
+import httpx
+import pytest
+
+from tasks import tasks
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def _auth_env(monkeypatch):
+    monkeypatch.setenv("PARSERS_AUTH_TOKEN", "token")
+    monkeypatch.setenv("APICAR_KEY", "key")
+
+
+def _apicar_transport(pages: dict[int, list], posted: list, fail_posts: int = 0, accept_gzip: bool = True):
+    failures = {"left": fail_posts}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={"data": pages.get(page, [])})
+        gzipped = request.headers.get("content-encoding") == "gzip"
+        if gzipped and not accept_gzip:
+            return httpx.Response(415, headers={"Accept-Encoding": "identity"})
+        if failures["left"]:
+            failures["left"] -= 1
+            return httpx.Response(500)
+        body = gzip.decompress(request.content) if gzipped else request.content
+        assert request.headers["x-trusted-payload"] == "1"
+        posted.append(json.loads(body))
+        return httpx.Response(201, json={"message": "Cars processed"})
+
+    return httpx.MockTransport(handler)
+
+
+async def test_pipeline_forwards_every_page_in_batches(monkeypatch):
+    monkeypatch.setattr(tasks, "to_bulk_vehicle", lambda raw: {"vin": raw["vin"]})
+    pages = {p: [{"vin": f"P{p}V{i}"} for i in range(7)] for p in (1, 2, 3)}
+    posted: list = []
+
+    stats = await tasks.run_apicar_pipeline(
+        size=7,
+        base_url="https://apicar.test/cars",
+        save_url="https://entities.test/bulk",
+        event="created",
+        batch_size=3,
+        concurrency=2,
+        transport=_apicar_transport(pages, posted),
+    )
+
+    assert stats.pages == 3
+    assert stats.vehicles == 21
+    # 7 rows per page -> 3 + 3 + 1
+    assert stats.batches_sent == 9 and stats.batches_failed == 0
+    assert sorted(v["vin"] for body in posted for v in body["vehicles"]) == sorted(
+        v["vin"] for rows in pages.values() for v in rows
+    )
+    assert {body["ivent"] for body in posted} == {"created"}
+    assert max(len(body["vehicles"]) for body in posted) == 3
+
+
+async def test_pipeline_skips_bad_rows_and_counts_failed_batches(monkeypatch):
+    def fake_to_bulk(raw):
+        if raw["vin"] == "BAD":
+            raise ValueError("broken row")
+        return {"vin": raw["vin"]}
+
+    monkeypatch.setattr(tasks, "to_bulk_vehicle", fake_to_bulk)
+    pages = {1: [{"vin": "A"}, {"vin": "BAD"}, {"vin": "B"}]}
+    posted: list = []
+
+    stats = await tasks.run_apicar_pipeline(
+        size=3,
+        base_url="https://apicar.test/cars",
+        save_url="https://entities.test/bulk",
+        event="updated",
+        batch_size=1,
+        concurrency=1,
+        transport=_apicar_transport(pages, posted, fail_posts=1),
+    )
+
+    assert stats.vehicles == 2
+    assert stats.batches_failed == 1 and stats.batches_sent == 1
+    assert len(posted) == 1
+
+
+async def test_pipeline_falls_back_to_plain_json_on_415(monkeypatch):
+    monkeypatch.setattr(tasks, "to_bulk_vehicle", lambda raw: {"vin": raw["vin"]})
+    pages = {1: [{"vin": "A"}, {"vin": "B"}]}
+    posted: list = []
+
+    stats = await tasks.run_apicar_pipeline(
+        size=2,
+        base_url="https://apicar.test/cars",
+        save_url="https://entities.test/bulk",
+        event="created",
+        batch_size=1,
+        concurrency=1,
+        transport=_apicar_transport(pages, posted, accept_gzip=False),
+    )
+
+    assert stats.batches_sent == 2 and stats.batches_failed == 0
+    assert sorted(v["vin"] for body in posted for v in body["vehicles"]) == ["A", "B"]